@@ -0,0 +1,262 @@
+"""
+Index of every artifact written under changelog_data.
+
+`changelog_data/index.json` lists each data file, summary and rendering with
+its kind (the file name prefix before the date stamp, such as
+`weekly_changelog`, `summary_condensed` or `pr_body`), period, generation
+time, content hash and headline counts, plus the latest artifact of each
+kind. Writers call `record_artifact` after writing a file; the update is
+made under a file lock and saved atomically, so concurrent pipeline stages
+do not lose each other's entries. Readers call `latest_file` instead of
+listing and sorting a directory, and tooling can read periods and counts
+from the index without opening the files.
+
+    python scripts/artifact_index.py   # rebuild the index from the files on disk
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+try:
+    from data_io import file_date, iter_org_repos, list_files, load_bundle_index, load_json, open_text
+except ImportError:
+    from scripts.data_io import file_date, iter_org_repos, list_files, load_bundle_index, load_json, open_text
+
+
+INDEX_NAME = "index.json"
+# Subdirectories of a changelog_data tree; their index lives one level up
+TREE_DIRS = {"data", "summaries", "digests"}
+
+KIND_PATTERN = re.compile(r"^(.+?)_\d{2,4}-(?:\d{2}|Q\d)")
+# Summary keys copied into an entry's headline counts
+HEADLINE_KEYS = ["total_repos", "active_repos", "total_commits", "total_pulls", "total_issues"]
+
+_lock = threading.Lock()
+
+
+def index_for(directory: str) -> str:
+    """Path of the index covering files in `directory`."""
+    directory = os.path.normpath(directory)
+    if os.path.basename(directory) in TREE_DIRS:
+        directory = os.path.dirname(directory)
+    return os.path.join(directory, INDEX_NAME)
+
+
+def kind_for(name: str) -> Optional[str]:
+    """`summary_condensed_2026-08-14.json` -> `summary_condensed`"""
+    match = KIND_PATTERN.match(os.path.basename(name))
+    return match.group(1) if match else None
+
+
+def content_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open_text(path) as f:
+        for chunk in iter(lambda: f.read(1 << 16), ""):
+            digest.update(chunk.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def summary_headline(summary: Dict[str, Any]) -> Dict[str, int]:
+    """Headline counts of a full or condensed summary."""
+    return {key: summary[key] for key in HEADLINE_KEYS if key in summary}
+
+
+def data_headline(data: Dict[str, Any]) -> Dict[str, int]:
+    """Headline counts of single- or multi-org changelog data."""
+    counts = {"total_repos": 0, "active_repos": 0, "total_commits": 0, "total_pulls": 0, "total_issues": 0}
+    for _, repo in iter_org_repos(data):
+        counts["total_repos"] += 1
+        commits, pulls, issues = (len(repo.get(key) or []) for key in ("commits", "pulls", "issues"))
+        counts["active_repos"] += bool(commits or pulls or issues or repo.get("changelog_entries"))
+        counts["total_commits"] += commits
+        counts["total_pulls"] += pulls
+        counts["total_issues"] += issues
+    return counts
+
+
+def data_metadata(data: Dict[str, Any]) -> Dict[str, Any]:
+    """The object holding the period and generation time of single- or multi-org data."""
+    if "repos" in data:
+        return data
+    for org_data in data.values():
+        if isinstance(org_data, dict) and org_data.get("period"):
+            return org_data
+    return {}
+
+
+def _sort_key(entry: Dict[str, Any]):
+    period = entry.get("period") or {}
+    return (period.get("end") or "", entry.get("generated_at") or "", entry["path"])
+
+
+class ArtifactIndex:
+    """The artifacts of one changelog_data tree, keyed by path relative to the index."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.root = os.path.dirname(path)
+        self.artifacts: Dict[str, Dict[str, Any]] = {}
+        self.latest_by_kind: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                saved = json.load(f)
+            self.artifacts = saved.get("artifacts", {})
+            self.latest_by_kind = saved.get("latest", {})
+
+    def add(self, file_path: str, kind: Optional[str] = None, period: Optional[Dict[str, str]] = None,
+            generated_at: Optional[str] = None, counts: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Add or replace the entry for a file that has just been written."""
+        rel_path = os.path.relpath(file_path, self.root).replace(os.sep, "/")
+        kind = kind or kind_for(file_path)
+        if kind is None:
+            raise ValueError(f"Cannot tell the kind of {file_path} from its name")
+        entry = {
+            "kind": kind,
+            "path": rel_path,
+            "period": period,
+            "generated_at": generated_at,
+            "sha256": content_hash(file_path),
+            "counts": counts or {},
+        }
+        self.artifacts[rel_path] = entry
+
+        current = self.artifacts.get(self.latest_by_kind.get(kind, ""))
+        if current is None or _sort_key(entry) >= _sort_key(current):
+            self.latest_by_kind[kind] = rel_path
+        return entry
+
+    def latest(self, kind: str) -> Optional[Dict[str, Any]]:
+        """The entry with the latest period end (then generation time) of a kind."""
+        rel_path = self.latest_by_kind.get(kind)
+        return self.artifacts.get(rel_path) if rel_path else None
+
+    def find(self, kind: str, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Entries of a kind whose period overlaps [start, end], oldest first."""
+        found = []
+        for entry in self.artifacts.values():
+            if entry["kind"] != kind:
+                continue
+            period = entry.get("period") or {}
+            if start and (period.get("end") or "")[:10] < start:
+                continue
+            if end and (period.get("start") or "")[:10] > end:
+                continue
+            found.append(entry)
+        return sorted(found, key=_sort_key)
+
+    def resolve(self, entry: Dict[str, Any]) -> str:
+        return os.path.join(self.root, entry["path"])
+
+    def save(self):
+        os.makedirs(self.root or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"latest": self.latest_by_kind, "artifacts": self.artifacts}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+@contextmanager
+def updating(index_path: str):
+    """Load the index under an exclusive lock and save it on exit."""
+    os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+    with _lock, open(f"{index_path}.lock", "w") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        index = ArtifactIndex(index_path)
+        yield index
+        index.save()
+
+
+def record_artifacts(paths: List[str], period: Optional[Dict[str, str]] = None, generated_at: Optional[str] = None,
+                     counts: Optional[Dict[str, int]] = None):
+    """
+    Record files written together (same period and counts) in one index
+    update. Files without a date stamp in their name are not indexed.
+    """
+    paths = [path for path in paths if kind_for(path)]
+    if not paths:
+        return
+    with updating(index_for(os.path.dirname(paths[0]))) as index:
+        for path in paths:
+            index.add(path, period=period, generated_at=generated_at, counts=counts)
+
+
+def record_artifact(path: str, period: Optional[Dict[str, str]] = None, generated_at: Optional[str] = None,
+                    counts: Optional[Dict[str, int]] = None):
+    record_artifacts([path], period, generated_at, counts)
+
+
+def _exists(path: str) -> bool:
+    if any(os.path.exists(path + codec) for codec in ("", ".gz", ".zst")):
+        return True
+    directory, name = os.path.split(path)
+    return name in load_bundle_index(directory)["members"]
+
+
+def latest_file(directory: str, kind: str) -> Optional[str]:
+    """
+    Path of the latest `kind` artifact in `directory`, from the index when it
+    has one, otherwise by the date stamps in the file names.
+    """
+    index_path = index_for(directory)
+    if os.path.exists(index_path):
+        index = ArtifactIndex(index_path)
+        entry = index.latest(kind)
+        if entry:
+            path = index.resolve(entry)
+            if os.path.normpath(os.path.dirname(path)) == os.path.normpath(directory) and _exists(path):
+                return path
+
+    names = [name for name in list_files(directory, kind + "_") if kind_for(name) == kind]
+    if not names:
+        return None
+    return os.path.join(directory, max(names, key=lambda name: (file_date(name), name)))
+
+
+def rebuild(root: str = "changelog_data") -> ArtifactIndex:
+    """Rebuild the index of a changelog_data tree from the files on disk."""
+    with updating(os.path.join(root, INDEX_NAME)) as index:
+        index.artifacts = {}
+        index.latest_by_kind = {}
+        for subdir in sorted(TREE_DIRS):
+            directory = os.path.join(root, subdir)
+            for name in list_files(directory):
+                kind = kind_for(name)
+                if kind is None:
+                    continue
+                path = os.path.join(directory, name)
+                period, generated_at, counts = None, None, None
+                if name.endswith(".json"):
+                    content = load_json(path)
+                    if kind.endswith("_changelog"):
+                        metadata = data_metadata(content)
+                        period, generated_at = metadata.get("period"), metadata.get("generated_at")
+                        counts = data_headline(content)
+                    elif isinstance(content, dict) and "period" in content:
+                        period, generated_at = content["period"], content.get("generated_at")
+                        counts = summary_headline(content)
+                if generated_at is None and file_date(name):
+                    generated_at = file_date(name).isoformat()
+                index.add(path, kind=kind, period=period, generated_at=generated_at, counts=counts)
+    return index
+
+
+def main():
+    """Rebuild changelog_data/index.json from the files on disk."""
+    index = rebuild()
+    print(f"Indexed {len(index.artifacts)} artifacts of {len(index.latest_by_kind)} kinds in {index.path}")
+    return index.path
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Repo metadata catalog.
+
+Static repo fields (name, url, description, archived, topics) are stored once
+in `changelog_data/repos.json`, with a history of every change. Weekly data
+files reference repos by catalog ID and carry only activity; `hydrate` puts
+the static fields back, as they were at the end of the file's period.
+"""
+
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+try:
+    from data_io import file_date, list_files, load_json
+except ImportError:
+    from scripts.data_io import file_date, list_files, load_json
+
+
+CATALOG_FILE = "changelog_data/repos.json"
+DATA_DIR = "changelog_data/data"
+
+STATIC_FIELDS = ["name", "url", "description", "archived", "topics"]
+ACTIVITY_FIELDS = ["issues", "pulls", "commits", "releases", "contributors", "changelog_entries"]
+
+
+class RepoCatalog:
+    """Repo metadata keyed by catalog ID, with change history."""
+
+    def __init__(self, path: str = CATALOG_FILE):
+        self.path = path
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                raw = json.load(f)
+        else:
+            raw = {"next_id": 1, "repos": {}}
+
+        self.next_id = raw["next_id"]
+        self.repos: Dict[str, Dict[str, Any]] = raw["repos"]
+        self.by_url = {entry["url"].lower(): repo_id for repo_id, entry in self.repos.items()}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"next_id": self.next_id, "repos": self.repos}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def register(self, org: str, repo_data: Dict[str, Any], seen_on: str) -> str:
+        """Add or update a repo, recording any changed fields. Returns its ID."""
+        url_key = repo_data["url"].lower()
+        repo_id = self.by_url.get(url_key)
+
+        if repo_id is None:
+            repo_id = str(self.next_id)
+            self.next_id += 1
+            self.by_url[url_key] = repo_id
+            entry = {"org": org, "first_seen": seen_on, "last_seen": seen_on, "history": []}
+            entry.update({field: repo_data.get(field) for field in STATIC_FIELDS})
+            self.repos[repo_id] = entry
+            return repo_id
+
+        entry = self.repos[repo_id]
+        entry["first_seen"] = min(entry["first_seen"], seen_on)
+        if seen_on < entry["last_seen"]:
+            # An older snapshot says nothing about the current values
+            return repo_id
+
+        for field in STATIC_FIELDS:
+            # Archival fetches skip topics; a missing field is not a change
+            if field not in repo_data:
+                continue
+            if repo_data[field] != entry.get(field):
+                entry["history"].append({
+                    "date": seen_on,
+                    "field": field,
+                    "old": entry.get(field),
+                    "new": repo_data[field],
+                })
+                entry[field] = repo_data[field]
+
+        entry["org"] = org
+        entry["last_seen"] = seen_on
+        return repo_id
+
+    def topics_added(self, url: str, since: str, until: str) -> Optional[List[str]]:
+        """
+        Topics a repo gained after `since`, up to and including `until`, from
+        its history. None when the catalog did not know the repo by `since`.
+        """
+        repo_id = self.by_url.get(url.lower())
+        if repo_id is None or self.repos[repo_id]["first_seen"] > since:
+            return None
+        before = set(self.get(repo_id, since).get("topics") or [])
+        return [topic for topic in self.get(repo_id, until).get("topics") or [] if topic not in before]
+
+    def get(self, repo_id: str, as_of: Optional[str] = None) -> Dict[str, Any]:
+        """Return a repo's static fields, rolled back to `as_of` when given."""
+        entry = self.repos[repo_id]
+        fields = {field: entry.get(field) for field in STATIC_FIELDS}
+        fields["org"] = entry["org"]
+        if as_of:
+            for change in reversed(entry["history"]):
+                if change["date"] <= as_of:
+                    break
+                fields[change["field"]] = change["old"]
+        if fields.get("topics") is None:
+            del fields["topics"]
+        return fields
+
+    def normalize(self, org: str, org_data: Dict[str, Any], seen_on: str,
+                  catalog_ref: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Register every repo in a single-org data dict and return a copy whose
+        repos carry only `repo_id` and activity. Repos without activity are
+        dropped; `total_repo_count` still counts them.
+        """
+        repos = []
+        for repo_data in org_data.get("repos", []):
+            repo_id = self.register(org, repo_data, seen_on)
+            if not any(repo_data.get(field) for field in ACTIVITY_FIELDS):
+                continue
+            slim_repo = {"repo_id": repo_id}
+            slim_repo.update({k: v for k, v in repo_data.items() if k not in STATIC_FIELDS})
+            repos.append(slim_repo)
+
+        # Metadata goes ahead of the repos so streaming readers see it first
+        normalized = {k: v for k, v in org_data.items() if k != "repos"}
+        normalized["repo_catalog"] = catalog_ref or os.path.relpath(self.path, DATA_DIR)
+        normalized["repos"] = repos
+        return normalized
+
+    def hydrate_repos(self, repos: List[Dict[str, Any]], as_of: Optional[str] = None) -> List[Dict[str, Any]]:
+        hydrated = []
+        for repo in repos:
+            if "repo_id" not in repo:
+                hydrated.append(repo)
+                continue
+            full = self.get(repo["repo_id"], as_of)
+            full.update({k: v for k, v in repo.items() if k != "repo_id"})
+            hydrated.append(full)
+        return hydrated
+
+
+def references_catalog(data: Dict[str, Any]) -> Optional[str]:
+    """Return the catalog path a data file references, if any."""
+    if "repo_catalog" in data:
+        return data["repo_catalog"]
+    for org_data in data.values():
+        if isinstance(org_data, dict) and "repo_catalog" in org_data:
+            return org_data["repo_catalog"]
+    return None
+
+
+def hydrate(data: Dict[str, Any], data_file: str) -> Dict[str, Any]:
+    """
+    Resolve `repo_id` references in a data dict (single- or multi-org) against
+    the catalog it names, relative to the data file's directory.
+    """
+    catalog_ref = references_catalog(data)
+    if not catalog_ref:
+        return data
+
+    catalog = RepoCatalog(os.path.join(os.path.dirname(data_file), catalog_ref))
+
+    def hydrate_org(org_data):
+        as_of = (org_data.get("period") or {}).get("end")
+        hydrated = {k: v for k, v in org_data.items() if k != "repo_catalog"}
+        hydrated["repos"] = catalog.hydrate_repos(org_data.get("repos", []), as_of)
+        return hydrated
+
+    if "repos" in data:
+        return hydrate_org(data)
+
+    return {
+        org: hydrate_org(org_data) if isinstance(org_data, dict) and "repos" in org_data else org_data
+        for org, org_data in data.items()
+    }
+
+
+def main():
+    """
+    Backfill the catalog from every data file, oldest first. With `--normalize`,
+    also rewrite each file so its repos reference the catalog.
+    """
+    rewrite = "--normalize" in sys.argv[1:]
+    catalog = RepoCatalog(os.getenv("REPO_CATALOG", CATALOG_FILE))
+
+    names = sorted(list_files(DATA_DIR, "weekly_changelog_"), key=lambda n: (file_date(n), n))
+    for name in names:
+        path = os.path.join(DATA_DIR, name)
+        data = load_json(path)
+        if references_catalog(data):
+            continue
+
+        seen_on = str(file_date(name))
+        if "repos" in data:
+            normalized = catalog.normalize(data.get("org_name", "unknown"), data, seen_on)
+        else:
+            normalized = {
+                org: catalog.normalize(org, org_data, seen_on)
+                for org, org_data in data.items()
+                if isinstance(org_data, dict) and "repos" in org_data
+            }
+
+        if rewrite and os.path.exists(path):
+            with open(path, "w") as f:
+                json.dump(normalized, f, indent=2)
+
+    catalog.save()
+    print(f"Catalog {catalog.path}: {len(catalog.repos)} repos from {len(names)} data files")
+
+
+if __name__ == "__main__":
+    main()
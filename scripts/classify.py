@@ -0,0 +1,365 @@
+"""
+Change classification shared by the condensed summary and the summary engine.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+
+EMOJI_MAP = {
+    'added': {
+        'emoji': '✅',
+        'patterns': [r'[Aa]dd(?:ed|s|ing)?', r'[Nn]ew'],
+        'keywords': ['add', 'added', 'adds', 'adding', 'new']
+    },
+    'fixed': {
+        'emoji': '🪲',
+        'patterns': [r'[Ff]ix(?:ed|es|ing)?', r'[Bb]ug'],
+        'keywords': ['fix', 'fixed', 'fixes', 'fixing', 'bug', 'bugfix']
+    },
+    'changed': {
+        'emoji': '🔧',
+        'patterns': [
+            r'[Cc]hang(?:ed|e|es|ing)?', 
+            r'[Mm]odif(?:y|ied|ies|ying)?', 
+            r'[Uu]pdat(?:ed|e|es|ing)?',
+            r'[Ii]prov(?:ed|e|es|ing|evement)?'
+        ],
+        'keywords': [
+            'change',
+            'changed',
+            'changes',
+            'changing',
+            'modify',
+            'modified',
+            'modifies',
+            'modifying',
+            'update',
+            'updated',
+            'updates',
+            'updating',
+            'improve',
+            'improved',
+            'improvement'
+        ]
+    },
+    'deprecated': {
+        'emoji': '⚠️',
+        'patterns': [r'[Dd]eprecat(?:ed|e|es|ing)?'],
+        'keywords': ['deprecate', 'deprecated', 'deprecates', 'deprecating']
+    },
+    'removed': {
+        'emoji': '🗑️',
+        'patterns': [r'[Rr]emov(?:ed|e|es|ing)?', r'[Dd]elet(?:ed|e|es|ing)?'],
+        'keywords': ['remove', 'removed', 'removes', 'removing', 'delete', 'deleted', 'deletes', 'deleting']
+    },
+    'security': {
+        'emoji': '🔒',
+        'patterns': [r'[Ss]ecur(?:ity|ed|e|ing)?',],
+        'keywords': ['security', 'secure', 'secured', 'securing']
+    },
+    'performance': {
+        'emoji': '⚡️',
+        'patterns': [r'[Pp]erforman(?:ce|t)?', r'[Oo]ptimi(?:ze|zed|zes|zing|zation)?'],
+        'keywords': ['performance', 'performant', 'optimize', 'optimized', 'optimizes', 'optimizing', 'optimization']
+    },
+    'documentation': {
+        'emoji': '📚',
+        'patterns': [r'[Dd]ocument(?:ation)?', r'[Dd]ocs?'],
+        'keywords': ['documentation', 'document', 'docs', 'doc']
+    },
+}
+
+
+def _trie_pattern(node: Dict[Any, Any]) -> str:
+    """Turn a keyword trie into an equivalent regex, sharing common prefixes."""
+    branches = [re.escape(char) + _trie_pattern(child)
+                for char, child in sorted((k, v) for k, v in node.items() if k is not None)]
+    if not branches:
+        return ''
+    optional = None in node
+    if len(branches) == 1 and not optional:
+        return branches[0]
+    return '(?:' + '|'.join(branches) + ')' + ('?' if optional else '')
+
+
+def _fold_pattern(pattern: str) -> str:
+    """
+    Lowercase the literal characters of a regex, leaving escapes alone, so it
+    can run case-sensitively against lowercased ASCII text.
+    """
+    folded = []
+    escaped = False
+    for char in pattern:
+        folded.append(char if escaped else char.lower())
+        escaped = char == '\\' and not escaped
+    return ''.join(folded)
+
+
+def _compile(alternatives: List[str], flags: int = 0) -> Optional[re.Pattern]:
+    return re.compile('|'.join(f'(?:{a})' for a in alternatives), flags) if alternatives else None
+
+
+class CategoryClassifier:
+    """
+    Maps a category string or title to (emoji, bucket) using an EMOJI_MAP-style
+    config. Buckets are tried in config order and the first whose patterns or
+    keywords match wins, as in the original loop.
+
+    Each bucket's keywords are put in a trie and compiled, together with the
+    bucket's patterns, into one precompiled alternation. ASCII text is
+    lowercased once and searched case-sensitively, after a single prefilter
+    search over all buckets; results are memoized.
+    """
+
+    def __init__(self, emoji_map: Dict[str, Dict[str, Any]], cache_size: int = 4096):
+        self.buckets = [(config['emoji'], key) for key, config in emoji_map.items()]
+
+        self.patterns = []
+        self.keywords = []
+        self.folded = []
+        for config in emoji_map.values():
+            trie: Dict[Any, Any] = {}
+            for keyword in config['keywords']:
+                node = trie
+                for char in keyword:
+                    node = node.setdefault(char, {})
+                node[None] = True
+            keyword_pattern = [_trie_pattern(trie)] if trie else []
+
+            self.patterns.append(_compile(config['patterns'], re.IGNORECASE))
+            self.keywords.append(_compile(keyword_pattern))
+            self.folded.append(_compile([_fold_pattern(p) for p in config['patterns']] + keyword_pattern))
+
+        self.any_folded = _compile([p.pattern for p in self.folded if p is not None])
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    def _classify(self, category: str) -> Tuple[str, str]:
+        category_lower = category.lower()
+
+        if category.isascii():
+            # For ASCII text, case-insensitive matching is the same as matching
+            # the lowercased text, and keyword tests are substring tests on it
+            if self.any_folded is None or not self.any_folded.search(category_lower):
+                return ('❓', 'other')
+            for index, folded in enumerate(self.folded):
+                if folded is not None and folded.search(category_lower):
+                    return self.buckets[index]
+            return ('❓', 'other')
+
+        # str.lower() can change non-ASCII text, so patterns run on the
+        # original string and keywords on the lowercased one, as before
+        for index, (pattern, keywords) in enumerate(zip(self.patterns, self.keywords)):
+            if pattern is not None and pattern.search(category):
+                return self.buckets[index]
+            if keywords is not None and keywords.search(category_lower):
+                return self.buckets[index]
+        return ('❓', 'other')
+
+
+CLASSIFIER = CategoryClassifier(EMOJI_MAP)
+
+
+def get_emoji_for_category(category: str) -> tuple:
+    """Gets the emoji for category"""
+    return CLASSIFIER.classify(category)
+
+
+CATEGORY_BUCKETS = [
+    'added',
+    'fixed',
+    'changed',
+    'deprecated',
+    'removed',
+    'security',
+    'performance',
+    'documentation',
+    'other',
+]
+
+
+def empty_categories() -> Dict[str, List[Dict]]:
+    return {bucket: [] for bucket in CATEGORY_BUCKETS}
+
+
+def categorize_repo(repo_data: Dict[str, Any], categorized: Dict[str, List[Dict]]):
+    """Add one repo's changelog items and first merged PRs to `categorized`."""
+    repo_name = repo_data.get("name", "Unknown")
+
+    for entry in repo_data.get("changelog_entries", []):
+        for change in entry.get("changes", []):
+            category = change.get("category", "")
+            items = change.get("items", [])
+
+            emoji, bucket = get_emoji_for_category(category)
+
+            for item in items:
+                categorized[bucket].append({
+                    'repo': repo_name,
+                    'text': item,
+                    'category': category,
+                    'emoji': emoji
+                })
+
+    merged_prs = [pr for pr in repo_data.get("pulls", []) if pr.get("merged")]
+    for pr in merged_prs[:3]:
+        title = pr.get("title", "")
+        emoji, bucket = get_emoji_for_category(title)
+
+        categorized[bucket].append({
+            'repo': repo_name,
+            'text': title,
+            'url': pr.get("url", ""),
+            'type': 'pr',
+            'emoji': emoji
+        })
+
+
+# Conventional-commit types (https://www.conventionalcommits.org) and the
+# bucket each one counts towards
+CONVENTIONAL_TYPES = {
+    'feat': 'added',
+    'feature': 'added',
+    'fix': 'fixed',
+    'bugfix': 'fixed',
+    'hotfix': 'fixed',
+    'refactor': 'changed',
+    'style': 'changed',
+    'deprecate': 'deprecated',
+    'remove': 'removed',
+    'security': 'security',
+    'sec': 'security',
+    'perf': 'performance',
+    'docs': 'documentation',
+    'doc': 'documentation',
+    'build': 'other',
+    'ci': 'other',
+    'chore': 'other',
+    'test': 'other',
+    'tests': 'other',
+    'revert': 'other',
+}
+BUCKET_EMOJI = {key: config['emoji'] for key, config in EMOJI_MAP.items()}
+BUCKET_EMOJI['other'] = '❓'
+
+# Items kept per bucket in the activity summary
+TOP_ITEMS = 5
+
+
+def conventional_type(subject: str) -> Optional[str]:
+    """
+    Return the bucket for a conventional-commit subject such as `feat: ...`,
+    `fix(api): ...` or `feat!: ...`, or None if it has no known prefix.
+    """
+    head, sep, _ = subject.partition(':')
+    if not sep or len(head) > 40:
+        return None
+    head = head.strip().lower().rstrip('!')
+    commit_type, paren, scope = head.partition('(')
+    if paren and not scope.endswith(')'):
+        return None
+    return CONVENTIONAL_TYPES.get(commit_type)
+
+
+def classify_batch(texts: List[str], classifier: Optional[CategoryClassifier] = None) -> List[Tuple[str, str]]:
+    """
+    Classify many titles or commit subjects at once. Each distinct string is
+    classified once: conventional-commit prefixes are read with plain string
+    operations, and only the rest go through the keyword classifier.
+    """
+    classifier = classifier or CLASSIFIER
+    decided: Dict[str, Tuple[str, str]] = {}
+    for text in texts:
+        if text in decided:
+            continue
+        bucket = conventional_type(text)
+        decided[text] = (BUCKET_EMOJI[bucket], bucket) if bucket else classifier.classify(text)
+    return [decided[text] for text in texts]
+
+
+def activity_items(repo_data: Dict[str, Any]) -> List[Dict[str, str]]:
+    """
+    Return a repo's PR titles and commit subjects as items to classify. A
+    commit whose subject repeats a PR title in the same repo is left out, as
+    are merge commits.
+    """
+    repo_name = repo_data.get("name", "Unknown")
+    pr_titles = set()
+    items = []
+
+    for pr in repo_data.get("pulls") or []:
+        title = (pr.get("title") or "").strip()
+        if not title:
+            continue
+        pr_titles.add(title)
+        items.append({
+            'repo': repo_name,
+            'text': title,
+            'url': pr.get("url", ""),
+            'type': 'merged_pr' if pr.get("merged") else 'pr',
+        })
+
+    for commit in repo_data.get("commits") or []:
+        subject = (commit.get("message") or "").partition("\n")[0].strip()
+        # Squash merges repeat the PR title; merge commits say nothing new
+        if not subject or subject in pr_titles or subject.startswith("Merge "):
+            continue
+        items.append({
+            'repo': repo_name,
+            'text': subject,
+            'url': commit.get("url", ""),
+            'type': 'commit',
+        })
+
+    return items
+
+
+class ActivityClassifier:
+    """
+    Classifies every PR title and commit subject, repo by repo, into bucket
+    counts and a few top items per bucket. Merged PRs rank first, then other
+    PRs, then commits; a commit whose subject repeats a PR title in the same
+    repo is counted once. Only the counts and the top candidates are kept.
+    """
+
+    RANK = {'merged_pr': 0, 'pr': 1, 'commit': 2}
+
+    def __init__(self, top_items: int = TOP_ITEMS):
+        self.top_items = top_items
+        self.classified = 0
+        self.counts = {bucket: 0 for bucket in CATEGORY_BUCKETS}
+        # bucket -> one list per rank, each capped at top_items
+        self.candidates = {bucket: [[] for _ in self.RANK] for bucket in CATEGORY_BUCKETS}
+
+    def add_repo(self, repo_data: Dict[str, Any]):
+        items = activity_items(repo_data)
+        labels = classify_batch([item['text'] for item in items])
+        self.classified += len(items)
+        for item, (emoji, bucket) in zip(items, labels):
+            self.counts[bucket] += 1
+            candidates = self.candidates[bucket][self.RANK[item['type']]]
+            if len(candidates) < self.top_items:
+                candidates.append(dict(item, emoji=emoji))
+
+    def merge(self, other: "ActivityClassifier"):
+        """Add another classifier's repos, as if they had been added here after this one's."""
+        self.classified += other.classified
+        for bucket, count in other.counts.items():
+            self.counts[bucket] += count
+        for bucket, by_rank in other.candidates.items():
+            for candidates, more in zip(self.candidates[bucket], by_rank):
+                candidates.extend(more[:self.top_items - len(candidates)])
+
+    def summary(self) -> Dict[str, Any]:
+        top = {}
+        for bucket, by_rank in self.candidates.items():
+            ranked = [item for candidates in by_rank for item in candidates][:self.top_items]
+            if ranked:
+                top[bucket] = ranked
+
+        return {
+            "classified": self.classified,
+            "counts": {bucket: count for bucket, count in self.counts.items() if count},
+            "top_items": top,
+        }
@@ -0,0 +1,291 @@
+"""
+Columnar archive of weekly activity.
+
+Each issue, PR, commit, release and new contributor from the weekly data files
+becomes one row in a set of fixed-width NumPy arrays (timestamps, repo IDs,
+kinds, ...) plus a string table. Readers memory-map the arrays, so aggregate
+queries run as vectorized operations instead of re-parsing every JSON file.
+
+An issue or PR seen again in a later file keeps its row, but moves forward to
+its new state: a PR seen open and later merged gets the merged state and merge
+time, and an issue seen open and later closed gets the closed state and the
+end of the week it was first seen closed.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+try:
+    from data_io import iter_org_repos, list_files, load_data
+except ImportError:
+    from scripts.data_io import iter_org_repos, list_files, load_data
+
+
+ARCHIVE_DIR = "changelog_data/columnar"
+DATA_DIR = "changelog_data/data"
+
+KINDS = ["commits", "issues", "pulls", "releases", "contributors"]
+KIND_IDS = {kind: i for i, kind in enumerate(KINDS)}
+
+STATES = ["open", "closed", "merged"]
+STATE_IDS = {state: i for i, state in enumerate(STATES)}
+
+# Column name -> dtype. Every column has one entry per row.
+COLUMNS = {
+    "ts": np.int64,        # event time, epoch seconds
+    "ts_end": np.int64,    # merge time for pulls, close time (see above) for issues, -1 otherwise
+    "repo": np.int32,      # string table ID of "org/name"
+    "kind": np.int8,       # index into KINDS
+    "state": np.int8,      # index into STATES, -1 when not applicable
+    "author": np.int32,    # string table ID, -1 when unknown
+    "url": np.int64,       # 64-bit hash of the item URL, used for deduplication
+}
+
+WEEK_SECONDS = 7 * 24 * 3600
+# 1970-01-05 was a Monday, so week buckets start on Mondays
+WEEK_ORIGIN = 4 * 24 * 3600
+
+
+def url_hash(url: str) -> int:
+    return int.from_bytes(hashlib.blake2b(url.encode(), digest_size=8).digest(), "little", signed=True)
+
+
+def parse_timestamps(values: List[Optional[str]]) -> np.ndarray:
+    """Parse ISO-8601 strings to epoch seconds in one vectorized call; None becomes -1."""
+    raw = np.array([v[:19] if v else "NaT" for v in values], dtype="datetime64[s]")
+    out = raw.astype(np.int64)
+    out[np.isnat(raw)] = -1
+    return out
+
+
+def _item_rows(org: str, repo: Dict[str, Any], period: Dict[str, str]):
+    period_start = period.get("start")
+    repo_key = f"{org}/{repo.get('name', 'Unknown')}"
+    for kind in KINDS:
+        for item in repo.get(kind) or []:
+            if kind == "releases":
+                ts = item.get("published_at") or item.get("created_at")
+            else:
+                ts = item.get("created_at") or period_start
+
+            ts_end = None
+            if kind == "pulls":
+                state = "merged" if item.get("merged") else item.get("state")
+                ts_end = item.get("merged_at")
+            elif kind == "issues":
+                state = item.get("state")
+                # Issues carry no close time; they were closed by the end of the week
+                ts_end = period.get("end") if state == "closed" else None
+            else:
+                state = None
+
+            url = item.get("url") or f"{repo_key}#{kind}:{item.get('name')}"
+            yield repo_key, kind, ts, ts_end, state, item.get("author") or item.get("name"), url
+
+
+class ColumnarArchive:
+    """Memory-mapped reader for a columnar activity archive."""
+
+    def __init__(self, path: str = ARCHIVE_DIR):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), "r") as f:
+            self.meta = json.load(f)
+        with open(os.path.join(path, "strings.json"), "r") as f:
+            self.strings = json.load(f)
+
+        # Columns are replaced before meta.json, so they can be ahead of it after
+        # an interrupted update; meta's row count is what was fully written
+        rows = self.meta.get("rows")
+        self.columns = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")[:rows]
+            for name in COLUMNS
+        }
+
+    def __len__(self):
+        return len(self.columns["ts"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def repo_names(self) -> List[str]:
+        return [self.strings[i] for i in self.meta["repo_ids"]]
+
+    def counts_per_repo_per_week(self, kind: str = "commits", since: Optional[str] = None,
+                                 until: Optional[str] = None, time_column: str = "ts"):
+        """
+        Count rows of one kind per repo per week.
+
+        Returns (repo_names, week_starts, counts) where `counts` has shape
+        (len(repo_names), len(week_starts)).
+        """
+        ts = np.asarray(self.columns[time_column])
+        mask = (np.asarray(self.columns["kind"]) == KIND_IDS[kind]) & (ts >= 0)
+        if since:
+            mask &= ts >= parse_timestamps([since])[0]
+        if until:
+            mask &= ts < parse_timestamps([until])[0] + 24 * 3600
+
+        repo_ids = np.asarray(self.meta["repo_ids"], dtype=np.int32)
+        if not mask.any():
+            return self.repo_names(), [], np.zeros((len(repo_ids), 0), dtype=np.int64)
+
+        weeks = (ts[mask] - WEEK_ORIGIN) // WEEK_SECONDS
+        first_week = weeks.min()
+        n_weeks = int(weeks.max() - first_week + 1)
+
+        # Map string-table IDs to dense row indexes
+        lookup = np.full(len(self.strings), -1, dtype=np.int64)
+        lookup[repo_ids] = np.arange(len(repo_ids))
+        rows = lookup[np.asarray(self.columns["repo"])[mask]]
+
+        counts = np.bincount(
+            rows * n_weeks + (weeks - first_week),
+            minlength=len(repo_ids) * n_weeks,
+        ).reshape(len(repo_ids), n_weeks)
+
+        week_starts = [
+            str(np.datetime64(int((first_week + w) * WEEK_SECONDS + WEEK_ORIGIN), "s").astype("datetime64[D]"))
+            for w in range(n_weeks)
+        ]
+        return self.repo_names(), week_starts, counts
+
+
+def update_archive(archive_dir: str = ARCHIVE_DIR, data_files: Optional[List[str]] = None) -> int:
+    """
+    Append rows from data files not yet in the archive, skipping items whose
+    URL is already stored (apart from moving open issues and PRs on to their
+    closed or merged state). Returns the number of rows added.
+    """
+    if data_files is None:
+        data_files = [
+            os.path.join(DATA_DIR, f) for f in list_files(DATA_DIR, "weekly_changelog_")
+            if f.endswith(".json")
+        ]
+
+    meta_file = os.path.join(archive_dir, "meta.json")
+    if os.path.exists(meta_file):
+        archive = ColumnarArchive(archive_dir)
+        meta = archive.meta
+        strings = archive.strings
+        existing = {name: np.array(col) for name, col in archive.columns.items()}
+    else:
+        meta = {"sources": [], "repo_ids": [], "kinds": KINDS, "states": STATES}
+        strings = []
+        existing = {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+    string_ids = {s: i for i, s in enumerate(strings)}
+    repo_ids = set(meta["repo_ids"])
+    seen_urls = set(existing["url"].tolist())
+    # URL hash -> row, for issues and PRs still open, which a later file may close or merge
+    is_open = np.isin(existing["kind"], [KIND_IDS["issues"], KIND_IDS["pulls"]]) & \
+        (existing["state"] == STATE_IDS["open"])
+    open_rows = dict(zip(existing["url"][is_open].tolist(), np.nonzero(is_open)[0].tolist()))
+    # Row -> (state, ts_end) for existing rows that moved on from "open"
+    closed_rows = {}
+
+    def intern(value):
+        if value is None:
+            return -1
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    new_sources = [f for f in data_files if os.path.basename(f) not in meta["sources"]]
+    rows = {"repo": [], "kind": [], "ts": [], "ts_end": [], "state": [], "author": [], "url": []}
+
+    for data_file in new_sources:
+        data = load_data(data_file)
+
+        for org, repo in iter_org_repos(data):
+            period = data.get("period") or (data.get(org) or {}).get("period") or {}
+            for repo_key, kind, ts, ts_end, state, author, url in _item_rows(org, repo, period):
+                hashed = url_hash(url)
+                if hashed in seen_urls:
+                    row = open_rows.get(hashed)
+                    if row is not None and state in ("closed", "merged"):
+                        del open_rows[hashed]
+                        if row < len(existing["url"]):
+                            closed_rows[row] = (STATE_IDS[state], ts_end)
+                        else:
+                            new_row = row - len(existing["url"])
+                            rows["state"][new_row] = STATE_IDS[state]
+                            rows["ts_end"][new_row] = ts_end
+                    continue
+                seen_urls.add(hashed)
+                if state == "open":
+                    open_rows[hashed] = len(existing["url"]) + len(rows["url"])
+
+                repo_id = intern(repo_key)
+                if repo_id not in repo_ids:
+                    repo_ids.add(repo_id)
+                    meta["repo_ids"].append(repo_id)
+
+                rows["repo"].append(repo_id)
+                rows["kind"].append(KIND_IDS[kind])
+                rows["ts"].append(ts)
+                rows["ts_end"].append(ts_end)
+                rows["state"].append(STATE_IDS.get(state, -1))
+                rows["author"].append(intern(author))
+                rows["url"].append(hashed)
+
+        meta["sources"].append(os.path.basename(data_file))
+
+    added = len(rows["url"])
+    new_columns = {
+        "ts": parse_timestamps(rows["ts"]),
+        "ts_end": parse_timestamps(rows["ts_end"]),
+        "repo": np.array(rows["repo"], dtype=COLUMNS["repo"]),
+        "kind": np.array(rows["kind"], dtype=COLUMNS["kind"]),
+        "state": np.array(rows["state"], dtype=COLUMNS["state"]),
+        "author": np.array(rows["author"], dtype=COLUMNS["author"]),
+        "url": np.array(rows["url"], dtype=COLUMNS["url"]),
+    }
+
+    if closed_rows:
+        changed = np.fromiter(closed_rows, dtype=np.int64, count=len(closed_rows))
+        existing["state"][changed] = [state for state, _ in closed_rows.values()]
+        existing["ts_end"][changed] = parse_timestamps([ts_end for _, ts_end in closed_rows.values()])
+
+    # Everything is written to temporary files first, then swapped in with
+    # meta.json last, so readers and the next update never see a half-written file
+    os.makedirs(archive_dir, exist_ok=True)
+    written = []
+    for name, dtype in COLUMNS.items():
+        column = np.concatenate([existing[name], new_columns[name].astype(dtype)])
+        path = os.path.join(archive_dir, f"{name}.npy")
+        with open(f"{path}.tmp", "wb") as f:
+            np.save(f, column)
+        written.append(path)
+
+    meta["rows"] = int(len(existing["url"]) + added)
+    for name, content, indent in (("strings.json", strings, None), ("meta.json", meta, 2)):
+        path = os.path.join(archive_dir, name)
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(content, f, indent=indent)
+        written.append(path)
+
+    for path in written:
+        os.replace(f"{path}.tmp", path)
+
+    return added
+
+
+def main():
+    """Update the columnar archive from any new weekly data files."""
+    archive_dir = os.getenv("COLUMNAR_ARCHIVE_DIR", ARCHIVE_DIR)
+    data_files = sys.argv[1:] or None
+
+    added = update_archive(archive_dir, data_files)
+    archive = ColumnarArchive(archive_dir)
+
+    print(f"Added {added} rows to {archive_dir}/ ({len(archive)} rows, {len(archive.meta['sources'])} source files)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Compact older changelog_data files into compressed monthly bundles.
+
+Loose files in `changelog_data/data` and `changelog_data/summaries` whose
+month ended more than KEEP_WEEKS weeks ago are rolled into
+`<dir>/bundles/<YYYY-MM>.json.gz` (or `.json.zst` when zstandard is installed)
+and removed. `<dir>/bundles/index.json` maps every member to its bundle, so
+`data_io.read_text` and `data_io.list_files` keep finding them.
+"""
+
+import json
+import os
+import sys
+from calendar import monthrange
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List
+
+try:
+    from data_io import (BUNDLE_DIR, BUNDLE_INDEX, compress, default_codec, file_date,
+                         load_bundle, load_bundle_index)
+except ImportError:
+    from scripts.data_io import (BUNDLE_DIR, BUNDLE_INDEX, compress, default_codec, file_date,
+                                 load_bundle, load_bundle_index)
+
+
+DIRECTORIES = ["changelog_data/data", "changelog_data/summaries"]
+
+
+def _write_atomic(path: str, raw: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(raw)
+    os.replace(tmp_path, path)
+
+
+def compact_directory(directory: str, cutoff: date, codec: str = None) -> Dict[str, List[str]]:
+    """
+    Roll loose files from months that ended before `cutoff` into monthly bundles.
+    Returns {bundle file name: [member names added]}.
+    """
+    codec = codec or default_codec()
+    bundle_dir = os.path.join(directory, BUNDLE_DIR)
+
+    by_month: Dict[str, List[str]] = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if not os.path.isfile(path) or name.endswith((".gz", ".zst", ".tmp")):
+            continue
+        stamp = file_date(name)
+        if stamp is None:
+            continue
+        month_end = date(stamp.year, stamp.month, monthrange(stamp.year, stamp.month)[1])
+        if month_end < cutoff:
+            by_month.setdefault(stamp.strftime("%Y-%m"), []).append(name)
+
+    if not by_month:
+        return {}
+
+    os.makedirs(bundle_dir, exist_ok=True)
+    index = load_bundle_index(directory)
+    added = {}
+
+    for month, names in by_month.items():
+        # Reuse an existing bundle for this month, whichever codec it was written with
+        bundle_name = next(
+            (b for b in index["bundles"] if index["bundles"][b]["month"] == month),
+            f"{month}.json{codec}",
+        )
+        bundle_path = os.path.join(bundle_dir, bundle_name)
+        members = dict(load_bundle(bundle_path)) if os.path.exists(bundle_path) else {}
+
+        raw_bytes = 0
+        for name in names:
+            with open(os.path.join(directory, name), "rb") as f:
+                raw = f.read()
+            raw_bytes += len(raw)
+            members[name] = raw.decode("utf-8")
+
+        payload = json.dumps(members, sort_keys=True).encode("utf-8")
+        _write_atomic(bundle_path, compress(payload, os.path.splitext(bundle_name)[1]))
+
+        for name in members:
+            index["members"][name] = bundle_name
+        index["bundles"][bundle_name] = {
+            "month": month,
+            "count": len(members),
+            "raw_bytes": index["bundles"].get(bundle_name, {}).get("raw_bytes", 0) + raw_bytes,
+            "compressed_bytes": os.path.getsize(bundle_path),
+        }
+        added[bundle_name] = names
+
+    _write_atomic(
+        os.path.join(bundle_dir, BUNDLE_INDEX),
+        json.dumps(index, indent=2, sort_keys=True).encode("utf-8"),
+    )
+
+    # Only remove loose files once the bundles and index are safely on disk
+    for names in added.values():
+        for name in names:
+            os.remove(os.path.join(directory, name))
+
+    return added
+
+
+def main():
+    """Compact changelog_data directories."""
+    keep_weeks = int(os.getenv("KEEP_WEEKS") or (sys.argv[1] if len(sys.argv) > 1 else 8))
+    cutoff = datetime.now(timezone.utc).date() - timedelta(weeks=keep_weeks)
+
+    print(f"Compacting files from months ending before {cutoff}...")
+    for directory in DIRECTORIES:
+        if not os.path.isdir(directory):
+            continue
+
+        added = compact_directory(directory, cutoff)
+        for bundle_name, names in sorted(added.items()):
+            print(f"  {directory}/{BUNDLE_DIR}/{bundle_name}: +{len(names)} file(s)")
+
+        if not added:
+            print(f"  {directory}: nothing to compact")
+
+
+if __name__ == "__main__":
+    main()
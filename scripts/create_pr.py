@@ -4,20 +4,24 @@ import subprocess
 from datetime import datetime, timezone
 from github import Github  # type: ignore
 
+try:
+    from artifact_index import latest_file
+    from data_io import read_text
+except ImportError:
+    from scripts.artifact_index import latest_file
+    from scripts.data_io import read_text
+
 def get_latest_summary_files():
     """Get the paths to the latest summary files."""
     summaries_dir = "changelog_data/summaries"
     if not os.path.exists(summaries_dir):
         raise FileNotFoundError("summaries directory not found")
     
-    pr_title_files = [f for f in os.listdir(summaries_dir) if f.startswith("pr_title_")]
-    pr_body_files = [f for f in os.listdir(summaries_dir) if f.startswith("pr_body_")]
+    latest_title_file = latest_file(summaries_dir, "pr_title")
+    latest_body_file = latest_file(summaries_dir, "pr_body")
 
-    if not pr_title_files or not pr_body_files:
+    if not latest_title_file or not latest_body_file:
         raise FileNotFoundError("PR title or body files not found")
-    
-    latest_title_file = os.path.join(summaries_dir, sorted(pr_title_files)[-1])
-    latest_body_file = os.path.join(summaries_dir, sorted(pr_body_files)[-1])
 
     return latest_title_file, latest_body_file
 
@@ -121,11 +125,8 @@ def main():
 
         title_file, body_file = get_latest_summary_files()
 
-        with open(title_file, 'r') as f:
-            title = f.read().strip()
-
-        with open(body_file, 'r') as f:
-            body = f.read().strip()
+        title = read_text(title_file).strip()
+        body = read_text(body_file).strip()
 
         print(f"PR Title: {title}")
 
@@ -4,20 +4,24 @@ import subprocess
 from datetime import datetime, timezone
 from github import Github #type: ignore
 
+try:
+    from artifact_index import latest_file
+    from data_io import read_text
+except ImportError:
+    from scripts.artifact_index import latest_file
+    from scripts.data_io import read_text
+
 def get_latest_condensed_summary_files():
     """Get paths to latest condensed summary files."""
     summary_dir = "changelog_data/summaries"
     if not os.path.exists(summary_dir):
         raise FileNotFoundError("Summaries directory not found.")
     
-    pr_title_files = [f for f in os.listdir(summary_dir) if f.startswith("pr_title_condensed_")]
-    pr_body_files = [f for f in os.listdir(summary_dir) if f.startswith("pr_body_condensed_")]
+    latest_title_file = latest_file(summary_dir, "pr_title_condensed")
+    latest_body_file = latest_file(summary_dir, "pr_body_condensed")
 
-    if not pr_title_files or not pr_body_files:
+    if not latest_title_file or not latest_body_file:
         raise FileNotFoundError("Condensed PR title or body not found.")
-    
-    latest_title_file = os.path.join(summary_dir, sorted(pr_title_files)[-1])
-    latest_body_file = os.path.join(summary_dir, sorted(pr_body_files)[-1])
 
     return latest_title_file, latest_body_file
 
@@ -126,11 +130,8 @@ def main():
 
         title_file, body_file = get_latest_condensed_summary_files()
 
-        with open(title_file, 'r') as f:
-            title = f.read().strip()
-
-        with open(body_file, 'r') as f:
-            body = f.read().strip()
+        title = read_text(title_file).strip()
+        body = read_text(body_file).strip()
 
         print(f"PR Title: {title}")
 
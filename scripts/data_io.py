@@ -0,0 +1,200 @@
+"""
+Shared readers for files under changelog_data/.
+
+Files may be stored loose (`name.json`), compressed (`name.json.gz`,
+`name.json.zst`), or rolled into a monthly bundle under `<dir>/bundles/` by
+`compact.py`. The helpers here resolve all three transparently, so callers
+only ever deal with the logical path `<dir>/<name>`.
+"""
+
+import gzip
+import io
+import json
+import os
+import re
+from datetime import date
+from functools import lru_cache
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard  # type: ignore
+except ImportError:
+    zstandard = None
+
+
+BUNDLE_DIR = "bundles"
+BUNDLE_INDEX = "index.json"
+
+DATE_PATTERN = re.compile(r"(\d{4}|\d{2})-(\d{2})-(\d{2})")
+
+
+def compress(raw: bytes, codec: str) -> bytes:
+    if codec == ".zst":
+        return zstandard.ZstdCompressor(level=19).compress(raw)
+    return gzip.compress(raw, compresslevel=9)
+
+
+def decompress(raw: bytes, path: str) -> bytes:
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        return zstandard.ZstdDecompressor().decompress(raw)
+    if path.endswith(".gz"):
+        return gzip.decompress(raw)
+    return raw
+
+
+def default_codec() -> str:
+    """Use zstd when it is installed, gzip otherwise."""
+    return ".zst" if zstandard is not None else ".gz"
+
+
+def _read_file(path: str) -> str:
+    if path.endswith((".gz", ".zst")):
+        with open(path, "rb") as f:
+            return decompress(f.read(), path).decode("utf-8")
+    with open(path, "r") as f:
+        return f.read()
+
+
+def load_bundle_index(directory: str) -> Dict[str, Any]:
+    index_file = os.path.join(directory, BUNDLE_DIR, BUNDLE_INDEX)
+    if not os.path.exists(index_file):
+        return {"members": {}, "bundles": {}}
+    with open(index_file, "r") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=4)
+def _load_bundle(bundle_path: str, mtime_ns: int, size: int) -> Dict[str, str]:
+    with open(bundle_path, "rb") as f:
+        return json.loads(decompress(f.read(), bundle_path))
+
+
+def load_bundle(bundle_path: str) -> Dict[str, str]:
+    """Return {member name: text} for a bundle, cached per file version."""
+    stat = os.stat(bundle_path)
+    return _load_bundle(bundle_path, stat.st_mtime_ns, stat.st_size)
+
+
+def read_text(path: str) -> str:
+    """
+    Read a changelog_data file by its logical path, falling back to a
+    compressed sibling or a monthly bundle when the loose file is gone.
+    """
+    try:
+        return _read_file(path)
+    except FileNotFoundError as e:
+        missing = e
+
+    for codec in (".gz", ".zst"):
+        if os.path.exists(path + codec):
+            return _read_file(path + codec)
+
+    directory, name = os.path.split(path)
+    bundle_name = load_bundle_index(directory)["members"].get(name)
+    if bundle_name:
+        return load_bundle(os.path.join(directory, BUNDLE_DIR, bundle_name))[name]
+
+    raise missing
+
+
+def _open_file(path: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {path}")
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return io.TextIOWrapper(raw, encoding="utf-8")
+    return open(path, "r")
+
+
+def open_text(path: str) -> IO[str]:
+    """
+    Open a changelog_data file by its logical path as a text stream, resolved
+    the same way as `read_text`. Loose and compressed files are decompressed
+    as they are read; bundle members are served from the loaded bundle.
+    """
+    try:
+        return _open_file(path)
+    except FileNotFoundError as e:
+        missing = e
+
+    for codec in (".gz", ".zst"):
+        if os.path.exists(path + codec):
+            return _open_file(path + codec)
+
+    directory, name = os.path.split(path)
+    bundle_name = load_bundle_index(directory)["members"].get(name)
+    if bundle_name:
+        return io.StringIO(load_bundle(os.path.join(directory, BUNDLE_DIR, bundle_name))[name])
+
+    raise missing
+
+
+def load_json(path: str) -> Any:
+    """Load a JSON file by its logical path. See `read_text`."""
+    return json.loads(read_text(path))
+
+
+def load_data(path: str) -> Any:
+    """
+    Load a changelog data file by its logical path, expanding slim-profile
+    tables and resolving repo references against the repo catalog.
+    """
+    try:
+        from catalog import hydrate
+        from profiles import expand_tables
+    except ImportError:
+        from scripts.catalog import hydrate
+        from scripts.profiles import expand_tables
+
+    return hydrate(expand_tables(load_json(path)), path)
+
+
+def iter_org_repos(data: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (org, repo) pairs from single-org or multi-org data without mutating it."""
+    if "repos" in data:
+        for repo in data["repos"]:
+            yield repo.get("org", data.get("org_name", "unknown")), repo
+        return
+
+    for org_name, org_data in data.items():
+        if isinstance(org_data, dict) and "repos" in org_data:
+            for repo in org_data["repos"]:
+                yield org_name, repo
+
+
+def list_files(directory: str, prefix: str = "") -> List[str]:
+    """
+    List logical file names in a changelog_data directory, including files that
+    are compressed or rolled into bundles.
+    """
+    names = set()
+    if os.path.isdir(directory):
+        for f in os.listdir(directory):
+            if not f.startswith(prefix) or not os.path.isfile(os.path.join(directory, f)):
+                continue
+            for codec in (".gz", ".zst"):
+                if f.endswith(codec):
+                    f = f[:-len(codec)]
+            names.add(f)
+
+    names.update(n for n in load_bundle_index(directory)["members"] if n.startswith(prefix))
+    return sorted(names)
+
+
+def file_date(name: str) -> Optional[date]:
+    """
+    Return the last date in a file name, so `weekly_changelog_A_to_B.json`
+    yields B. Accepts both `%Y-%m-%d` and `%y-%m-%d` stamps.
+    """
+    matches = DATE_PATTERN.findall(name)
+    if not matches:
+        return None
+    year, month, day = matches[-1]
+    try:
+        return date(int(year) + (2000 if len(year) == 2 else 0), int(month), int(day))
+    except ValueError:
+        return None
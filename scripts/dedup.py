@@ -0,0 +1,199 @@
+"""
+Near-duplicate suppression for the condensed summary's categorized changes.
+
+The same change often appears twice in a repo, as a changelog item and again
+as a merged PR's title, and bot PRs ("Bump axios from 1.6.0 to 1.7.2") repeat
+across dozens of repos. `collapse_duplicates` keeps one entry per change in a
+repo and folds the same change from several repos into a single entry with
+a `repos` list.
+
+Texts are normalized (lowercased, version numbers and PR references
+replaced, word endings such as "-ed" and "-s" dropped) and cut into byte
+4-gram shingles. Every entry gets a MinHash signature in one vectorized pass
+over all shingles, and the signatures are split into LSH bands. Entries that
+share a band bucket become candidates, and a candidate pair's groups are
+only merged when the Jaccard similarity of the groups' first entries is at
+least SIMILARITY. The threshold is high on purpose: "Bump vite ..." and
+"Bump vitest ..." are different changes. Each entry costs a fixed number of
+bucket lookups and comparisons, so there is no pairwise comparison of all
+entries.
+"""
+
+import re
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+SHINGLE_BYTES = 4
+# 8 bands of 8 rows make pairs with a similarity of 0.9 candidates 99% of the time
+BANDS = 8
+ROWS_PER_BAND = 8
+NUM_HASHES = BANDS * ROWS_PER_BAND
+# Jaccard similarity of two entries' shingles for them to count as the same change
+SIMILARITY = 0.9
+
+# Multiply-shift hashing (the high half of a * x + b, wrapping at 64 bits),
+# with fixed odd multipliers so results are the same on every run
+_COEFFICIENTS = np.random.default_rng(20250627).integers(0, 1 << 63, size=(2, NUM_HASHES), dtype=np.uint64) | 1
+# Hashes computed at once, bounding the (hashes x shingles) work array
+HASH_CHUNK = 8
+
+VERSION_PATTERN = re.compile(r"\bv?\d+(?:\.\d+)+\S*")
+PR_REFERENCE_PATTERN = re.compile(r"\(#\d+\)|#\d+")
+SEPARATOR_PATTERN = re.compile(r"[^a-z0-9]+")
+WORD_PATTERN = re.compile(r"[a-z]")
+# A version with the "from"/"to" in front of it, as in "Bump axios from 1.6.0 to 1.7.2"
+VERSION_PHRASE_PATTERN = re.compile(r"\s*\b(?:from|to)\s+v?\d+(?:\.\d+)+\S*", re.IGNORECASE)
+# Word endings dropped so "Add", "Added" and "Adds" compare equal
+SUFFIX_PATTERN = re.compile(r"(?<=[a-z]{3})(?:ing|ed|es|e|s)\b")
+
+
+def normalize(text: str) -> str:
+    """
+    Lowercase, with version numbers and PR references replaced, punctuation
+    collapsed and word endings dropped. Text with no words left (such as a
+    bare version number) is only lowercased.
+    """
+    lowered = text.lower()
+    normalized = PR_REFERENCE_PATTERN.sub(" ", VERSION_PATTERN.sub(" 0 ", lowered))
+    normalized = SUFFIX_PATTERN.sub("", SEPARATOR_PATTERN.sub(" ", normalized)).strip()
+    return normalized if WORD_PATTERN.search(normalized) else lowered
+
+
+def shared_text(text: str) -> str:
+    """
+    The text of a change shared by several repos, without the version numbers
+    and PR references that belong to only one of them.
+    """
+    stripped = VERSION_PHRASE_PATTERN.sub("", text)
+    stripped = PR_REFERENCE_PATTERN.sub("", VERSION_PATTERN.sub("", stripped))
+    stripped = " ".join(stripped.split()).rstrip(" :-,")
+    return stripped if re.search(r"[A-Za-z]", stripped) else text
+
+
+def shingle_set(text: str) -> set:
+    padded = text.ljust(SHINGLE_BYTES)
+    return {padded[i:i + SHINGLE_BYTES] for i in range(len(padded) - SHINGLE_BYTES + 1)}
+
+
+def jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b)
+
+
+def shingles(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Byte 4-gram shingles of every text at once. Returns (shingle values,
+    index of the text each belongs to); texts shorter than 4 bytes are padded.
+    """
+    encoded = [text.encode().ljust(SHINGLE_BYTES) for text in texts]
+    lengths = np.array([len(e) for e in encoded], dtype=np.int64)
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.int64)
+
+    # Shingle i covers bytes i..i+3; keep those that start and end in the same text
+    starts = np.cumsum(lengths) - lengths
+    counts = lengths - SHINGLE_BYTES + 1
+    owner = np.repeat(np.arange(len(texts)), counts)
+    offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    positions = np.repeat(starts, counts) + offsets
+
+    values = np.zeros(len(positions), dtype=np.int64)
+    for i in range(SHINGLE_BYTES):
+        values = (values << 8) | data[positions + i]
+    return values, owner
+
+
+def signatures(texts: List[str]) -> np.ndarray:
+    """MinHash signatures, shape (len(texts), NUM_HASHES)."""
+    if not texts:
+        return np.zeros((0, NUM_HASHES), dtype=np.uint64)
+    values, owner = shingles(texts)
+    values = values.astype(np.uint64)
+    # Every text has at least one shingle, so each one's shingles start here
+    first = np.searchsorted(owner, np.arange(len(texts)))
+
+    result = np.empty((len(texts), NUM_HASHES), dtype=np.uint64)
+    hashed = np.empty((HASH_CHUNK, len(values)), dtype=np.uint64)
+    for start in range(0, NUM_HASHES, HASH_CHUNK):
+        # In place, to avoid temporaries the size of the work array
+        np.multiply(_COEFFICIENTS[0, start:start + HASH_CHUNK, None], values[None, :], out=hashed)
+        hashed += _COEFFICIENTS[1, start:start + HASH_CHUNK, None]
+        hashed >>= np.uint64(32)
+        result[:, start:start + HASH_CHUNK] = np.minimum.reduceat(hashed, first, axis=1).T
+    return result
+
+
+def cluster(texts: List[str], similarity: float = SIMILARITY) -> List[int]:
+    """
+    Group near-duplicate texts. Returns, for each text, the index of the first
+    text in its group.
+    """
+    normalized = [normalize(text) for text in texts]
+    sigs = signatures(normalized)
+
+    # One integer per band: its rows combined with fixed multipliers (wrapping is fine)
+    bands = sigs.reshape(len(texts), BANDS, ROWS_PER_BAND)
+    band_keys = (bands * _COEFFICIENTS[0, :ROWS_PER_BAND]).sum(axis=2).tolist()
+
+    parent = list(range(len(texts)))
+
+    def root(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    sets: Dict[int, set] = {}
+
+    def shingles_of(i: int) -> set:
+        if i not in sets:
+            sets[i] = shingle_set(normalized[i])
+        return sets[i]
+
+    buckets: Dict[Tuple[int, int], int] = {}
+    for i, keys in enumerate(band_keys):
+        for band, key in enumerate(keys):
+            j = buckets.setdefault((band, key), i)
+            if j == i:
+                continue
+            ri, rj = root(i), root(j)
+            if ri == rj:
+                continue
+            # Groups only merge when their representatives are themselves similar,
+            # so a chain of near matches ("vite" ~ x ~ "vitest") can't join its ends
+            if normalized[ri] == normalized[rj] or jaccard(shingles_of(ri), shingles_of(rj)) >= similarity:
+                parent[max(ri, rj)] = min(ri, rj)
+
+    return [root(i) for i in range(len(texts))]
+
+
+def collapse_duplicates(categorized: Dict[str, List[Dict[str, Any]]],
+                        similarity: float = SIMILARITY) -> Tuple[Dict[str, List[Dict[str, Any]]], int]:
+    """
+    Collapse near-duplicate changes across every bucket. Within a repo only
+    the first entry of a change is kept, preferring a changelog item over a
+    PR title. The same change from several repos becomes one entry, in the
+    bucket and position of its first occurrence, with every repo in `repos`
+    and its version-free text in `shared_text`.
+
+    Returns (collapsed categorized changes, number of entries removed).
+    """
+    entries = [(bucket, change) for bucket, changes in categorized.items() for change in changes]
+    groups = cluster([change["text"] for _, change in entries], similarity)
+
+    # group -> repo -> index of the entry kept for that repo
+    kept: Dict[int, Dict[str, int]] = {}
+    for i, (_, change) in enumerate(entries):
+        by_repo = kept.setdefault(groups[i], {})
+        current = by_repo.get(change["repo"])
+        if current is None or (entries[current][1].get("type") == "pr" and change.get("type") != "pr"):
+            by_repo[change["repo"]] = i
+
+    collapsed: Dict[str, List[Dict[str, Any]]] = {bucket: [] for bucket in categorized}
+    for first, by_repo in sorted((min(by_repo.values()), by_repo) for by_repo in kept.values()):
+        bucket, change = entries[first]
+        if len(by_repo) > 1:
+            change = dict(change, repos=sorted(by_repo, key=str.lower), shared_text=shared_text(change["text"]))
+        collapsed[bucket].append(change)
+
+    return collapsed, len(entries) - sum(len(changes) for changes in collapsed.values())
@@ -0,0 +1,248 @@
+"""
+Week-over-week delta between two weekly data files.
+
+Both weeks are indexed once, repos by URL and items by the same key as the
+activity store (`store.item_key`, normally the item URL). The current week is
+then joined against the previous one with dictionary lookups, so the cost is
+linear in the size of the two files. The report lists repos that became
+active or went quiet, issues closed and PRs merged since last week, new
+releases and topics added to a repo. Topics come from the repo catalog's
+history when there is one, since a catalog-normalized file leaves out repos
+that were inactive the week before. Both PR bodies render it with
+`add_delta`.
+
+    python scripts/delta.py [data_file] [previous_data_file]
+"""
+
+import json
+import os
+import sys
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+try:
+    from artifact_index import latest_file
+    from catalog import CATALOG_FILE, RepoCatalog
+    from data_io import DATE_PATTERN, file_date, iter_org_repos, list_files, load_data
+    from render import Budget
+    from store import item_key
+except ImportError:
+    from scripts.artifact_index import latest_file
+    from scripts.catalog import CATALOG_FILE, RepoCatalog
+    from scripts.data_io import DATE_PATTERN, file_date, iter_org_repos, list_files, load_data
+    from scripts.render import Budget
+    from scripts.store import item_key
+
+
+DATA_DIR = "changelog_data/data"
+DATA_PREFIX = "weekly_changelog_"
+
+# A repo counts as active in a week when any of these lists is non-empty
+ACTIVITY_KINDS = ["commits", "pulls", "issues", "releases", "changelog_entries"]
+
+# (report key, heading) in the order the PR bodies show them
+DELTA_SECTIONS = [
+    ("newly_active", "Newly active repositories"),
+    ("gone_quiet", "Repositories that went quiet"),
+    ("prs_merged", "Pull requests merged that were open last week"),
+    ("issues_closed", "Issues closed"),
+    ("new_releases", "New releases"),
+    ("new_topics", "New topics"),
+]
+# Entries shown per section in a PR body
+TOP_DELTA = 10
+
+
+class WeekIndex:
+    """One week's repos (by URL) and items (by key), keeping only what the delta compares."""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        self.period: Dict[str, str] = {}
+        self.repos: Dict[str, Dict[str, Any]] = {}
+        self.items: Dict[str, Dict[str, Any]] = {}
+        if data is not None:
+            self.add_data(data)
+
+    def add_data(self, data: Dict[str, Any]):
+        if "repos" in data:
+            self.period = self.period or data.get("period") or {}
+        else:
+            for org_data in data.values():
+                if isinstance(org_data, dict) and org_data.get("period"):
+                    self.period = self.period or org_data["period"]
+        for org, repo in iter_org_repos(data):
+            self.add_repo(org, repo)
+
+    def add_repo(self, org: str, repo: Dict[str, Any]):
+        repo_url = repo.get("url") or f"{org}/{repo.get('name')}"
+        self.repos[repo_url] = {
+            "org": org,
+            "name": repo.get("name", "Unknown"),
+            "url": repo.get("url", ""),
+            "active": any(repo.get(kind) for kind in ACTIVITY_KINDS),
+            "topics": list(repo.get("topics") or []),
+        }
+        for kind in ("issues", "pulls", "releases"):
+            for item in repo.get(kind) or []:
+                self.items[item_key(repo_url, kind, item)] = {
+                    "repo": repo_url,
+                    "kind": kind,
+                    "title": item.get("title") or item.get("name") or item.get("tag_name") or "",
+                    "url": item.get("url", ""),
+                    "state": item.get("state"),
+                    "merged": bool(item.get("merged")),
+                }
+
+
+def _repo_entry(repo: Dict[str, Any]) -> Dict[str, str]:
+    return {"org": repo["org"], "repo": repo["name"], "url": repo["url"]}
+
+
+def week_delta(current: WeekIndex, previous: WeekIndex,
+               catalog: Optional[RepoCatalog] = None) -> Dict[str, Any]:
+    """
+    Join the current week against the previous one by repo URL and item key.
+    New topics are read from `catalog` when given, for every repo it knew by
+    the end of the previous week, whether or not that week's file lists it.
+    """
+    delta: Dict[str, Any] = {
+        "period": current.period,
+        "previous_period": previous.period,
+        "newly_active": [],
+        "gone_quiet": [],
+        "prs_merged": [],
+        "issues_closed": [],
+        "new_releases": [],
+        "new_topics": [],
+    }
+
+    for repo_url, repo in current.repos.items():
+        before = previous.repos.get(repo_url)
+        was_active = bool(before and before["active"])
+        if repo["active"] and not was_active:
+            delta["newly_active"].append(_repo_entry(repo))
+        added = None
+        if catalog is not None and previous.period.get("end") and current.period.get("end"):
+            added = catalog.topics_added(repo_url, previous.period["end"], current.period["end"])
+        if added is None and before is not None:
+            known = set(before["topics"])
+            added = [topic for topic in repo["topics"] if topic not in known]
+        if added:
+            delta["new_topics"].append(dict(_repo_entry(repo), topics=added))
+
+    for repo_url, repo in previous.repos.items():
+        now = current.repos.get(repo_url)
+        if repo["active"] and not (now and now["active"]):
+            delta["gone_quiet"].append(_repo_entry(repo))
+
+    for key, item in current.items.items():
+        before = previous.items.get(key)
+        repo = current.repos[item["repo"]]
+        entry = {"org": repo["org"], "repo": repo["name"], "title": item["title"], "url": item["url"]}
+        if item["kind"] == "pulls":
+            if item["merged"] and before is not None and not before["merged"] and before["state"] == "open":
+                delta["prs_merged"].append(entry)
+        elif item["kind"] == "issues":
+            if item["state"] == "closed" and not (before and before["state"] == "closed"):
+                delta["issues_closed"].append(entry)
+        elif before is None:
+            delta["new_releases"].append(entry)
+
+    for key, _ in DELTA_SECTIONS:
+        delta[key].sort(key=lambda entry: (entry["org"], entry["repo"].lower(), entry.get("title", "")))
+    delta["counts"] = {key: len(delta[key]) for key, _ in DELTA_SECTIONS}
+    return delta
+
+
+def _window(name: str):
+    """(start, end) dates of `weekly_changelog_<start>_to_<end>.json`."""
+    stamps = DATE_PATTERN.findall(name)
+    start = date(*(int(part) for part in stamps[0])) if len(stamps) > 1 and len(stamps[0][0]) == 4 else None
+    return start, file_date(name)
+
+
+def previous_data_file(data_file: str, data_dir: Optional[str] = None) -> Optional[str]:
+    """
+    The data file for the week before `data_file`: the latest one ending by
+    the start of its window, or failing that the latest one ending before it.
+    """
+    data_dir = data_dir or os.path.dirname(data_file) or "."
+    start, end = _window(os.path.basename(data_file))
+    if end is None:
+        return None
+
+    candidates = []
+    for name in list_files(data_dir, DATA_PREFIX):
+        if not name.endswith(".json"):
+            continue
+        name_end = file_date(name)
+        if name_end is not None and name_end < end:
+            candidates.append((start is None or name_end <= start, name_end, name))
+    if not candidates:
+        return None
+    return os.path.join(data_dir, max(candidates)[2])
+
+
+def load_delta(data_file: str, data: Optional[Dict[str, Any]] = None,
+               previous_file: Optional[str] = None,
+               catalog_file: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Delta between a data file (or its already loaded `data`) and the week
+    before it, or None when there is no earlier data file. Topics are
+    compared through the repo catalog when it exists.
+    """
+    previous_file = previous_file or previous_data_file(data_file)
+    if previous_file is None:
+        return None
+    catalog_file = catalog_file or os.getenv("REPO_CATALOG", CATALOG_FILE)
+    catalog = RepoCatalog(catalog_file) if os.path.exists(catalog_file) else None
+    current = WeekIndex(data if data is not None else load_data(data_file))
+    return week_delta(current, WeekIndex(load_data(previous_file)), catalog)
+
+
+def _entry_line(key: str, entry: Dict[str, Any]) -> str:
+    if key == "new_topics":
+        return f"- **{entry['repo']}**: {', '.join(entry['topics'])}"
+    if "title" in entry:
+        return f"- **{entry['repo']}**: [{entry['title']}]({entry['url']})"
+    return f"- [{entry['repo']}]({entry['url']})"
+
+
+def add_delta(body: Budget, delta: Dict[str, Any], heading: str, limit: int = TOP_DELTA):
+    """Render the delta into a PR body: a count line, then the top entries of each section."""
+    counts = delta.get("counts", {})
+    previous = delta.get("previous_period") or {}
+    summary = ", ".join(f"{counts[key]} {title[0].lower() + title[1:]}" for key, title in DELTA_SECTIONS
+                        if counts.get(key))
+    if not body.add([heading, f"*Compared with {previous.get('start', '?')} to {previous.get('end', '?')}: "
+                              f"{summary or 'no changes'}*", ""]):
+        return
+
+    for key, title in DELTA_SECTIONS:
+        entries = delta.get(key) or []
+        if not entries or not body.add(f"**{title}** ({len(entries)}):"):
+            continue
+        body.add_items([_entry_line(key, entry) for entry in entries],
+                       more=lambda n: f"- *...and {n} more*", limit=limit)
+        body.add("")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Print the delta between the latest (or given) data file and the week before it."""
+    argv = sys.argv[1:] if argv is None else argv
+    data_file = argv[0] if argv else latest_file(DATA_DIR, "weekly_changelog")
+    if not data_file:
+        print("No weekly changelog files found.")
+        return None
+
+    delta = load_delta(data_file, previous_file=argv[1] if len(argv) > 1 else None)
+    if delta is None:
+        print(f"No data file before {os.path.basename(data_file)} to compare with.")
+        return None
+
+    print(json.dumps(delta, indent=2))
+    return delta
+
+
+if __name__ == "__main__":
+    main()
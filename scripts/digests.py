@@ -0,0 +1,204 @@
+"""
+Per-team digests in a single pass over the weekly data.
+
+Teams are defined in `TEAMS_CONFIG` (default `teams.json`) by repo topics,
+repo names, or both:
+
+    {
+      "platform": {"title": "Platform", "topics": ["terraform", "batcave"]},
+      "income-verification": {"repos": ["DSACMS/iv-cbv-payroll", "iv-verify"]}
+    }
+
+A `TeamIndex` maps each topic and repo name to its teams once. The data file
+is then streamed a single time: each repo is summarized once, and the result
+is merged into the summary of every team that repo belongs to
+(`SummaryEngine.merge`). Adding teams only adds those cheap merges and the
+rendering. Every team gets the same outputs as the org-wide summary (summary
+JSON, mailto, Slack, both PR bodies and appendices). They are written to
+`changelog_data/digests/` with the team's name in front of each file name.
+
+    python scripts/digests.py [data_file]
+"""
+
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from artifact_index import index_for, latest_file, summary_headline, updating
+    from catalog import CATALOG_FILE
+    from data_io import iter_org_repos, load_json
+    from json_stream import ChangelogStream
+    from summary_engine import DATA_DIR, SummaryEngine, data_metadata, output_paths, render_outputs
+except ImportError:
+    from scripts.artifact_index import index_for, latest_file, summary_headline, updating
+    from scripts.catalog import CATALOG_FILE
+    from scripts.data_io import iter_org_repos, load_json
+    from scripts.json_stream import ChangelogStream
+    from scripts.summary_engine import DATA_DIR, SummaryEngine, data_metadata, output_paths, render_outputs
+
+
+TEAMS_CONFIG = "teams.json"
+DIGESTS_DIR = "changelog_data/digests"
+
+
+def team_slug(team: str) -> str:
+    """File-name-safe form of a team name: `Income Verification` -> `income-verification`"""
+    return re.sub(r"[^a-z0-9]+", "-", team.lower()).strip("-") or "team"
+
+
+def load_teams(path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Team definitions from the config file, or {} when there is none."""
+    path = path or os.getenv("TEAMS_CONFIG", TEAMS_CONFIG)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        teams = json.load(f)
+    for team, definition in teams.items():
+        if not definition.get("topics") and not definition.get("repos"):
+            raise ValueError(f"Team {team!r} in {path} has no topics or repos")
+    return teams
+
+
+class TeamIndex:
+    """Topic -> teams and repo name -> teams, built once from the team definitions."""
+
+    def __init__(self, teams: Dict[str, Dict[str, Any]]):
+        self.teams = list(teams)
+        self.by_topic: Dict[str, List[str]] = {}
+        # "org/name" or bare "name" (any org) -> teams
+        self.by_repo: Dict[str, List[str]] = {}
+        for team, definition in teams.items():
+            for topic in definition.get("topics") or []:
+                self.by_topic.setdefault(topic.lower(), []).append(team)
+            for repo in definition.get("repos") or []:
+                self.by_repo.setdefault(repo.lower(), []).append(team)
+
+    def teams_for(self, org: Optional[str], repo_data: Dict[str, Any]) -> List[str]:
+        """Teams a repo belongs to, in config order."""
+        name = (repo_data.get("name") or "").lower()
+        matched = set(self.by_repo.get(name, ()))
+        matched.update(self.by_repo.get(f"{(org or '').lower()}/{name}", ()))
+        for topic in repo_data.get("topics") or []:
+            matched.update(self.by_topic.get(topic.lower(), ()))
+        return [team for team in self.teams if team in matched] if matched else []
+
+
+def fan_out(repos: Iterable[Tuple[str, Dict[str, Any]]], index: TeamIndex) -> Dict[str, SummaryEngine]:
+    """
+    Accumulate every team's summary in one pass over `repos`. Each repo is
+    summarized once, then merged into each of its teams' engines.
+    """
+    engines = {team: SummaryEngine() for team in index.teams}
+    for org, repo_data in repos:
+        teams = index.teams_for(org, repo_data)
+        if not teams:
+            continue
+        repo_engine = SummaryEngine()
+        repo_engine.add_repo(org, repo_data)
+        for team in teams:
+            engines[team].merge(repo_engine)
+    return engines
+
+
+def team_repo_counts(index: TeamIndex, catalog_file: Optional[str] = None) -> Dict[str, int]:
+    """
+    Repos per team in the repo catalog, active or not, since weekly files
+    only list active repos. Empty when there is no catalog.
+    """
+    catalog_file = catalog_file or os.getenv("REPO_CATALOG", CATALOG_FILE)
+    if not os.path.exists(catalog_file):
+        return {}
+    counts = {team: 0 for team in index.teams}
+    for repo in load_json(catalog_file).get("repos", {}).values():
+        for team in index.teams_for(repo.get("org"), repo):
+            counts[team] += 1
+    return counts
+
+
+def digest_paths(team: str, output_dir: str = DIGESTS_DIR, now: Optional[datetime] = None) -> Dict[str, str]:
+    """Output paths for one team: the org-wide file names, prefixed with the team."""
+    slug = team_slug(team)
+    return {
+        kind: os.path.join(output_dir, f"{slug}_{os.path.basename(path)}")
+        for kind, path in output_paths(output_dir, now).items()
+    }
+
+
+def generate_digests(data_file: str, teams: Dict[str, Dict[str, Any]], output_dir: str = DIGESTS_DIR,
+                     data: Optional[Dict[str, Any]] = None,
+                     now: Optional[datetime] = None) -> Dict[str, Dict[str, str]]:
+    """
+    Build and write every team's digest from one read of the data file (or
+    its already loaded `data`). Returns {team: {output kind: path}}.
+    """
+    index = TeamIndex(teams)
+    if data is not None:
+        engines = fan_out(iter_org_repos(data), index)
+        metadata = data_metadata(data)
+    else:
+        stream = ChangelogStream(data_file)
+        engines = fan_out(stream, index)
+        metadata = data_metadata(stream.skeleton)
+    totals = team_repo_counts(index)
+
+    now = now or datetime.now(timezone.utc)
+    os.makedirs(output_dir, exist_ok=True)
+    written = {}
+    # (path, summary it was rendered from), indexed together at the end
+    artifacts = []
+    for team, engine in engines.items():
+        title = teams[team].get("title") or team
+        engine.set_metadata(metadata["period"], metadata["generated_at"], totals.get(team))
+        summary = dict(engine.full_summary(), team=title)
+        condensed = dict(engine.condensed_summary(), team=title)
+
+        contents = {
+            "summary": json.dumps(summary, indent=2),
+            "summary_condensed": json.dumps(condensed, indent=2),
+        }
+        contents.update(render_outputs(summary, condensed))
+        for kind in ("pr_title", "pr_title_condensed"):
+            contents[kind] = f"[{title}] {contents[kind]}"
+
+        paths = digest_paths(team, output_dir, now)
+        for kind, path in paths.items():
+            with open(path, "w") as f:
+                f.write(contents[kind])
+
+        artifacts.extend((path, condensed if kind.endswith("_condensed") else summary)
+                         for kind, path in paths.items())
+        written[team] = paths
+
+    # One index update for every team, instead of one per team
+    with updating(index_for(output_dir)) as artifact_index:
+        for path, source in artifacts:
+            artifact_index.add(path, period=source["period"], generated_at=source["generated_at"],
+                               counts=summary_headline(source))
+
+    return written
+
+
+def main(argv: Optional[List[str]] = None):
+    """Write every team's digest for the latest (or given) weekly data file."""
+    argv = sys.argv[1:] if argv is None else argv
+    teams = load_teams()
+    if not teams:
+        print(f"No teams configured in {os.getenv('TEAMS_CONFIG', TEAMS_CONFIG)}; skipping team digests.")
+        return {}
+
+    data_file = argv[0] if argv else latest_file(DATA_DIR, "weekly_changelog")
+    if not data_file:
+        print("No weekly changelog files found.")
+        return {}
+
+    written = generate_digests(data_file, teams)
+    print(f"Wrote digests for {len(written)} teams from {os.path.basename(data_file)} to {DIGESTS_DIR}/")
+    return written
+
+
+if __name__ == "__main__":
+    main()
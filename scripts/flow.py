@@ -0,0 +1,168 @@
+"""
+PR and issue flow metrics from the columnar archive.
+
+The creation, merge and close times already stored in the archive (see
+`columnar.py`) are read once as NumPy arrays, and every metric is computed
+from them with vectorized operations, without any API calls:
+
+- time to merge: percentiles for PRs merged in the report week and in the
+  FLOW_WEEKS weeks up to it,
+- merge throughput per week, and per repo with each repo's median time to
+  merge,
+- the age distribution of PRs still open,
+- issue backlog growth: issues opened and closed each week, and how many
+  were open at the end of each week.
+
+Weeks are aligned to the report period like the trends (`trends.py`), so the
+last week is the seven days ending on the period's end date. Issues have no
+close time in the weekly data, so an issue counts as closed at the end of the
+first week it was seen closed. An open PR's age is measured from its creation,
+using the state it had the last time a weekly file listed it.
+
+    python scripts/flow.py [end_date]
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+try:
+    from columnar import ARCHIVE_DIR, KIND_IDS, STATE_IDS, WEEK_SECONDS, ColumnarArchive, parse_timestamps
+    from trends import DAY_SECONDS, repo_rows
+except ImportError:
+    from scripts.columnar import ARCHIVE_DIR, KIND_IDS, STATE_IDS, WEEK_SECONDS, ColumnarArchive, parse_timestamps
+    from scripts.trends import DAY_SECONDS, repo_rows
+
+
+FLOW_WEEKS = 12
+PERCENTILES = [50, 75, 90]
+# Upper bounds (in days) of the open PR age buckets; the last bucket is open-ended
+AGE_EDGES = [1, 7, 30, 90, 365]
+AGE_LABELS = ["Under a day", "1-7 days", "1-4 weeks", "1-3 months", "3-12 months", "Over a year"]
+# Repos kept in the per-repo throughput list
+TOP_FLOW = 10
+
+HOUR_SECONDS = 3600
+
+
+def percentiles(values: np.ndarray) -> Dict[str, Any]:
+    """Count and PERCENTILES of `values`, rounded to one decimal; None when empty."""
+    stats: Dict[str, Any] = {"count": int(len(values))}
+    points = np.percentile(values, PERCENTILES) if len(values) else [None] * len(PERCENTILES)
+    for p, value in zip(PERCENTILES, points):
+        stats[f"p{p}"] = round(float(value), 1) if value is not None else None
+    return stats
+
+
+def group_medians(groups: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """Median of `values` within each of `n_groups` groups at once; NaN for empty groups."""
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+    counts = np.bincount(groups, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+
+    medians = np.full(n_groups, np.nan)
+    has = counts > 0
+    low = starts[has] + (counts[has] - 1) // 2
+    high = starts[has] + counts[has] // 2
+    medians[has] = (ordered[low] + ordered[high]) / 2
+    return medians
+
+
+def flow_metrics(archive: ColumnarArchive, end: str, weeks: int = FLOW_WEEKS,
+                 top: int = TOP_FLOW) -> Dict[str, Any]:
+    """Flow metrics for the `weeks` weeks ending on `end`."""
+    kind = np.asarray(archive["kind"])
+    state = np.asarray(archive["state"])
+    ts = np.asarray(archive["ts"])
+    ts_end = np.asarray(archive["ts_end"])
+
+    names, dense = repo_rows(archive.repo_names())
+    lookup = np.full(len(archive.strings), -1, dtype=np.int64)
+    lookup[np.asarray(archive.meta["repo_ids"], dtype=np.int64)] = dense
+
+    end_ts = parse_timestamps([end])[0] + DAY_SECONDS
+    # Week boundaries, oldest first: weeks + 1 of them, the last one the end of the period
+    bounds = end_ts - WEEK_SECONDS * np.arange(weeks, -1, -1, dtype=np.int64)
+    week_starts = [str(np.datetime64(int(b), "s").astype("datetime64[D]")) for b in bounds[:-1]]
+
+    # Time to merge and throughput, by merge time
+    pulls = kind == KIND_IDS["pulls"]
+    merged = pulls & (state == STATE_IDS["merged"]) & (ts >= 0) & (ts_end >= bounds[0]) & (ts_end < end_ts)
+    merged_at = ts_end[merged]
+    hours = np.maximum(merged_at - ts[merged], 0) / HOUR_SECONDS
+    week = np.searchsorted(bounds, merged_at, side="right") - 1
+    this_week = week == weeks - 1
+
+    rows = lookup[np.asarray(archive["repo"])[merged]]
+    per_repo = np.bincount(rows, minlength=len(names))
+    medians = group_medians(rows, hours, len(names))
+    ranked = sorted(np.nonzero(per_repo)[0], key=lambda r: (-per_repo[r], names[r]))
+
+    # Open PRs, aged at the end of the period
+    open_pulls = pulls & (state == STATE_IDS["open"]) & (ts >= 0) & (ts < end_ts)
+    ages = (end_ts - ts[open_pulls]) / DAY_SECONDS
+    buckets = np.bincount(np.searchsorted(AGE_EDGES, ages, side="right"), minlength=len(AGE_LABELS))
+
+    # Issue backlog: issues created (closed) before each boundary, from sorted times
+    issues = (kind == KIND_IDS["issues"]) & (ts >= 0)
+    created = np.searchsorted(np.sort(ts[issues]), bounds)
+    closed_at = ts_end[issues & (state == STATE_IDS["closed"]) & (ts_end >= 0)]
+    closed = np.searchsorted(np.sort(closed_at), bounds)
+    backlog = created - closed
+
+    return {
+        "period": {"start": week_starts[-1], "end": end},
+        "weeks": weeks,
+        "week_starts": week_starts,
+        # Hours from opening to merge
+        "time_to_merge": {
+            "this_week": percentiles(hours[this_week]),
+            "trailing": percentiles(hours),
+        },
+        "throughput": {
+            "weekly": np.bincount(week, minlength=weeks).tolist(),
+            "top_repos": [
+                {"repo": names[r], "merged": int(per_repo[r]), "median_hours": round(float(medians[r]), 1)}
+                for r in ranked[:top]
+            ],
+            "repo_count": len(ranked),
+        },
+        # Ages in days
+        "open_pulls": dict(percentiles(ages), buckets=dict(zip(AGE_LABELS, buckets.tolist()))),
+        "issue_backlog": {
+            "opened": np.diff(created).tolist(),
+            "closed": np.diff(closed).tolist(),
+            "open": backlog[1:].tolist(),
+            "growth": int(backlog[-1] - backlog[0]),
+        },
+    }
+
+
+def load_flow(end: str, archive_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Flow metrics for the weeks ending on `end`, or None when there is no columnar archive."""
+    archive_dir = archive_dir or os.getenv("COLUMNAR_ARCHIVE_DIR", ARCHIVE_DIR)
+    if not os.path.exists(os.path.join(archive_dir, "meta.json")):
+        return None
+    return flow_metrics(ColumnarArchive(archive_dir), end[:10])
+
+
+def main(argv: Optional[List[str]] = None):
+    """Print the flow metrics for the weeks ending on a date (today by default)."""
+    argv = sys.argv[1:] if argv is None else argv
+    end = argv[0] if argv else datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    flow = load_flow(end)
+    if flow is None:
+        print("Columnar archive not found. Run scripts/columnar.py first.")
+        return None
+
+    print(json.dumps(flow, indent=2))
+    return flow
+
+
+if __name__ == "__main__":
+    main()
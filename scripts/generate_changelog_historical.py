@@ -10,6 +10,8 @@ from datetime import datetime, timezone
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from util import ChangelogGenerator # type: ignore
+from store import ActivityStore # type: ignore
+from profiles import write_profile # type: ignore
 
 
 def parse_dates(value: str, label: str) -> str:
@@ -73,8 +75,24 @@ def main() -> None:
     print(f"Output file: {filename}")
     print("-" * 60)
 
-    gen = ChangelogGenerator(token, filename=filename, log_history_start=start_date, log_history_end=end_date)
-    saved = gen.get_and_save_data(org_name=org_name, archival=True)
+    db_path = os.getenv("ACTIVITY_DB")
+    store = ActivityStore(db_path) if db_path else None
+
+    gen = ChangelogGenerator(token, filename=filename, log_history_start=start_date, log_history_end=end_date, store=store)
+    profile = os.getenv("OUTPUT_PROFILE", "full")
+    if store:
+        # Crawl into the store, then write the file as a windowed export of it
+        gen.get_data(org_name, archival=True)
+        data = store.export_window(org_name, start_date, end_date, include_inactive=True)
+        store.close()
+    else:
+        data = gen.get_data(org_name, archival=True)
+
+    if profile == "full":
+        saved = gen.save_data(data)
+    else:
+        write_profile(data, filename, profile)
+        saved = filename
 
     if saved:
         print("-" * 60)
@@ -4,16 +4,52 @@ import json
 import os
 import re
 
-from util import ChangelogGenerator
+try:
+    from util import ChangelogGenerator
+    from store import ActivityStore
+    from catalog import RepoCatalog, CATALOG_FILE, hydrate
+    from profiles import write_profile
+except ImportError:
+    from scripts.util import ChangelogGenerator
+    from scripts.store import ActivityStore
+    from scripts.catalog import RepoCatalog, CATALOG_FILE, hydrate
+    from scripts.profiles import write_profile
 
-def main():
-    now = datetime.now(timezone.utc)
+# Org-level counts made during the fetch, which the activity store does not keep
+FETCH_COUNTS = ["filtered_actors", "excluded_repo_count"]
+
+def weekly_window(now=None):
+    """Return (start_date, end_date, filename) for the week ending `now`."""
+    now = now or datetime.now(timezone.utc)
     one_week_ago = now - timedelta(days=7)
 
     start_date = one_week_ago.strftime("%Y-%m-%d")
     end_date = now.strftime("%Y-%m-%d")
 
     filename = f"changelog_data/data/weekly_changelog_{start_date}_to_{end_date}.json"
+    return start_date, end_date, filename
+
+def with_fetch_counts(exported, fetched):
+    """
+    Copy the counts made during the fetch onto the data exported from the
+    activity store, which only holds kept items and repos.
+    """
+    for key in FETCH_COUNTS:
+        if key in fetched:
+            exported[key] = fetched[key]
+    filtered = {repo["url"]: repo["filtered_actors"]
+                for repo in fetched["repos"] if "filtered_actors" in repo}
+    for repo in exported["repos"]:
+        if repo["url"] in filtered:
+            repo["filtered_actors"] = filtered[repo["url"]]
+    return exported
+
+def generate_weekly():
+    """
+    Fetch the last week of activity and write the weekly data file. Returns
+    (filename, data), where data is what `load_data(filename)` would return.
+    """
+    start_date, end_date, filename = weekly_window()
 
     os.makedirs("changelog_data/data", exist_ok=True)
 
@@ -23,17 +59,42 @@ def main():
     
     org_names = ["DSACMS"]
 
-    gen = ChangelogGenerator(token, filename=filename, log_history_start=start_date, log_history_end=end_date)
+    # Optional SQLite activity store; when set, the file is exported from it
+    db_path = os.getenv("ACTIVITY_DB")
+    store = ActivityStore(db_path) if db_path else None
+
+    gen = ChangelogGenerator(token, filename=filename, log_history_start=start_date, log_history_end=end_date, store=store)
 
     combined_data = {}
     for org_name in org_names:
         print(f"Fetching data for {org_name}...")
         combined_data[org_name] = gen.get_data(org_name)
+        if store:
+            combined_data[org_name] = with_fetch_counts(
+                store.export_window(org_name, start_date, end_date), combined_data[org_name]
+            )
 
-    with open(filename, "w") as f:
-        json.dump(combined_data, f, indent=2)
+    if store:
+        store.close()
+
+    # Static repo metadata lives in the catalog; the weekly file only references it
+    catalog = RepoCatalog(os.getenv("REPO_CATALOG", CATALOG_FILE))
+    for org_name in org_names:
+        combined_data[org_name] = catalog.normalize(
+            org_name, combined_data[org_name], end_date,
+            catalog_ref=os.path.relpath(catalog.path, os.path.dirname(filename))
+        )
+    catalog.save()
+
+    # OUTPUT_PROFILE=slim keeps commit subjects only and interns authors and repo names
+    write_profile(combined_data, filename, os.getenv("OUTPUT_PROFILE", "full"))
 
     print(f"Saved combined changelog for {len(org_names)} orgs to {filename}") 
 
+    return filename, hydrate(combined_data, filename)
+
+def main():
+    return generate_weekly()
+
 if __name__ == "__main__":
     main()
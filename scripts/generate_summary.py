@@ -1,153 +1,35 @@
 import json
 import os
 from datetime import datetime, timezone
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import urllib.parse
 
+try:
+    from artifact_index import latest_file, record_artifacts, summary_headline
+    from render import MAILTO_LIMIT, PR_BODY_LIMIT, SLACK_LIMIT, Budget, blob_url, url_length
+    from delta import add_delta
+    from flow import AGE_LABELS, FLOW_WEEKS
+    from summary_engine import add_trends, add_week_delta, pr_branch, summarize_file
+    from trends import ANOMALY_Z, BASELINE_WEEKS, METRIC_LABELS, MOVING_WEEKS, QUIET_WEEKS
+except ImportError:
+    from scripts.artifact_index import latest_file, record_artifacts, summary_headline
+    from scripts.render import MAILTO_LIMIT, PR_BODY_LIMIT, SLACK_LIMIT, Budget, blob_url, url_length
+    from scripts.delta import add_delta
+    from scripts.flow import AGE_LABELS, FLOW_WEEKS
+    from scripts.summary_engine import add_trends, add_week_delta, pr_branch, summarize_file
+    from scripts.trends import ANOMALY_Z, BASELINE_WEEKS, METRIC_LABELS, MOVING_WEEKS, QUIET_WEEKS
 
-def normalize_data(data: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Normalize changelog data into a single top-level structure with a flat
-    `repos` list, regardless of whether the source file is single-org
-    (legacy: {"repos": [...]}) or multi-org ({"DSACMS": {"repos": [...]}, ...}).
 
-    Each repo in the returned `repos` list is tagged with its `org`.
-    """
-    # Legacy single-org shape: already has top-level "repos"
-    if "repos" in data:
-        for repo in data["repos"]:
-            repo.setdefault("org", data.get("org_name", "unknown"))
-        return data
-
-    # Multi-org shape: keys are org names mapping to per-org data
-    merged = {
-        "repos": [],
-        "period": {},
-        "generated_at": None,
-        "total_repo_count": 0,
-    }
-
-    for org_name, org_data in data.items():
-        if not isinstance(org_data, dict) or "repos" not in org_data:
-            continue
-
-        if not merged["period"] and org_data.get("period"):
-            merged["period"] = org_data["period"]
-        if merged["generated_at"] is None and org_data.get("generated_at"):
-            merged["generated_at"] = org_data["generated_at"]
-
-        merged["total_repo_count"] += org_data.get(
-            "total_repo_count", len(org_data["repos"])
-        )
-
-        for repo in org_data["repos"]:
-            repo["org"] = org_name
-            merged["repos"].append(repo)
-
-    if not merged["repos"]:
-        raise ValueError("Invalid data structure: no repos found in any org")
-
-    return merged
+# Repos shown in each section of the PR body; the appendix has all of them
+TOP_REPOS = 25
+
 
 def generate_summary(data_file: str) -> Dict[str, Any]:
     """Generate a summary from changelog data."""
-    try:
-        with open(data_file, 'r') as f:
-            data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"Error reading data file {data_file}: {e}")
-        raise
-
-    # if "repos" not in data:
-    #     print("Invalid data structure: missing 'repos' key")
-    #     raise ValueError("Invalid data structure: missing 'repos' key")
-
-    data = normalize_data(data)
-
-    summary = {
-        "period": data.get("period", {}),
-        "generated_at": data.get("generated_at"),
-        "total_repos": data.get("total_repo_count", len(data["repos"])),
-        "active_repos": 0,
-        "total_issues": 0,
-        "total_pulls": 0,
-        "total_commits": 0,
-        "total_changelog_entries": 0,
-        "repos_with_activity": [],
-        "key_changes": []
-    }
+    return summarize_file(data_file, condensed=False).full_summary()
 
-    period = summary.get("period", {})
-    period_start = period.get("start", "")
-    period_end = period.get("end", "")
-
-    for repo_data in data.get("repos", []):
-        try:
-            repo_name = repo_data.get("name", "Unknown")
-            has_activity = False
-
-            repo_summary = {
-                "name": repo_name,
-                "org": repo_data.get("org", "unknown"),
-                "url": repo_data["url"],
-                "issues": len(repo_data["issues"]),
-                "pulls": len(repo_data["pulls"]),
-                "commits": len(repo_data["commits"]),
-                "changelog_entries": len(repo_data.get("changelog_entries", [])),
-                "highlights": []
-            }
-
-            summary["total_issues"] += len(repo_data.get("issues", []))
-            summary["total_pulls"] += len(repo_data.get("pulls", []))
-            summary["total_commits"] += len(repo_data.get("commits", []))
-            summary["total_changelog_entries"] += len(repo_data.get("changelog_entries", []))
-
-            if (repo_data.get("issues") or repo_data.get("pulls") or
-                repo_data.get("commits") or repo_data.get("changelog_entries")):
-                has_activity = True
-                summary["active_repos"] += 1
-
-            for entry in repo_data.get("changelog_entries", []):
-                for change in entry.get("changes", []):
-                    category = change.get("category", "")
-                    items = change.get("items", [])
-
-                    if category.lower().startswith(('add', 'new')):
-                        for item in items[:2]:
-                            repo_summary["highlights"].append(f"Added: {item}")
-                            summary["key_changes"].append(f"{repo_name}: Added {item}")
-                    
-                    elif category.lower().startswith(('fix', 'bug')):
-                        for item in items[:2]:
-                            repo_summary["highlights"].append(f"Fixed: {item}")
-                            summary["key_changes"].append(f"{repo_name}: Fixed {item}")
-
-                    elif category.lower().startswith(('chang')):
-                        for item in items[:1]:
-                            repo_summary["highlights"].append(f"Changed: {item}")
-                            summary["key_changes"].append(f"{repo_name}: Changed {item}")
-
-            merged_prs = []
-            for pr in repo_data.get("pulls", []):
-                if pr.get("merged") and pr.get("merged_at"):
-                    merged_date = pr["merged_at"][:10]
-                    if period_start <= merged_date <= period_end:
-                        merged_prs.append(pr)
-
-            if merged_prs:
-                repo_summary["highlights"].append(f"{len(merged_prs)} PR(s) merged")
-
-            new_issues = [issue for issue in repo_data["issues"] if issue.get("is_new")]
-            if new_issues:
-                repo_summary["highlights"].append(f"{len(new_issues)} new issue(s)")
-
-            summary["repos_with_activity"].append(repo_summary)
-        
-        except Exception as e:
-            print(f"Error processing repo {repo_data.get('name', 'Unknown')}: {e}")
-            continue
-
-    return summary
+def _most_active(repos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return sorted(repos, key=lambda x: x.get('commits', 0) + x.get('pulls', 0), reverse=True)
 
 def create_mailto_link(summary: Dict[str, Any]) -> str:
     """Create a mailto link with summary that fits within character limits."""
@@ -156,44 +38,36 @@ def create_mailto_link(summary: Dict[str, Any]) -> str:
     end_date = period.get("end", "")
 
     subject = f"Weekly Changelog Summary ({start_date} to {end_date})"
+    prefix = f"mailto:?subject={urllib.parse.quote(subject)}&body="
 
-    body_lines = [
+    # The budget is the encoded length of the whole link
+    body = Budget(MAILTO_LIMIT - len(prefix), measure=url_length)
+    body.add([
         f"Weekly Developement Summary: {start_date} to {end_date}",
         "",
         f"Overview:",
         f"• {summary.get('active_repos', 0)} of {summary.get('total_repos', 0)} repos with activity",
         f"• {summary.get('total_commits', 0)} commits, {summary.get('total_pulls', 0)} PRs, {summary.get('total_issues', 0)} issues",
         ""
-    ]
-
-    if summary.get('key_changes'):
-        body_lines.append("Key Changes:")
-        for change in summary['key_changes'][:10]:
-            if len(' '.join(body_lines)) + len(f"• {change}") < 1500:
-                body_lines.append(f"• {change}")
-            else:
-                body_lines.append("• ... and more")
-                break
-        body_lines.append("")
-
-    if summary.get('repos_with_activity'):
-        body_lines.append("Most Active Repos:")
-        sorted_repos = sorted(summary['repos_with_activity'],
-                              key=lambda x: x.get('commits', 0) + x.get('pulls', 0), reverse=True)
-        for repo in sorted_repos[:5]:
-            if len(' '.join(body_lines)) + len(f"• {repo['name']}") < 1800:
-                body_lines.append(f"• {repo['name']}: {repo.get('commits', 0)} commits, {repo.get('pulls', 0)} PRs")
-            else:
-                break
+    ])
 
-    body = '\n'.join(body_lines)
+    repo_lines = [f"• {repo['name']}: {repo.get('commits', 0)} commits, {repo.get('pulls', 0)} PRs"
+                  for repo in _most_active(summary.get('repos_with_activity') or [])][:5]
+    # Key changes leave room for the most active repos, so both sections stay useful
+    repos_size = body.cost(["", "Most Active Repos:"] + repo_lines) if repo_lines else 0
 
-    subject_encoded = urllib.parse.quote(subject)
-    body_encoded = urllib.parse.quote(body)
+    if summary.get('key_changes'):
+        if body.add("Key Changes:", extra=repos_size):
+            body.add_items([f"• {change}" for change in summary['key_changes']],
+                           more=lambda n: f"• ... and {n} more", limit=10, reserve=repos_size,
+                           more_when_limited=False)
+            body.add("")
 
-    mailto_link = f"mailto:?subject={subject_encoded}&body={body_encoded}"
+    if repo_lines:
+        if body.add("Most Active Repos:"):
+            body.add_items(repo_lines, more=lambda n: f"• ... and {n} more")
 
-    return mailto_link
+    return prefix + urllib.parse.quote(body.render())
 
 def create_slack_message(summary: Dict[str, Any]) -> str:
     """Create a Slack message."""
@@ -201,38 +75,186 @@ def create_slack_message(summary: Dict[str, Any]) -> str:
     start_date = period.get("start", "")
     end_date = period.get("end", "")
 
-    message_blocks = [
+    message = Budget(SLACK_LIMIT)
+    message.add([
          f"Weekly Changelog Summary* ({start_date} to {end_date})",
         "",
         f"• {summary.get('active_repos', 0)} of {summary.get('total_repos', 0)} repos with activity",
         f"• {summary.get('total_commits', 0)} commits | {summary.get('total_pulls', 0)} PRs | {summary.get('total_issues', 0)} issues",
         ""
-    ]
+    ])
 
     if summary.get('key_changes'):
-        message_blocks.append("*Key Changes:*")
-        for change in summary['key_changes'][:8]:
-           message_blocks.append(f"• {change}")
-        message_blocks.append("")
+        if message.add("*Key Changes:*"):
+            message.add_items([f"• {change}" for change in summary['key_changes']],
+                              more=lambda n: f"• _...and {n} more_", limit=8, more_when_limited=False)
+            message.add("")
+
+    if summary.get('repos_with_activity'):
+        if message.add("*Most Active Repos:*"):
+            message.add_items([f"• *{repo['name']}*: {repo.get('commits', 0)} commits, {repo.get('pulls', 0)} PRs"
+                               for repo in _most_active(summary['repos_with_activity'])],
+                              more=lambda n: f"• _...and {n} more_", limit=5, more_when_limited=False)
+
+    return message.render()
+
+def key_changes_by_repo(summary: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Group key changes by repo name, in the order they were found."""
+    changes_by_repo: Dict[str, List[str]] = {}
+    records = summary.get('key_change_records')
+    if records is not None:
+        for record in records:
+            changes_by_repo.setdefault(record['repo'], []).append(f"{record['kind']} {record['text']}")
+    else:
+        # Summaries written before records were kept only have "repo: change" strings
+        for change in summary.get('key_changes', []):
+            repo_name, _, change_text = change.partition(': ')
+            changes_by_repo.setdefault(repo_name, []).append(change_text)
+    return changes_by_repo
+
+def _key_change_block(repo_name: str, changes: List[str]) -> List[str]:
+    return [f"### {repo_name}"] + [f"- {change}" for change in changes] + [""]
+
+def _repo_detail_block(repo: Dict[str, Any]) -> List[str]:
+    block = [
+        f"### [{repo['name']}]({repo.get('url', '')})",
+        f"- **Commits**: {repo.get('commits', 0)}",
+        f"- **Pull Request**: {repo.get('pulls', 0)}",
+        f"- **Issues**: {repo.get('issues', 0)}",
+        f"- **Changelog Entries**: {repo.get('changelog_entries', 0)}",
+    ]
+    if repo['highlights']:
+        block.append("- **Highlights**:")
+        block.extend(f" - {highlight}" for highlight in repo['highlights'])
+    block.append("")
+    return block
+
+def _trends_block(trends: Dict[str, Any]) -> List[str]:
+    period = trends.get('period', {})
+    block = [
+        "## Trends",
+        "",
+        # The weeks are whole days, while the overview counts everything fetched for the report
+        f"*Weeks of seven days; this week is {period.get('start', '')} to {period.get('end', '')}, "
+        "so counts can differ from the overview.*",
+        "",
+        f"| Metric | This Week | Last Week | Change | {MOVING_WEEKS}-Week Average |",
+        "| --- | ---: | ---: | ---: | ---: |",
+    ]
+    for metric, totals in trends['totals'].items():
+        block.append(f"| {METRIC_LABELS.get(metric, metric)} | {totals['this_week']} | {totals['last_week']} "
+                     f"| {totals['delta']:+d} | {totals['moving_average']} |")
+    block.append("")
+    return block
+
+def _anomaly_line(anomaly: Dict[str, Any]) -> str:
+    label = METRIC_LABELS.get(anomaly['metric'], anomaly['metric']).lower()
+    return f"- **{anomaly['repo']}**: {anomaly['count']} {label} (usually {anomaly['baseline']}, z = {anomaly['z']})"
+
+def _quiet_line(repo: Dict[str, Any]) -> str:
+    return (f"- **{repo['repo']}**: last active the week of {repo['last_active_week']} "
+            f"(active {repo['active_weeks']} of the last {BASELINE_WEEKS + QUIET_WEEKS} weeks)")
+
+def _add_trends(body: Budget, trends: Dict[str, Any]):
+    if not body.add(_trends_block(trends)):
+        return
+    sections = [
+        (f"**Unusual activity** (|z| ≥ {ANOMALY_Z:g} against the previous {BASELINE_WEEKS} weeks):",
+         [_anomaly_line(anomaly) for anomaly in trends['anomalies']], trends['anomaly_count']),
+        (f"**Went quiet** (no activity in the last {QUIET_WEEKS} weeks):",
+         [_quiet_line(repo) for repo in trends['went_quiet']], trends['quiet_count']),
+    ]
+    for heading, lines, total in sections:
+        if lines and body.add(heading):
+            # The trends report itself keeps only the top entries
+            hidden = total - len(lines)
+            if body.add_items(lines, more=lambda n: f"- *...and {n + hidden} more*") == len(lines) and hidden:
+                body.add(f"- *...and {hidden} more*")
+            body.add("")
+
+def _duration(hours: Optional[float]) -> str:
+    if hours is None:
+        return "n/a"
+    return f"{hours:.1f}h" if hours < 48 else f"{hours / 24:.1f}d"
+
+def _merge_times(stats: Dict[str, Any]) -> str:
+    return (f"median {_duration(stats['p50'])}, p75 {_duration(stats['p75'])}, "
+            f"p90 {_duration(stats['p90'])} ({stats['count']} PRs)")
+
+def _flow_block(flow: Dict[str, Any]) -> List[str]:
+    merged = flow['throughput']['weekly']
+    open_pulls = flow['open_pulls']
+    backlog = flow['issue_backlog']
+    open_line = f"- **Open PRs**: {open_pulls['count']}"
+    if open_pulls['count']:
+        ages = ", ".join(f"{label.lower()}: {open_pulls['buckets'][label]}" for label in AGE_LABELS)
+        open_line += f", median age {open_pulls['p50']:.1f}d ({ages})"
+    return [
+        "## Flow",
+        "",
+        f"- **Time to merge**: this week {_merge_times(flow['time_to_merge']['this_week'])}; "
+        f"last {FLOW_WEEKS} weeks {_merge_times(flow['time_to_merge']['trailing'])}",
+        f"- **PRs merged**: {merged[-1]} this week, {sum(merged) / len(merged):.1f} per week "
+        f"over the last {FLOW_WEEKS} weeks",
+        open_line,
+        f"- **Issue backlog**: {backlog['open'][-1]} open ({backlog['opened'][-1]} opened and "
+        f"{backlog['closed'][-1]} closed this week, {backlog['growth']:+d} over the last {FLOW_WEEKS} weeks)",
+        "",
+    ]
+
+def _throughput_line(repo: Dict[str, Any]) -> str:
+    return f"- **{repo['repo']}**: {repo['merged']} merged, median {_duration(repo['median_hours'])} to merge"
+
+def _add_flow(body: Budget, flow: Dict[str, Any]):
+    if not body.add(_flow_block(flow)):
+        return
+    lines = [_throughput_line(repo) for repo in flow['throughput']['top_repos']]
+    if lines and body.add(f"**Most merges** (last {FLOW_WEEKS} weeks):"):
+        hidden = flow['throughput']['repo_count'] - len(lines)
+        if body.add_items(lines, more=lambda n: f"- *...and {n + hidden} more*") == len(lines) and hidden:
+            body.add(f"- *...and {hidden} more*")
+        body.add("")
+
+def create_pr_appendix(summary: Dict[str, Any]) -> str:
+    """Create the full per-repository detail that the PR body links to."""
+    period = summary.get("period", {})
+    lines = [
+        f"# Weekly Development Summary: Full Details",
+        f"**Period**: {period.get('start', '')} to {period.get('end', '')}",
+        "",
+    ]
+
+    changes_by_repo = key_changes_by_repo(summary)
+    if changes_by_repo:
+        lines.extend(["## Key Changes", ""])
+        for repo_name, changes in changes_by_repo.items():
+            lines.extend(_key_change_block(repo_name, changes))
 
     if summary['repos_with_activity']:
-        message_blocks.append("*Most Active Repos:*")
-        sorted_repos = sorted(summary['repos_with_activity'],
-                              key=lambda x: x.get('commits', 0) + x.get('pulls', 0), reverse=True)
-        for repo in sorted_repos[:5]:
-            message_blocks.append(f"• *{repo['name']}*: {repo.get('commits', 0)} commits, {repo.get('pulls', 0)} PRs")
+        lines.extend(["## Repository Activity Details", ""])
+        for repo in _most_active(summary['repos_with_activity']):
+            lines.extend(_repo_detail_block(repo))
 
-    return '\n'.join(message_blocks)
+    return '\n'.join(lines)
 
-def create_pr_content(summary: Dict[str, Any]) -> tuple:
-    """Create PR title and body content."""
+def create_pr_content(summary: Dict[str, Any], appendix_link: Optional[str] = None) -> tuple:
+    """
+    Create PR title and body content. The body shows the most active repos
+    and always fits in a PR; with `appendix_link`, it links to the file
+    written from `create_pr_appendix` for everything else.
+    """
     period = summary.get("period", {})
     start_date = period.get("start", "")
     end_date = period.get("end", "")
 
     title = f"Weekly Changelog Summary: {start_date} to {end_date}"
 
-    body_sections = [
+    see_appendix = f" in the [full details]({appendix_link})" if appendix_link else ""
+    footer = ["---", f"*Generated automatically on {summary.get('generated_at', 'Unknoen')}*"]
+    if appendix_link:
+        footer = [f"📎 [Full details for every repository]({appendix_link})", ""] + footer
+    body = Budget(PR_BODY_LIMIT, footer=footer)
+    body.add([
         f"# Weekly Development Summary",
         f"**Period**: {start_date} to {end_date}",
         "",
@@ -243,57 +265,31 @@ def create_pr_content(summary: Dict[str, Any]) -> tuple:
         f"- **Issues**: {summary.get('total_issues', 0)}",
         f"- **Changelog Entries**: {summary.get('total_changelog_entries', 0)}",
         ""
-    ]
+    ])
 
-    if summary['key_changes']:
-        body_sections.extend([
-            "## Key Changes",
-            ""
-        ])
+    if summary.get('trends'):
+        _add_trends(body, summary['trends'])
 
-        changes_by_repo = {}
-        for change in summary['key_changes']:
-            repo_name = change.split(':')[0]
-            change_text = ':'.join(change.split(':')[1:]).strip()
-            if repo_name not in changes_by_repo:
-                changes_by_repo[repo_name] = []
-            changes_by_repo[repo_name].append(change_text)
+    if summary.get('flow'):
+        _add_flow(body, summary['flow'])
 
-        for repo_name, changes in changes_by_repo.items():
-            body_sections.append(f"### {repo_name}")
-            for change in changes:
-                body_sections.append(f"- {change}")
-            body_sections.append("")
+    if summary.get('week_delta'):
+        add_delta(body, summary['week_delta'], "## Since Last Week")
 
-    if summary['repos_with_activity']:
-        body_sections.extend([
-            "## Repository Activity Details",
-            ""
-        ])
+    changes_by_repo = key_changes_by_repo(summary)
+    if changes_by_repo and body.add(["## Key Changes", ""]):
+        blocks = [_key_change_block(repo_name, changes) for repo_name, changes in changes_by_repo.items()]
+        if body.add_items(blocks, more=lambda n: f"*...and key changes from {n} more repositories{see_appendix}*",
+                          limit=TOP_REPOS) < len(blocks):
+            body.add("")
 
-        sorted_repos = sorted(summary["repos_with_activity"],
-                              key=lambda x: x.get('commits', 0) + x.get('pulls', 0), reverse=True)
-        
-        for repo in sorted_repos:
-            body_sections.append(f"### [{repo['name']}]({repo.get('url', '')})")
-            body_sections.append(f"- **Commits**: {repo.get('commits', 0)}")
-            body_sections.append(f"- **Pull Request**: {repo.get('pulls', 0)}")
-            body_sections.append(f"- **Issues**: {repo.get('issues', 0)}")
-            body_sections.append(f"- **Changelog Entries**: {repo.get('changelog_entries', 0)}")
-
-            if repo['highlights']:
-                body_sections.append("- **Highlights**:")
-                for highlight in repo['highlights']:
-                    body_sections.append(f" - {highlight}")
-
-            body_sections.append("")
-
-    body_sections.extend([
-        "---",
-        f"*Generated automatically on {summary.get('generated_at', 'Unknoen')}*"
-    ])
+    if summary['repos_with_activity'] and body.add(["## Repository Activity Details", ""]):
+        blocks = [_repo_detail_block(repo) for repo in _most_active(summary["repos_with_activity"])]
+        if body.add_items(blocks, more=lambda n: f"*...and {n} more repositories{see_appendix}*",
+                          limit=TOP_REPOS) < len(blocks):
+            body.add("")
 
-    return title, '\n'.join(body_sections)
+    return title, body.render()
 
 def main():
     """Main function to generate all summary formats."""
@@ -303,24 +299,22 @@ def main():
             print("Data directory not found. Run the weekly changelog generator first.")
             return
         
-        weekly_files = [f for f in os.listdir(data_dir) if f.startswith("weekly_changelog_")]
-        if not weekly_files:
+        data_file = latest_file(data_dir, "weekly_changelog")
+        if not data_file:
             print("No weekly changelog files found.")
             return
-        
-        latest_file = sorted(weekly_files)[-1]
-        data_file = os.path.join(data_dir, latest_file)
 
-        print(f"Generated summary from {latest_file}")
+        print(f"Generated summary from {os.path.basename(data_file)}")
 
-        summary = generate_summary(data_file)
+        summary = add_week_delta(add_trends(generate_summary(data_file)), data_file)
 
         print(f"Summary stats: {summary.get('active_repos', 0)} active repos out of {summary.get('total_repos', 0)} total")
 
         output_dir = "changelog_data/summaries"
         os.makedirs(output_dir, exist_ok=True)
 
-        timestamp = datetime.now(timezone.utc).strftime("%y-%m-%d")
+        now = datetime.now(timezone.utc)
+        timestamp = now.strftime("%y-%m-%d")
         summary_file = os.path.join(output_dir, f"summary_{timestamp}.json")
         with open(summary_file, 'w') as f:
             json.dump(summary, f, indent=2)
@@ -335,7 +329,11 @@ def main():
         with open(slack_file, 'w') as f:
             f.write(slack_message)
 
-        pr_title, pr_body = create_pr_content(summary)
+        pr_appendix_file = os.path.join(output_dir, f"pr_appendix_{timestamp}.md")
+        with open(pr_appendix_file, 'w') as f:
+            f.write(create_pr_appendix(summary))
+
+        pr_title, pr_body = create_pr_content(summary, blob_url(pr_appendix_file, pr_branch(now)))
         pr_title_file = os.path.join(output_dir, f"pr_title_{timestamp}.txt")
         pr_body_file = os.path.join(output_dir, f"pr_body_{timestamp}.md")
 
@@ -345,11 +343,14 @@ def main():
         with open(pr_body_file, 'w') as f:
             f.write(pr_body)
 
+        record_artifacts([summary_file, mailto_file, slack_file, pr_appendix_file, pr_title_file, pr_body_file],
+                         summary["period"], summary["generated_at"], summary_headline(summary))
+
         print(f"Summary generated successfully!")
         print(f"Files saved to {output_dir}/")
         print(f"Mailto link: {mailto_file}")
         print(f"Slack message: {slack_file}")
-        print(f"PR content: {pr_title_file}, {pr_body_file}")
+        print(f"PR content: {pr_title_file}, {pr_body_file}, {pr_appendix_file}")
 
         return summary_file
     
@@ -1,310 +1,151 @@
 import json
 import os
-import re
 from datetime import datetime, timezone
-from typing import Dict, List, Any
-
-
-EMOJI_MAP = {
-    'added': {
-        'emoji': '✅',
-        'patterns': [r'[Aa]dd(?:ed|s|ing)?', r'[Nn]ew'],
-        'keywords': ['add', 'added', 'adds', 'adding', 'new']
-    },
-    'fixed': {
-        'emoji': '🪲',
-        'patterns': [r'[Ff]ix(?:ed|es|ing)?', r'[Bb]ug'],
-        'keywords': ['fix', 'fixed', 'fixes', 'fixing', 'bug', 'bugfix']
-    },
-    'changed': {
-        'emoji': '🔧',
-        'patterns': [
-            r'[Cc]hang(?:ed|e|es|ing)?', 
-            r'[Mm]odif(?:y|ied|ies|ying)?', 
-            r'[Uu]pdat(?:ed|e|es|ing)?',
-            r'[Ii]prov(?:ed|e|es|ing|evement)?'
-        ],
-        'keywords': [
-            'change',
-            'changed',
-            'changes',
-            'changing',
-            'modify',
-            'modified',
-            'modifies',
-            'modifying',
-            'update',
-            'updated',
-            'updates',
-            'updating',
-            'improve',
-            'improved',
-            'improvement'
-        ]
-    },
-    'deprecated': {
-        'emoji': '⚠️',
-        'patterns': [r'[Dd]eprecat(?:ed|e|es|ing)?'],
-        'keywords': ['deprecate', 'deprecated', 'deprecates', 'deprecating']
-    },
-    'removed': {
-        'emoji': '🗑️',
-        'patterns': [r'[Rr]emov(?:ed|e|es|ing)?', r'[Dd]elet(?:ed|e|es|ing)?'],
-        'keywords': ['remove', 'removed', 'removes', 'removing', 'delete', 'deleted', 'deletes', 'deleting']
-    },
-    'security': {
-        'emoji': '🔒',
-        'patterns': [r'[Ss]ecur(?:ity|ed|e|ing)?',],
-        'keywords': ['security', 'secure', 'secured', 'securing']
-    },
-    'performance': {
-        'emoji': '⚡️',
-        'patterns': [r'[Pp]erforman(?:ce|t)?', r'[Oo]ptimi(?:ze|zed|zes|zing|zation)?'],
-        'keywords': ['performance', 'performant', 'optimize', 'optimized', 'optimizes', 'optimizing', 'optimization']
-    },
-    'documentation': {
-        'emoji': '📚',
-        'patterns': [r'[Dd]ocument(?:ation)?', r'[Dd]ocs?'],
-        'keywords': ['documentation', 'document', 'docs', 'doc']
-    },
-}
-
-
-def normalize_data(data: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Normalize changelog data into a single top-level structure with a flat
-    `repos` list, regardless of whether the source file is single-org
-    (legacy: {"repos": [...]}) or multi-org ({"DSACMS": {"repos": [...]}, ...}).
+from typing import Dict, List, Any, Optional
+
+try:
+    from classify import categorize_repo, empty_categories
+    from artifact_index import latest_file, record_artifacts, summary_headline
+    from delta import add_delta
+    from render import PR_BODY_LIMIT, Budget, blob_url
+    from summary_engine import add_week_delta, pr_branch, summarize_file
+except ImportError:
+    from scripts.classify import categorize_repo, empty_categories
+    from scripts.artifact_index import latest_file, record_artifacts, summary_headline
+    from scripts.delta import add_delta
+    from scripts.render import PR_BODY_LIMIT, Budget, blob_url
+    from scripts.summary_engine import add_week_delta, pr_branch, summarize_file
 
-    Each repo in the returned `repos` list is tagged with its `org`.
-    """
-    if "repos" in data:
-        for repo in data["repos"]:
-            repo.setdefault("org", data.get("org_name", "unknown"))
-        return data
-
-    merged = {
-        "repos": [],
-        "period": {},
-        "generated_at": None,
-        "total_repo_count": 0,
-    }
-
-    for org_name, org_data in data.items():
-        if not isinstance(org_data, dict) or "repos" not in org_data:
-            continue
 
-        if not merged["period"] and org_data.get("period"):
-            merged["period"] = org_data["period"]
-        if merged["generated_at"] is None and org_data.get("generated_at"):
-            merged["generated_at"] = org_data["generated_at"]
+def categorize_changes(data: Dict[str, Any]) -> Dict[str, List[Dict]]:
+    """Categorize all of the changes in the data."""
+    categorized = empty_categories()
 
-        merged["total_repo_count"] += org_data.get(
-            "total_repo_count", len(org_data["repos"])
-        )
+    for repo_data in data.get("repos", []):
+        categorize_repo(repo_data, categorized)
 
-        for repo in org_data["repos"]:
-            repo["org"] = org_name
-            merged["repos"].append(repo)
+    return categorized
 
-    if not merged["repos"]:
-        raise ValueError("Invalid data structure: no repos found in any org")
 
-    return merged
+def generate_condensed_summary(data_file: str) -> Dict[str, Any]:
+    """Generate a styled, condensed summary."""
+    return summarize_file(data_file, full=False).condensed_summary()
 
 
-def get_emoji_for_category(category: str) -> tuple:
-    """Gets the emoji for category"""
-    category_lower = category.lower()
+CATEGORY_ORDER = [
+    ('added', '✅ Added', 'New features and additions'),
+    ('fixed','🪲 Fixed', 'Bug fixes and corrections'),
+    ('changed', '🔧 Changed', 'Updates and modifications'),
+    ('deprecated', '⚠️ Deprecated', 'Deprecation notices'),
+    ('removed', '🗑️ Removed', 'Deprecations and removals'),
+    ('security', '🔒 Security', 'Security improvements'),
+    ('performance', '⚡️ Performance', 'Performance optimizations'),
+    ('documentation', '📚 Documentation', 'Documentation updates'),
+]
 
-    for category_key, config in EMOJI_MAP.items():
-        for pattern in config['patterns']:
-            if re.search(pattern, category, re.IGNORECASE):
-                return (config['emoji'], category_key)
-            
-        for keyword in config['keywords']:
-            if keyword in category_lower:
-                return (config['emoji'], category_key)
-            
-    return ('❓', 'other')
+# Repos shown per category in the PR body; the appendix has all of them
+TOP_REPOS_PER_CATEGORY = 10
 
 
-def categorize_changes(data: Dict[str, Any]) -> Dict[str, List[Dict]]:
-    """Categorize all of the changes in the data."""
-    categorized = {
-        'added': [],
-        'fixed': [],
-        'changed': [],
-        'deprecated': [],
-        'removed': [],
-        'security': [],
-        'performance': [],
-        'documentation': [],
-        'other': []
-    }
+def _is_shared(change: Dict[str, Any]) -> bool:
+    """Whether a change was collapsed from several repos (see `dedup.collapse_duplicates`)."""
+    return len(change.get('repos') or ()) > 1
 
-    for repo_data in data.get("repos", []):
-        repo_name = repo_data.get("name", "Unknown")
-
-        for entry in repo_data.get("changelog_entries", []):
-            for change in entry.get("changes", []):
-                category = change.get("category", "")
-                items = change.get("items", [])
-
-                emoji, bucket = get_emoji_for_category(category)
-
-                for item in items:
-                    categorized[bucket].append({
-                        'repo': repo_name,
-                        'text': item,
-                        'category': category,
-                        'emoji': emoji
-                    })
-
-        merged_prs = [pr for pr in repo_data.get("pulls", []) if pr.get("merged")]
-        if merged_prs:
-            for pr in merged_prs[:3]:
-                title = pr.get("title", "")
-                emoji, bucket = get_emoji_for_category(title)
-
-                categorized[bucket].append({
-                    'repo': repo_name,
-                    'text': title,
-                    'url': pr.get("url", ""),
-                    'type': 'pr',
-                    'emoji': emoji
-                })
-
-    print(categorized)
-    return categorized
-    
 
-def generate_condensed_summary(data_file: str) -> Dict[str, Any]:
-    """Generate a styled, condensed summary."""
-    try:
-        with open(data_file, 'r') as f:
-            data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print(f"Error reading data file {data_file}: {e}")
-        raise
-    
-    # if "repos" not in data:
-    #     raise ValueError("Invalid data structure: missing 'repos' key")
+def _changes_by_repo(changes: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    changes_by_repo = {}
+    for change in changes:
+        if not _is_shared(change):
+            changes_by_repo.setdefault(change['repo'], []).append(change)
+    return changes_by_repo
 
-    data = normalize_data(data)
-    
-    summary = {
-        "period": data.get("period", {}),
-        "generated_at": data.get("generated_at"),
-        "total_repos": data.get("total_repo_count", len(data["repos"])),
-        "active_repos": sum(1 for r in data["repos"] if
-                            r.get("issues") or r.get("pulls") or
-                            r.get("commits") or r.get("changelog_entries")),
-        "total_commits": sum(len(r.get("commits", [])) for r in data["repos"]),
-        "total_pulls": sum(len(r.get("pulls", [])) for r in data["repos"]),
-        "total_issues": sum(len(r.get("issues", [])) for r in data["repos"]),
-        "total_changelog_entries": sum(len(r.get("changelog_entries", [])) for r in data["repos"]),
-    }
-
-    summary["categorized_changes"] = categorize_changes(data)
-
-    summary["change_counts"] = {
-        category: len(changes)
-        for category, changes in summary["categorized_changes"].items()
-        if changes
-    }
-
-    summary["active_repos_list"] = [
-        {
-            "name": r.get("name"),
-            "url": r.get("url"),
-            "org": r.get("org", "unknown"),
-            "commits": len(r.get("commits", [])),
-            "pulls": len(r.get("pulls", [])),
-            "issues": len(r.get("issues", []))
-        }
-        for r in data["repos"]
-        if r.get("issues") or r.get("pulls") or r.get("commits") or r.get("changelog_entries")
-    ]
 
-    return summary
+def _change_line(change: Dict[str, Any]) -> str:
+    if change.get('type') == 'pr' and change.get('url'):
+        return f"- [{change['text']}]({change['url']})"
+    return f"- {change['text']}"
 
 
-def create_condensed_pr_content(summary: Dict[str, Any]) -> tuple:
-    """Create condensed PR title and body with emojis."""
-    period = summary.get("period", {})
-    start_date = period.get("start", "")
-    end_date = period.get("end", "")
+def _shared_line(change: Dict[str, Any], list_repos: bool = False) -> str:
+    # Without one repo's version numbers or PR link, since the line stands for all of them
+    repos = change['repos']
+    text = change.get('shared_text') or change['text']
+    if list_repos:
+        return f"- {text} ({', '.join(repos)})"
+    return f"- {text} (*{len(repos)} repositories*)"
 
-    title = f"📋 Changelog Summary: {start_date} to {end_date}"
 
-    body_sections = [
-        f"# 📋 Weekly Changelog",
-        f"**Period**: {start_date} to {end_date}",
+def create_condensed_appendix(summary: Dict[str, Any]) -> str:
+    """Create the full per-repository change list that the condensed PR body links to."""
+    period = summary.get("period", {})
+    lines = [
+        f"# 📋 Weekly Changelog: Full Details",
+        f"**Period**: {period.get('start', '')} to {period.get('end', '')}",
         "",
-        "## 📊 Quick Stats",
-        f"- **Active Repositories**: {summary.get('active_repos', 0)}/{summary.get('total_repos', 0)}",
-        f"- 📦 **Commits**: {summary.get('total_commits', 0)} | 🔀 **Pull Requests**: {summary.get('total_pulls', 0)} | ❗️ **Issues**: {summary.get('total_issues', 0)}",
-        ""
     ]
 
     categorized = summary.get("categorized_changes", {})
-    change_counts = summary.get("change_counts", {})
-
-    category_order = [
-        ('added', '✅ Added', 'New features and additions'),
-        ('fixed','🪲 Fixed', 'Bug fixes and corrections'),
-        ('changed', '🔧 Changed', 'Updates and modifications'),  
-        ('deprecated', '⚠️ Deprecated', 'Deprecation notices'),
-        ('removed', '🗑️ Removed', 'Deprecations and removals'),
-        ('security', '🔒 Security', 'Security improvements'),
-        ('performance', '⚡️ Performance', 'Performance optimizations'),
-        ('documentation', '📚 Documentation', 'Documentation updates'),
-    ]
-
-    has_changes = False
-    for category_key, category_title, category_desc in category_order:
+    for category_key, category_title, category_desc in CATEGORY_ORDER:
         changes = categorized.get(category_key, [])
         if not changes:
             continue
 
-        has_changes = True
-        body_sections.extend([
-            f"## {category_title}",
-            f"*{category_desc}*",
-            ""
-        ])
-
-        changes_by_repo = {}
-        for change in changes:
-            repo = change['repo']
-            if repo not in changes_by_repo:
-                changes_by_repo[repo] = []
-            changes_by_repo[repo].append(change)
+        lines.extend([f"## {category_title}", f"*{category_desc}*", ""])
+        shared = [change for change in changes if _is_shared(change)]
+        if shared:
+            lines.append("### Across repositories")
+            lines.extend(_shared_line(change, list_repos=True) for change in shared)
+            lines.append("")
 
+        changes_by_repo = _changes_by_repo(changes)
         for repo_name in sorted(changes_by_repo.keys()):
-            repo_changes = changes_by_repo[repo_name]
-            body_sections.append(f"### {repo_name}")
+            lines.append(f"### {repo_name}")
+            lines.extend(_change_line(change) for change in changes_by_repo[repo_name])
+            lines.append("")
 
-            for change in repo_changes[:5]:
-                if change.get('type') == 'pr' and change.get('url'):
-                    body_sections.append(f"- [{change['text']}]({change['url']})")
-                else:
-                    body_sections.append(f"- {change['text']}")
+    return '\n'.join(lines)
 
-            if len(repo_changes) > 5:
-                body_sections.append(f"- *...and {len(repo_changes) - 5} more*")
 
-            body_sections.append("")
+def create_condensed_pr_content(summary: Dict[str, Any], appendix_link: Optional[str] = None) -> tuple:
+    """
+    Create condensed PR title and body with emojis. The body always fits in
+    a PR; with `appendix_link`, it links to the file written from
+    `create_condensed_appendix` for the changes it leaves out.
+    """
+    period = summary.get("period", {})
+    start_date = period.get("start", "")
+    end_date = period.get("end", "")
 
-    if not has_changes:
-        body_sections.extend([
-            "## 📝 Changes",
-            "*No categorized changes found in changelogs this week*",
+    title = f"📋 Changelog Summary: {start_date} to {end_date}"
+
+    categorized = summary.get("categorized_changes", {})
+    change_counts = summary.get("change_counts", {})
+
+    # The activity and repository sections are bounded, so they are reserved
+    # up front and the per-category changes get whatever room is left
+    tail_sections = []
+
+    activity_types = summary.get("activity_types", {})
+    if activity_types.get("classified"):
+        activity_counts = activity_types.get("counts", {})
+        top_items = activity_types.get("top_items", {})
+        tail_sections.extend([
+            "## 🏷️ All Activity by Type",
+            f"*{activity_types['classified']} PR titles and commit subjects*",
             ""
         ])
 
-    body_sections.extend([
+        for category_key, category_title, _ in CATEGORY_ORDER + [('other', '❓ Other', '')]:
+            if activity_counts.get(category_key):
+                tail_sections.append(f"- {category_title}: {activity_counts[category_key]}")
+
+        tail_sections.extend(["", "<details><summary>Top items</summary>", ""])
+        for category_key, category_title, _ in CATEGORY_ORDER:
+            for item in top_items.get(category_key, []):
+                tail_sections.append(f"- {item['emoji']} [{item['text']}]({item['url']}) ({item['repo']})")
+        tail_sections.extend(["", "</details>", ""])
+
+    tail_sections.extend([
         "## 🚀 Active Repositories",
         ""
     ])
@@ -313,8 +154,10 @@ def create_condensed_pr_content(summary: Dict[str, Any]) -> tuple:
     sorted_repos = sorted(active_repos,
                           key=lambda x: x['commits'] + x['pulls'],
                           reverse=True)
-    
-    for repo in sorted_repos[:10]:
+
+    repo_lines = Budget(PR_BODY_LIMIT // 4)
+    repo_entries = []
+    for repo in sorted_repos:
         activity_parts =[]
         if repo['commits']:
             activity_parts.append(f"{repo['commits']} commits")
@@ -324,19 +167,79 @@ def create_condensed_pr_content(summary: Dict[str, Any]) -> tuple:
             activity_parts.append(f"{repo['issues']} issues")
 
         activity_str = ", ".join(activity_parts)
-        body_sections.append(f"- **[{repo['name']}]({repo['url']})**: {activity_str}")
+        repo_entries.append(f"- **[{repo['name']}]({repo['url']})**: {activity_str}")
 
-    if len(sorted_repos) > 10:
-        body_sections.append(f"- *...and {len(sorted_repos) - 10} more repositories*")
+    repo_lines.add_items(repo_entries, more=lambda n: f"- *...and {n} more repositories*", limit=10)
+    tail_sections.extend(repo_lines.lines)
 
-    body_sections.extend([
+    see_appendix = f" in the [full details]({appendix_link})" if appendix_link else ""
+    if appendix_link:
+        tail_sections.extend(["", f"📎 [Every change, for every repository]({appendix_link})"])
+
+    body = Budget(PR_BODY_LIMIT, footer=tail_sections + [
         "",
         "---",
         f"*🤖 Generated automatically on {summary.get('generated_at', 'Unknown')}*"
     ])
+    body.add([
+        f"# 📋 Weekly Changelog",
+        f"**Period**: {start_date} to {end_date}",
+        "",
+        "## 📊 Quick Stats",
+        f"- **Active Repositories**: {summary.get('active_repos', 0)}/{summary.get('total_repos', 0)}",
+        f"- 📦 **Commits**: {summary.get('total_commits', 0)} | 🔀 **Pull Requests**: {summary.get('total_pulls', 0)} | ❗️ **Issues**: {summary.get('total_issues', 0)}",
+        ""
+    ])
 
-    return title, '\n'.join(body_sections)
+    if summary.get('week_delta'):
+        add_delta(body, summary['week_delta'], "## 🔄 Since Last Week")
 
+    has_changes = False
+    for category_key, category_title, category_desc in CATEGORY_ORDER:
+        changes = categorized.get(category_key, [])
+        if not changes:
+            continue
+
+        has_changes = True
+        if not body.add([f"## {category_title}", f"*{category_desc}*", ""]):
+            break
+
+        changes_by_repo = _changes_by_repo(changes)
+
+        blocks = []
+        shared = [change for change in changes if _is_shared(change)]
+        if shared:
+            block = ["### Across repositories"]
+            block.extend(_shared_line(change) for change in shared[:5])
+            if len(shared) > 5:
+                block.append(f"- *...and {len(shared) - 5} more*")
+            block.append("")
+            blocks.append(block)
+
+        for repo_name in sorted(changes_by_repo.keys()):
+            repo_changes = changes_by_repo[repo_name]
+            block = [f"### {repo_name}"]
+
+            block.extend(_change_line(change) for change in repo_changes[:5])
+
+            if len(repo_changes) > 5:
+                block.append(f"- *...and {len(repo_changes) - 5} more*")
+
+            block.append("")
+            blocks.append(block)
+
+        if body.add_items(blocks, more=lambda n: f"*...and changes in {n} more repositories{see_appendix}*",
+                          limit=TOP_REPOS_PER_CATEGORY) < len(blocks):
+            body.add("")
+
+    if not has_changes:
+        body.add([
+            "## 📝 Changes",
+            "*No categorized changes found in changelogs this week*",
+            ""
+        ])
+
+    return title, body.render()
 
 def main():
     """Main function."""
@@ -346,17 +249,14 @@ def main():
             print("Data directory not found. Run the weekly changelog generator first.")
             return
         
-        weekly_files = [f for f in os.listdir(data_dir) if f.startswith("weekly_changelog_")]
-        if not weekly_files:
+        data_file = latest_file(data_dir, "weekly_changelog")
+        if not data_file:
             print("No weekly changelog files found.")
             return
-        
-        latest_file = sorted(weekly_files)[-1]
-        data_file = os.path.join(data_dir, latest_file)
 
-        print(f"Generating condensed summary from {latest_file}")
+        print(f"Generating condensed summary from {os.path.basename(data_file)}")
 
-        summary = generate_condensed_summary(data_file)
+        summary = add_week_delta(generate_condensed_summary(data_file), data_file)
 
         print(f"Summary stats: {summary.get('active_repos', 0)} active repos")
         print(f"Change counts: {summary.get('change_counts', {})}")
@@ -364,13 +264,19 @@ def main():
         output_dir = "changelog_data/summaries"
         os.makedirs(output_dir, exist_ok=True)
 
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        now = datetime.now(timezone.utc)
+        timestamp = now.strftime("%Y-%m-%d")
 
         summary_file = os.path.join(output_dir, f"summary_condensed_{timestamp}.json")
         with open(summary_file, 'w') as f:
             json.dump(summary, f, indent=2)
 
-        pr_title, pr_body = create_condensed_pr_content(summary)
+        pr_appendix_file = os.path.join(output_dir, f"pr_appendix_condensed_{timestamp}.md")
+        with open(pr_appendix_file, 'w') as f:
+            f.write(create_condensed_appendix(summary))
+
+        pr_title, pr_body = create_condensed_pr_content(
+            summary, blob_url(pr_appendix_file, pr_branch(now, condensed=True)))
         pr_title_file = os.path.join(output_dir, f"pr_title_condensed_{timestamp}.txt")
         pr_body_file = os.path.join(output_dir, f"pr_body_condensed_{timestamp}.md")
 
@@ -380,9 +286,12 @@ def main():
         with open(pr_body_file, 'w') as f:
             f.write(pr_body)
 
+        record_artifacts([summary_file, pr_appendix_file, pr_title_file, pr_body_file],
+                         summary["period"], summary["generated_at"], summary_headline(summary))
+
         print(f"Condensed summary generated successfully!")
         print(f"Files saved to {output_dir}/")
-        print(f"PR content: {pr_title_file}, {pr_body_file}")
+        print(f"PR content: {pr_title_file}, {pr_body_file}, {pr_appendix_file}")
 
         return summary_file
     
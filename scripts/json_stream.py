@@ -0,0 +1,202 @@
+"""
+Streaming reader for changelog data files.
+
+`JsonStream` is a small incremental JSON parser: it walks objects and arrays
+key by key and element by element, decoding each value with the standard
+library decoder from a bounded text buffer. `ChangelogStream` uses it to
+yield one repo at a time from a single- or multi-org data file, expanding
+slim-profile tables and resolving catalog references per repo, so peak
+memory is set by the largest repo rather than the whole file.
+"""
+
+import json
+import os
+from collections import deque
+from typing import IO, Any, Dict, Iterator, Optional, Tuple
+
+try:
+    from catalog import RepoCatalog
+    from data_io import open_text
+    from profiles import expand_repo, is_interned
+except ImportError:
+    from scripts.catalog import RepoCatalog
+    from scripts.data_io import open_text
+    from scripts.profiles import expand_repo, is_interned
+
+
+CHUNK_SIZE = 1 << 16
+
+# Top-level keys that are never org names, even when their value is an object
+METADATA_KEYS = {"period", "tables"}
+
+WHITESPACE = " \t\n\r"
+
+
+class JsonStream:
+    """Incremental JSON parser over a text stream."""
+
+    def __init__(self, fp: IO[str], chunk_size: int = CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fp.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop what has been consumed so the buffer only holds unread text
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            expected = " or ".join(repr(c) for c in chars)
+            raise json.JSONDecodeError(f"Expecting {expected}", self.buffer, self.pos)
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number that ends exactly at the buffer edge may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Grow geometrically so a large value is re-decoded only a few times
+            self._fill(max(self.chunk_size, len(self.buffer) - self.pos))
+
+    def keys(self) -> Iterator[str]:
+        """Iterate an object's keys; the caller must consume each value before the next key."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+    def items(self) -> Iterator[None]:
+        """Iterate an array; the caller must consume each element before the next."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield None
+            if self.expect(",]") == "]":
+                return
+
+
+class ChangelogStream:
+    """
+    Iterate (org, repo) pairs from a data file one repo at a time, in the
+    same order and with the same content as `iter_org_repos(load_data(path))`.
+
+    After iteration, `skeleton` holds the file's structure with each repo
+    list replaced by placeholders, which is enough for `data_metadata`.
+    Repos are normally complete as read; a repo that needs tables or a
+    catalog reference that appears later in its org object is held until
+    that metadata has been read.
+    """
+
+    def __init__(self, path: str, chunk_size: int = CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.skeleton: Dict[str, Any] = {}
+        self.catalogs: Dict[str, Any] = {}
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        with open_text(self.path) as fp:
+            stream = JsonStream(fp, self.chunk_size)
+            top: Dict[str, Any] = {}
+            for key in stream.keys():
+                if key == "repos" and stream.peek() == "[":
+                    yield from self._org_repos(stream, top, None)
+                elif key not in METADATA_KEYS and stream.peek() == "{":
+                    yield from self._org_object(stream, top, key)
+                else:
+                    top[key] = stream.value()
+                    yield from self._release(top, None)
+            # Legacy single-org files may list their metadata after the repos
+            yield from self._release(top, None, final=True)
+            self.skeleton = top
+
+    def _org_object(self, stream: JsonStream, top: Dict[str, Any], org: str):
+        context: Dict[str, Any] = {}
+        for key in stream.keys():
+            if key == "repos" and stream.peek() == "[":
+                yield from self._org_repos(stream, context, org)
+            else:
+                context[key] = stream.value()
+                yield from self._release(context, org)
+        yield from self._release(context, org, final=True)
+        top[org] = context
+
+    def _org_repos(self, stream: JsonStream, context: Dict[str, Any], org: Optional[str]):
+        context.setdefault("repos", [])
+        context.setdefault("_pending", deque())
+        for _ in stream.items():
+            context["repos"].append(None)
+            context["_pending"].append(stream.value())
+            yield from self._release(context, org)
+
+    def _ready(self, context: Dict[str, Any], repo: Dict[str, Any]) -> bool:
+        if "tables" not in context and is_interned(repo):
+            return False
+        if "repo_id" in repo and ("repo_catalog" not in context or "period" not in context):
+            return False
+        return True
+
+    def _release(self, context: Dict[str, Any], org: Optional[str], final: bool = False):
+        pending = context.get("_pending")
+        while pending and (final or self._ready(context, pending[0])):
+            yield self._resolve(context, org, pending.popleft())
+        if final:
+            context.pop("_pending", None)
+
+    def _resolve(self, context: Dict[str, Any], org: Optional[str], repo: Dict[str, Any]):
+        if "tables" in context:
+            expand_repo(repo, context["tables"] or {})
+
+        if "repo_id" in repo and context.get("repo_catalog"):
+            catalog_path = os.path.join(os.path.dirname(self.path), context["repo_catalog"])
+            if catalog_path not in self.catalogs:
+                self.catalogs[catalog_path] = RepoCatalog(catalog_path)
+            as_of = (context.get("period") or {}).get("end")
+            repo = self.catalogs[catalog_path].hydrate_repos([repo], as_of)[0]
+
+        if org is None:
+            org = repo.get("org", context.get("org_name", "unknown"))
+        return org, repo
+
+
+def iter_repos(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Shorthand for iterating a `ChangelogStream`."""
+    return iter(ChangelogStream(path))
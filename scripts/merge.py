@@ -0,0 +1,179 @@
+"""
+Overlap-aware merge of changelog data files.
+
+Weekly windows overlap (for example `2025-08-14_to_2025-08-21` and
+`2025-08-15_to_2025-08-22`), so counting across files double-counts every
+item seen twice. `ActivitySet` merges any number of data files into one set
+of repos and items keyed the same way as the SQLite activity store (by URL,
+see `store.item_key`). Each item is a single dictionary lookup, so merging is
+linear in the number of items. Any date range can then be materialized
+in the shape `ChangelogGenerator.get_data` returns, without the network.
+
+    python scripts/merge.py 2025-08-01 2025-08-31 [output_file]
+"""
+
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from data_io import file_date, list_files, load_data
+    from profiles import write_profile
+    from store import ITEM_KINDS, item_key, item_span
+except ImportError:
+    from scripts.data_io import file_date, list_files, load_data
+    from scripts.profiles import write_profile
+    from scripts.store import ITEM_KINDS, item_key, item_span
+
+
+DATA_DIR = "changelog_data/data"
+DATA_PREFIX = "weekly_changelog_"
+
+
+def org_sections(data: Dict[str, Any]) -> Iterable[Tuple[Optional[str], Dict[str, Any]]]:
+    """Yield (org, section) for single- or multi-org data; legacy files have no org name."""
+    if "repos" in data:
+        yield data.get("org_name"), data
+        return
+    for org, org_data in data.items():
+        if isinstance(org_data, dict) and "repos" in org_data:
+            yield org, org_data
+
+
+class ActivitySet:
+    """
+    Repos and items from many data files, deduplicated by key. When the same
+    item is seen again, its active span is widened and the later copy is kept,
+    matching `ActivityStore.upsert_repo`.
+    """
+
+    def __init__(self):
+        # repo URL -> (org, repo metadata)
+        self.repos: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        # item key -> [repo URL, kind, start_day, end_day, item]
+        self.items: Dict[str, List[Any]] = {}
+        self.repo_counts: Dict[str, int] = {}
+        self.files: List[str] = []
+        self.seen = 0
+
+    def add_repo(self, org: str, repo_data: Dict[str, Any], observed_start: Optional[str] = None):
+        repo_url = repo_data["url"]
+        metadata = {
+            "name": repo_data.get("name"),
+            "url": repo_url,
+            "description": repo_data.get("description"),
+            "archived": bool(repo_data.get("archived")),
+        }
+        previous = self.repos.get(repo_url)
+        topics = repo_data.get("topics")
+        if topics is None and previous and "topics" in previous[1]:
+            topics = previous[1]["topics"]
+        if topics is not None:
+            metadata["topics"] = topics
+        self.repos[repo_url] = (org, metadata)
+
+        for kind in ITEM_KINDS:
+            for item in repo_data.get(kind) or []:
+                self.seen += 1
+                key = item_key(repo_url, kind, item)
+                start_day, end_day = item_span(kind, item, observed_start)
+                existing = self.items.get(key)
+                if existing is None:
+                    self.items[key] = [repo_url, kind, start_day, end_day, item]
+                else:
+                    existing[2] = min(existing[2], start_day)
+                    existing[3] = max(existing[3], end_day)
+                    existing[4] = item
+
+    def add_data(self, data: Dict[str, Any], source: Optional[str] = None):
+        for org, section in org_sections(data):
+            observed_start = (section.get("period") or {}).get("start")
+            for repo_data in section["repos"]:
+                repo_org = repo_data.get("org", org or "unknown")
+                self.add_repo(repo_org, repo_data, observed_start)
+            if org and section.get("total_repo_count") is not None:
+                self.repo_counts[org] = max(self.repo_counts.get(org, 0), section["total_repo_count"])
+        if source:
+            self.files.append(source)
+
+    def add_file(self, path: str):
+        self.add_data(load_data(path), os.path.basename(path))
+
+    def orgs(self) -> List[str]:
+        return sorted({org for org, _ in self.repos.values()})
+
+    def window(self, org: str, start: str, end: str, include_inactive: bool = False) -> Dict[str, Any]:
+        """
+        Materialize one org's activity between `start` and `end` (inclusive
+        days), in the same shape and order as `ActivityStore.export_window`.
+        """
+        repos = {}
+        for repo_url, (repo_org, metadata) in sorted(self.repos.items(), key=lambda r: r[1][1]["name"] or ""):
+            if repo_org != org:
+                continue
+            repo_data = dict(metadata)
+            for kind in ITEM_KINDS:
+                repo_data[kind] = []
+            repos[repo_url] = repo_data
+
+        matches = [
+            (key, entry) for key, entry in self.items.items()
+            if entry[0] in repos and entry[3] >= start and entry[2] <= end
+        ]
+        # Newest first, then by key, like the store's ORDER BY start_day DESC, key
+        matches.sort(key=lambda match: match[0])
+        matches.sort(key=lambda match: match[1][2], reverse=True)
+        for _, (repo_url, kind, _, _, item) in matches:
+            repos[repo_url][kind].append(item)
+
+        return {
+            "repos": [
+                r for r in repos.values()
+                if include_inactive or r["archived"] or any(r[kind] for kind in ITEM_KINDS)
+            ],
+            "period": {"start": start, "end": end},
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "total_repo_count": max(len(repos), self.repo_counts.get(org, 0)),
+        }
+
+    def materialize(self, start: str, end: str) -> Dict[str, Any]:
+        """Every org's activity between `start` and `end`, as multi-org data."""
+        return {org: self.window(org, start, end) for org in self.orgs()}
+
+
+def merge_files(paths: Iterable[str]) -> ActivitySet:
+    """
+    Merge data files oldest first (by the end date in their names), so the
+    newest copy of an item is the one kept.
+    """
+    merged = ActivitySet()
+    for path in sorted(paths, key=lambda p: (file_date(os.path.basename(p)) or datetime.min.date(), p)):
+        merged.add_file(path)
+    return merged
+
+
+def main():
+    """Merge every weekly data file and write the requested window."""
+    if len(sys.argv) < 3:
+        print("Usage: python scripts/merge.py <start_date> <end_date> [output_file]")
+        sys.exit(1)
+
+    start_date, end_date = sys.argv[1:3]
+    output_file = sys.argv[3] if len(sys.argv) > 3 else os.path.join(
+        DATA_DIR, f"merged_changelog_{start_date}_to_{end_date}.json"
+    )
+
+    merged = merge_files(os.path.join(DATA_DIR, name) for name in list_files(DATA_DIR, DATA_PREFIX))
+    combined_data = merged.materialize(start_date, end_date)
+
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    write_profile(combined_data, output_file, os.getenv("OUTPUT_PROFILE", "full"))
+
+    print(f"Merged {len(merged.files)} files: {merged.seen} items seen, {len(merged.items)} unique")
+    print(f"Wrote {start_date} to {end_date} for {len(combined_data)} org(s) to {output_file}")
+    return output_file
+
+
+if __name__ == "__main__":
+    main()
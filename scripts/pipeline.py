@@ -0,0 +1,327 @@
+"""
+Pipeline runner for the weekly workflow.
+
+Stages form a small dependency graph. With `isolate=True`, stages whose
+dependencies have finished run concurrently. A stage is skipped when its
+code, parameters and input file contents hash to the same fingerprint
+recorded for it in the build manifest and its recorded outputs still exist. Re-running after a late
+failure therefore only repeats the stages that did not finish.
+
+Stages run in the current interpreter by default and share a context dict,
+so a later stage can use what an earlier one produced (the weekly data, for
+example) without reading it back from disk. In-process stages run one at a
+time, since they print straight to stdout and share `sys.argv`. With
+`isolate=True` every stage runs its script in a separate interpreter
+instead, with each line of its output prefixed by the stage name. Output is
+streamed as it is produced and each stage is timed.
+"""
+
+import copy
+import hashlib
+import importlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_FILE = "changelog_data/build_manifest.json"
+
+_output_lock = threading.Lock()
+
+
+def say(message: str = ""):
+    """Print a whole line at once so concurrent stages don't interleave mid-line."""
+    with _output_lock:
+        sys.stdout.write(f"{message}\n")
+        sys.stdout.flush()
+
+
+class Stage:
+    """
+    One pipeline step. `script` is run as a subprocess when isolated; in
+    process, `run(context)` is called if given, otherwise the script's
+    module `main()`.
+
+    `deps` names the stages that must finish first. A stage's input files
+    are its dependencies' outputs plus whatever `inputs(context)` returns;
+    `outputs(context)` lists the files it produces. `code` lists extra source
+    files (besides `script`) whose contents make up the stage's code version,
+    and `params` holds any other values that should force a rerun on change.
+    """
+
+    def __init__(self, script: str, description: str,
+                 run: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                 name: Optional[str] = None,
+                 deps: Optional[List[str]] = None,
+                 inputs: Optional[Callable[[Dict[str, Any]], List[str]]] = None,
+                 outputs: Optional[Callable[[Dict[str, Any]], List[str]]] = None,
+                 code: Optional[List[str]] = None,
+                 params: Optional[Dict[str, Any]] = None):
+        self.script = script
+        self.description = description
+        self.run = run
+        self.name = name or self.module_name
+        self.deps = deps or []
+        self.inputs = inputs
+        self.outputs = outputs
+        self.code = code or []
+        self.params = params or {}
+
+    @property
+    def module_name(self) -> str:
+        return os.path.splitext(os.path.basename(self.script))[0]
+
+
+class StageResult:
+    def __init__(self, stage: Stage, success: bool, seconds: float, error: Optional[str] = None,
+                 up_to_date: bool = False):
+        self.stage = stage
+        self.success = success
+        self.seconds = seconds
+        self.error = error
+        self.up_to_date = up_to_date
+
+
+def file_hash(path: str) -> Optional[str]:
+    """Return the sha256 of a file's contents, or None if it does not exist."""
+    if not os.path.isfile(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """Fingerprint and outputs of the last successful run of each stage."""
+
+    def __init__(self, path: str = MANIFEST_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                self.stages: Dict[str, Dict[str, Any]] = json.load(f).get("stages", {})
+        else:
+            self.stages = {}
+
+    def is_up_to_date(self, name: str, fingerprint: str) -> bool:
+        entry = self.stages.get(name)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return False
+        return all(os.path.exists(path) for path in entry.get("outputs", []))
+
+    def outputs(self, name: str) -> List[str]:
+        return list(self.stages.get(name, {}).get("outputs", []))
+
+    def record(self, name: str, fingerprint: str, outputs: List[str], seconds: float):
+        with self.lock:
+            self.stages[name] = {
+                "fingerprint": fingerprint,
+                "outputs": outputs,
+                "finished_at": datetime.now(timezone.utc).isoformat(),
+                "seconds": round(seconds, 3),
+            }
+            self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"stages": self.stages}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def stage_fingerprint(stage: Stage, input_files: List[str]) -> str:
+    """Hash a stage's code version, parameters and input file contents."""
+    payload = {
+        "code": {path: file_hash(path) for path in [stage.script] + stage.code},
+        "params": stage.params,
+        "inputs": {path: file_hash(path) for path in sorted(set(input_files))},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def run_in_process(stage: Stage, context: Dict[str, Any]):
+    if stage.run:
+        return stage.run(context)
+
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+    module = importlib.import_module(stage.module_name)
+    return module.main()
+
+
+def run_in_subprocess(stage: Stage, prefix: str = "") -> int:
+    """Run a stage's script in a new interpreter, echoing its output line by line."""
+    process = subprocess.Popen([sys.executable, "-u", stage.script],
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    for line in process.stdout:
+        line = line.rstrip("\n")
+        say(f"{prefix}{line}")
+    return process.wait()
+
+
+def run_stage(stage: Stage, context: Dict[str, Any], isolate: bool = False,
+              prefix: str = "") -> StageResult:
+    say(f"{stage.description}...")
+    started = time.perf_counter()
+    error = None
+
+    if isolate:
+        if not os.path.exists(stage.script):
+            error = f"Script not found: {stage.script}"
+        else:
+            returncode = run_in_subprocess(stage, prefix)
+            if returncode != 0:
+                error = f"Exit code: {returncode}"
+    else:
+        try:
+            context[stage.name] = run_in_process(stage, context)
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                error = f"Exit code: {e.code}"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+    seconds = time.perf_counter() - started
+    if error:
+        say(f"{stage.description} failed after {seconds:.2f}s:\n{error}")
+    else:
+        say(f"{stage.description} completed successfully in {seconds:.2f}s")
+
+    return StageResult(stage, error is None, seconds, error)
+
+
+def _check_graph(stages: List[Stage]):
+    names = {stage.name for stage in stages}
+    if len(names) != len(stages):
+        raise ValueError("Stage names must be unique")
+    for stage in stages:
+        missing = [dep for dep in stage.deps if dep not in names]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): "
+                             f"{', '.join(missing)}")
+
+    # Kahn's algorithm: anything left over is part of a cycle
+    remaining = {stage.name: set(stage.deps) for stage in stages}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle between stages: {', '.join(sorted(remaining))}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def run_graph(stages: List[Stage], isolate: bool = False, context: Optional[Dict[str, Any]] = None,
+              manifest: Optional[BuildManifest] = None, force: bool = False,
+              max_workers: Optional[int] = None) -> List[StageResult]:
+    """
+    Run stages in dependency order. Independent stages run concurrently when
+    `isolate` is set, and one at a time in process. With a manifest, stages
+    whose fingerprint is unchanged are skipped unless `force` is set. Stages
+    downstream of a failure are not run. Returns one result per stage that
+    ran or was skipped, in completion order.
+    """
+    _check_graph(stages)
+    context = {} if context is None else context
+    outputs: Dict[str, List[str]] = {}
+    by_name = {stage.name: stage for stage in stages}
+
+    def execute(stage: Stage) -> StageResult:
+        input_files = [path for dep in stage.deps for path in outputs.get(dep, [])]
+        if stage.inputs:
+            input_files += stage.inputs(context)
+
+        fingerprint = None
+        if manifest is not None:
+            fingerprint = stage_fingerprint(stage, input_files)
+            if not force and manifest.is_up_to_date(stage.name, fingerprint):
+                say(f"{stage.description} is up to date, skipping")
+                outputs[stage.name] = manifest.outputs(stage.name)
+                return StageResult(stage, True, 0.0, up_to_date=True)
+
+        result = run_stage(stage, context, isolate=isolate,
+                           prefix=f"[{stage.name}] " if len(stages) > 1 else "")
+        if result.success:
+            outputs[stage.name] = stage.outputs(context) if stage.outputs else []
+            if manifest is not None:
+                manifest.record(stage.name, fingerprint, outputs[stage.name], result.seconds)
+        return result
+
+    # In-process stages print to the shared stdout and read the process-wide
+    # sys.argv, so only subprocess stages may overlap
+    if not isolate:
+        max_workers = 1
+
+    # Scripts read their own arguments from sys.argv; give in-process stages a clean one
+    saved_argv = sys.argv
+    sys.argv = sys.argv[:1]
+
+    results: List[StageResult] = []
+    finished: Dict[str, bool] = {}
+    pending = list(stages)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers or len(stages) or 1) as pool:
+            running = {}
+            while pending or running:
+                for stage in list(pending):
+                    if any(finished.get(dep) is False for dep in stage.deps):
+                        # Upstream failed: never run, and block its dependents too
+                        pending.remove(stage)
+                        finished[stage.name] = False
+                    elif all(finished.get(dep) for dep in stage.deps):
+                        pending.remove(stage)
+                        running[pool.submit(execute, stage)] = stage.name
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = StageResult(by_name[name], False, 0.0, f"{type(e).__name__}: {e}")
+                    finished[name] = result.success
+                    results.append(result)
+    finally:
+        sys.argv = saved_argv
+
+    return results
+
+
+def run_pipeline(stages: List[Stage], isolate: bool = False,
+                 context: Optional[Dict[str, Any]] = None) -> List[StageResult]:
+    """Run stages strictly in order, stopping at the first failure."""
+    chained = []
+    for index, stage in enumerate(stages):
+        stage = copy.copy(stage)
+        stage.deps = [stages[index - 1].name] if index else []
+        chained.append(stage)
+    return run_graph(chained, isolate=isolate, context=context, max_workers=1)
+
+
+def format_timings(results: List[StageResult]) -> str:
+    width = max((len(r.stage.description) for r in results), default=0)
+    lines = ["Stage timings:"]
+    for result in results:
+        if result.up_to_date:
+            status = " (up to date)"
+        elif not result.success:
+            status = " (failed)"
+        else:
+            status = ""
+        lines.append(f" {result.stage.description:<{width}}  {result.seconds:8.2f}s{status}")
+    lines.append(f" {'Total':<{width}}  {sum(r.seconds for r in results):8.2f}s")
+    return "\n".join(lines)
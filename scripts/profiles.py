@@ -0,0 +1,178 @@
+"""
+Output profiles for changelog data files.
+
+The "full" profile is what `ChangelogGenerator.get_data` returns. The "slim"
+profile keeps only the subject line of each commit message inline, interns
+author and repo name strings into per-org tables, and moves full commit
+bodies to a `commit_bodies_*.json` side file that is only read on demand.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+try:
+    from artifact_index import data_headline, data_metadata, record_artifact
+except ImportError:
+    from scripts.artifact_index import data_headline, data_metadata, record_artifact
+
+PROFILES = ["full", "slim"]
+
+BODIES_PREFIX = "commit_bodies_"
+AUTHOR_KINDS = ["issues", "pulls", "commits", "releases"]
+
+
+def bodies_file_for(data_file: str) -> str:
+    """Return the side file path that holds full commit bodies for a data file."""
+    directory, name = os.path.split(data_file)
+    suffix = name.split("changelog_", 1)[1] if "changelog_" in name else name
+    return os.path.join(directory, BODIES_PREFIX + suffix)
+
+
+def to_slim(org_data: Dict[str, Any], bodies: Dict[str, str],
+            bodies_ref: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Return a slim copy of a single-org data dict. Full commit messages that
+    have more than a subject line are added to `bodies`, keyed by commit URL.
+    """
+    authors: Dict[str, int] = {}
+    repo_names: Dict[str, int] = {}
+
+    def intern(table, value):
+        if value is None:
+            return None
+        if value not in table:
+            table[value] = len(table)
+        return table[value]
+
+    repos = []
+    for repo_data in org_data.get("repos", []):
+        slim_repo = dict(repo_data)
+        if isinstance(slim_repo.get("name"), str):
+            slim_repo["name"] = intern(repo_names, slim_repo["name"])
+
+        for kind in AUTHOR_KINDS:
+            items = []
+            for item in repo_data.get(kind) or []:
+                item = dict(item)
+                if isinstance(item.get("author"), str):
+                    item["author"] = intern(authors, item["author"])
+                if kind == "commits" and item.get("message"):
+                    subject, _, rest = item["message"].partition("\n")
+                    if rest.strip():
+                        bodies[item["url"]] = item["message"]
+                    item["message"] = subject
+                items.append(item)
+            if kind in repo_data:
+                slim_repo[kind] = items
+
+        repos.append(slim_repo)
+
+    # Tables go ahead of the repos so streaming readers see them first
+    slim = {k: v for k, v in org_data.items() if k != "repos"}
+    slim["profile"] = "slim"
+    slim["tables"] = {"authors": list(authors), "repos": list(repo_names)}
+    if bodies_ref:
+        slim["commit_bodies"] = bodies_ref
+    slim["repos"] = repos
+    return slim
+
+
+def is_interned(repo_data: Dict[str, Any]) -> bool:
+    """True if a repo still refers to names by table index."""
+    if isinstance(repo_data.get("name"), int):
+        return True
+    return any(isinstance(item.get("author"), int)
+               for kind in AUTHOR_KINDS for item in repo_data.get(kind) or [])
+
+
+def expand_repo(repo_data: Dict[str, Any], tables: Dict[str, List[str]]) -> Dict[str, Any]:
+    """Resolve one repo's interned names against its org's tables, in place."""
+    authors = tables.get("authors", [])
+    repo_names = tables.get("repos", [])
+
+    if isinstance(repo_data.get("name"), int):
+        repo_data["name"] = repo_names[repo_data["name"]]
+    for kind in AUTHOR_KINDS:
+        for item in repo_data.get(kind) or []:
+            if isinstance(item.get("author"), int):
+                item["author"] = authors[item["author"]]
+    return repo_data
+
+
+def _expand_org(org_data: Dict[str, Any]) -> Dict[str, Any]:
+    tables = org_data.get("tables") or {}
+    for repo_data in org_data.get("repos", []):
+        expand_repo(repo_data, tables)
+    return org_data
+
+
+def expand_tables(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Resolve interned author and repo names in slim data, in place. Commit
+    messages stay as subject lines; use `CommitBodies` for the full text.
+    """
+    if data.get("profile") == "slim":
+        return _expand_org(data)
+    for org_data in data.values():
+        if isinstance(org_data, dict) and org_data.get("profile") == "slim":
+            _expand_org(org_data)
+    return data
+
+
+class CommitBodies:
+    """Lazily loaded mapping of commit URL to full commit message."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._bodies = None
+
+    def _load(self) -> Dict[str, str]:
+        if self._bodies is None:
+            try:
+                from data_io import load_json
+            except ImportError:
+                from scripts.data_io import load_json
+            try:
+                self._bodies = load_json(self.path)
+            except FileNotFoundError:
+                self._bodies = {}
+        return self._bodies
+
+    def get(self, commit: Dict[str, Any]) -> str:
+        """Return the full message for a commit record, falling back to its subject."""
+        return self._load().get(commit.get("url"), commit.get("message", ""))
+
+
+def write_profile(combined_data: Dict[str, Any], filename: str, profile: str = "full") -> Dict[str, Any]:
+    """
+    Write single- or multi-org data to `filename` in the given profile. For
+    the slim profile, full commit bodies go to the side file next to it.
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown output profile '{profile}'. Expected one of: {', '.join(PROFILES)}")
+
+    metadata = data_metadata(combined_data)
+    headline = data_headline(combined_data)
+
+    if profile == "slim":
+        bodies: Dict[str, str] = {}
+        bodies_file = bodies_file_for(filename)
+        bodies_ref = os.path.basename(bodies_file)
+        if "repos" in combined_data:
+            combined_data = to_slim(combined_data, bodies, bodies_ref)
+        else:
+            combined_data = {
+                org: to_slim(org_data, bodies, bodies_ref)
+                for org, org_data in combined_data.items()
+            }
+        with open(bodies_file, "w") as f:
+            json.dump(bodies, f)
+        with open(filename, "w") as f:
+            json.dump(combined_data, f, separators=(",", ":"))
+    else:
+        with open(filename, "w") as f:
+            json.dump(combined_data, f, indent=2)
+
+    record_artifact(filename, metadata.get("period"), metadata.get("generated_at"), headline)
+    return combined_data
@@ -0,0 +1,120 @@
+"""
+Bulk rebuild of the summaries for historical data files.
+
+After a change to the summary logic, every `summary_*`, `summary_condensed_*`,
+`mailto_*`, `slack_*`, `pr_title_*`, `pr_body_*` and `pr_appendix_*` file can be
+regenerated at once. Each data file is summarized by `summary_engine.generate_all`
+in a process pool, with its outputs dated by the data file's end date (the day
+the weekly run that fetched it would have written them), so rebuilding the same
+files always writes the same names. A per-file timing report is printed at the
+end.
+
+    python scripts/rebuild.py                      # every weekly data file
+    python scripts/rebuild.py changelog_data/data/weekly_changelog_2026-0*.json
+    REBUILD_WORKERS=4 python scripts/rebuild.py    # default: one per CPU
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+try:
+    from data_io import file_date, list_files
+    from summary_engine import DATA_DIR, OUTPUT_DIR, generate_all
+except ImportError:
+    from scripts.data_io import file_date, list_files
+    from scripts.summary_engine import DATA_DIR, OUTPUT_DIR, generate_all
+
+
+class RebuildResult:
+    def __init__(self, data_file: str, seconds: float, paths: Optional[Dict[str, str]] = None,
+                 error: Optional[str] = None):
+        self.data_file = data_file
+        self.seconds = seconds
+        self.paths = paths or {}
+        self.error = error
+        self.success = error is None
+
+
+def output_date(data_file: str) -> datetime:
+    """The day a data file's outputs are dated: the end date in its name."""
+    end = file_date(os.path.basename(data_file))
+    if end is None:
+        raise ValueError(f"No date in data file name: {data_file}")
+    return datetime(end.year, end.month, end.day, tzinfo=timezone.utc)
+
+
+def rebuild_file(data_file: str, output_dir: str = OUTPUT_DIR) -> RebuildResult:
+    """Regenerate every summary output of one data file. Errors are returned, not raised."""
+    started = time.perf_counter()
+    try:
+        paths = generate_all(data_file, output_dir, now=output_date(data_file))
+    except Exception as e:
+        return RebuildResult(data_file, time.perf_counter() - started, error=f"{type(e).__name__}: {e}")
+    return RebuildResult(data_file, time.perf_counter() - started, paths)
+
+
+def rebuild(data_files: List[str], output_dir: str = OUTPUT_DIR,
+            workers: Optional[int] = None) -> List[RebuildResult]:
+    """
+    Rebuild the summaries of many data files, `workers` at a time (one per CPU
+    by default; 1 runs in this process). Results are in the order of
+    `data_files`. Files that would write outputs with the same date are
+    rejected up front, since one would overwrite the other.
+    """
+    by_date: Dict[datetime, List[str]] = {}
+    for data_file in data_files:
+        by_date.setdefault(output_date(data_file), []).append(os.path.basename(data_file))
+    clashes = {day: names for day, names in by_date.items() if len(names) > 1}
+    if clashes:
+        details = "; ".join(f"{day:%Y-%m-%d}: {', '.join(names)}" for day, names in sorted(clashes.items()))
+        raise ValueError(f"Data files would write outputs with the same date: {details}")
+
+    workers = min(workers or os.cpu_count() or 1, len(data_files) or 1)
+    if workers == 1:
+        return [rebuild_file(data_file, output_dir) for data_file in data_files]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(rebuild_file, data_files, [output_dir] * len(data_files)))
+
+
+def format_report(results: List[RebuildResult], wall_seconds: float) -> str:
+    width = max((len(os.path.basename(r.data_file)) for r in results), default=0)
+    lines = ["Rebuild timings:"]
+    for result in results:
+        status = f" (failed: {result.error})" if result.error else ""
+        lines.append(f" {os.path.basename(result.data_file):<{width}}  {result.seconds:8.2f}s{status}")
+    lines.append(f" {'Total (summed)':<{width}}  {sum(r.seconds for r in results):8.2f}s")
+    lines.append(f" {'Wall clock':<{width}}  {wall_seconds:8.2f}s")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Rebuild the summaries of the given data files, or of every weekly data file."""
+    argv = sys.argv[1:] if argv is None else argv
+    data_files = argv or [
+        os.path.join(DATA_DIR, name) for name in list_files(DATA_DIR, "weekly_changelog_") if name.endswith(".json")
+    ]
+    if not data_files:
+        print("No weekly changelog files found.")
+        return []
+
+    workers = int(os.getenv("REBUILD_WORKERS", "0")) or None
+    print(f"Rebuilding summaries for {len(data_files)} data files")
+
+    started = time.perf_counter()
+    results = rebuild(data_files, workers=workers)
+    print(format_report(results, time.perf_counter() - started))
+
+    failed = [r for r in results if not r.success]
+    if failed:
+        print(f"{len(failed)} of {len(results)} rebuilds failed")
+        sys.exit(1)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Size-budgeted rendering shared by the mailto, Slack and PR body outputs.
+
+A `Budget` collects lines while keeping a running total of their rendered
+size, measured the way the channel counts it (URL-encoded length for mailto
+links, characters elsewhere). Lists of items are added with `add_items`,
+which stops before the budget runs out and ends with an "...and N more"
+line, so every channel renders in a single linear pass and never exceeds
+its limit.
+"""
+
+import os
+import urllib.parse
+from typing import Callable, List, Optional, Sequence, Union
+
+
+# mailto links longer than ~2,000 characters are cut off by some mail clients
+MAILTO_LIMIT = 2000
+# Slack collapses messages longer than this behind "Show more"
+SLACK_LIMIT = 4000
+# GitHub rejects pull request bodies longer than this
+PR_BODY_LIMIT = 65536
+
+
+def url_length(text: str) -> int:
+    return len(urllib.parse.quote(text))
+
+
+Block = Union[str, Sequence[str]]
+
+
+class Budget:
+    """
+    Lines joined by `separator`, limited to `limit` units as counted by
+    `measure`. Footer lines are always rendered and their size is reserved
+    up front.
+    """
+
+    def __init__(self, limit: int, measure: Callable[[str], int] = len,
+                 separator: str = "\n", footer: Optional[List[str]] = None):
+        self.limit = limit
+        self.measure = measure
+        self.separator = separator
+        self.separator_size = measure(separator)
+        self.lines: List[str] = []
+        self.footer = list(footer or [])
+        self.size = 0
+        self.reserved = sum(measure(line) + self.separator_size for line in self.footer)
+
+    def cost(self, lines: Sequence[str]) -> int:
+        """Size the lines would add, including separators."""
+        size = sum(self.measure(line) for line in lines) + self.separator_size * len(lines)
+        if not self.lines:
+            size -= self.separator_size
+        return size
+
+    def remaining(self) -> int:
+        return self.limit - self.reserved - self.size
+
+    def fits(self, lines: Sequence[str], extra: int = 0) -> bool:
+        return self.cost(lines) + extra <= self.remaining()
+
+    def add(self, block: Block, extra: int = 0) -> bool:
+        """Add a line or group of lines if it fits, keeping `extra` units free. Returns whether it was added."""
+        lines = [block] if isinstance(block, str) else list(block)
+        cost = self.cost(lines)
+        if cost + extra > self.remaining():
+            return False
+        self.lines.extend(lines)
+        self.size += cost
+        return True
+
+    def add_items(self, blocks: Sequence[Block], more: Callable[[int], str],
+                  limit: Optional[int] = None, reserve: int = 0,
+                  more_when_limited: bool = True) -> int:
+        """
+        Add items (each a line or group of lines) in order while they fit,
+        keeping `reserve` units free for later sections, then `more(n)` for
+        the n items left out. At most `limit` items are considered; with
+        `more_when_limited` unset, items dropped only by `limit` get no more
+        line. Returns the number of items added.
+        """
+        if limit is not None:
+            omitted_by_limit = max(len(blocks) - limit, 0)
+            blocks = blocks[:limit]
+        else:
+            omitted_by_limit = 0
+        limited = omitted_by_limit and more_when_limited
+
+        # Room for the "...and N more" line, sized for the largest N it could show
+        more_size = self.measure(more(len(blocks) + omitted_by_limit)) + self.separator_size
+
+        added = 0
+        for index, block in enumerate(blocks):
+            is_last = index == len(blocks) - 1
+            if not self.add(block, extra=reserve + (0 if is_last and not limited else more_size)):
+                break
+            added += 1
+
+        if added < len(blocks) or limited:
+            self.add(more(len(blocks) - added + omitted_by_limit), extra=reserve)
+        return added
+
+    def render(self) -> str:
+        return self.separator.join(self.lines + self.footer)
+
+
+def blob_url(path: str, branch: str) -> str:
+    """
+    Link to a file committed on `branch`. Inside GitHub Actions this is an
+    absolute URL on the current repository; elsewhere it is the path itself.
+    """
+    path = path.replace(os.sep, "/")
+    repository = os.getenv("GITHUB_REPOSITORY")
+    if not repository:
+        return path
+    server = os.getenv("GITHUB_SERVER_URL", "https://github.com")
+    return f"{server}/{repository}/blob/{urllib.parse.quote(branch)}/{urllib.parse.quote(path)}"
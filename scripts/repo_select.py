@@ -0,0 +1,104 @@
+"""
+Declarative repo selection for the GitHub fetch.
+
+Every field used here is part of the `org.get_repos()` listing payload, so
+`ChangelogGenerator.get_data` can decide whether to process a repo before it
+makes any other request for it. Repos that are not selected cost nothing
+beyond the listing page they came in.
+
+The selection is read from `REPO_SELECTION` (default `repo_selection.json`);
+without that file every repo is selected. Every key is optional:
+
+    {
+      "include": ["iv-*", "DSACMS/cms-*"],
+      "exclude": ["*-sandbox"],
+      "topics": ["terraform", "batcave"],
+      "fork": false,
+      "template": false,
+      "min_pushed_at": "2024-01-01",
+      "max_size_kb": 500000
+    }
+
+`include` and `exclude` are case-insensitive globs matched against the repo
+name and `org/name`; with `include` set, a repo must match one of them.
+`topics` selects repos with at least one of the topics. `fork` and `template`
+keep only repos with that status. `min_pushed_at` is a date, or a number of
+days before the run. `max_size_kb` is compared with the repo's `size`, which
+GitHub reports in kilobytes.
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Optional
+
+SELECTION_CONFIG = "repo_selection.json"
+
+SELECTION_KEYS = {"include", "exclude", "topics", "fork", "template", "min_pushed_at", "max_size_kb"}
+
+
+def load_selection(path: Optional[str] = None) -> Dict[str, Any]:
+    """The selection config, or {} (select everything) when there is none."""
+    path = path or os.getenv("REPO_SELECTION", SELECTION_CONFIG)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        config = json.load(f)
+    unknown = set(config) - SELECTION_KEYS
+    if unknown:
+        raise ValueError(f"Unknown repo selection keys in {path}: {', '.join(sorted(unknown))}")
+    return config
+
+
+class RepoSelector:
+    def __init__(self, config: Optional[Dict[str, Any]] = None, now: Optional[datetime] = None):
+        config = config or {}
+        self.include = [pattern.lower() for pattern in config.get("include") or []]
+        self.exclude = [pattern.lower() for pattern in config.get("exclude") or []]
+        self.topics = {topic.lower() for topic in config.get("topics") or []}
+        self.fork = config.get("fork")
+        self.template = config.get("template")
+        self.max_size_kb = config.get("max_size_kb")
+
+        min_pushed_at = config.get("min_pushed_at")
+        if isinstance(min_pushed_at, int):
+            min_pushed_at = (now or datetime.now(timezone.utc)) - timedelta(days=min_pushed_at)
+        elif min_pushed_at:
+            min_pushed_at = datetime.fromisoformat(min_pushed_at)
+        if min_pushed_at and min_pushed_at.tzinfo:
+            min_pushed_at = min_pushed_at.astimezone(timezone.utc)
+        # Naive UTC, compared with pushed_at also made naive
+        self.min_pushed_at = min_pushed_at.replace(tzinfo=None) if min_pushed_at else None
+
+    @classmethod
+    def from_env(cls) -> "RepoSelector":
+        return cls(load_selection())
+
+    def __bool__(self) -> bool:
+        """Whether any repo can be rejected at all."""
+        return bool(self.include or self.exclude or self.topics or self.min_pushed_at or
+                    self.fork is not None or self.template is not None or self.max_size_kb is not None)
+
+    def rejects(self, org: str, repo: Any) -> Optional[str]:
+        """
+        Why the repo is not selected, or None when it is. Only reads fields
+        of the listing payload.
+        """
+        names = (repo.name.lower(), f"{org}/{repo.name}".lower())
+        if self.include and not any(fnmatchcase(name, p) for name in names for p in self.include):
+            return "not included"
+        if any(fnmatchcase(name, p) for name in names for p in self.exclude):
+            return "excluded"
+        if self.topics and not self.topics.intersection(topic.lower() for topic in repo.topics or []):
+            return "no selected topic"
+        if self.fork is not None and bool(repo.fork) != self.fork:
+            return "fork" if repo.fork else "not a fork"
+        if self.template is not None and bool(repo.is_template) != self.template:
+            return "template" if repo.is_template else "not a template"
+        if self.min_pushed_at and (repo.pushed_at is None or
+                                   repo.pushed_at.replace(tzinfo=None) < self.min_pushed_at):
+            return "not pushed recently"
+        if self.max_size_kb is not None and (repo.size or 0) > self.max_size_kb:
+            return "too large"
+        return None
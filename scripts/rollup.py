@@ -0,0 +1,378 @@
+"""
+Monthly and quarterly rollups from per-week aggregate records.
+
+Next to each `weekly_changelog_<A>_to_<B>.json` data file, `update_stats`
+writes a small `weekly_stats_<A>_to_<B>.json` record: per repo, 64-bit hashes
+of every issue, PR and commit URL (plus merge dates and new-issue flags), the
+week's key changes, categorized changes and classified activity. A rollup
+merges the records of every week that ends inside the window, deduplicating
+items by URL hash so overlapping weekly windows are counted once, and builds
+summaries in the same shapes as `generate_summary` and the condensed summary.
+No data files are read and no API calls are made once the records exist.
+
+    python scripts/rollup.py                 # last complete month and quarter
+    python scripts/rollup.py month 2026-07
+    python scripts/rollup.py quarter 2026-Q3
+"""
+
+import json
+import os
+import sys
+from calendar import monthrange
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from artifact_index import record_artifact, summary_headline
+    from classify import TOP_ITEMS, ActivityClassifier, activity_items, classify_batch, empty_categories
+    from columnar import url_hash
+    from data_io import file_date, list_files, load_json
+    from dedup import collapse_duplicates
+    from json_stream import ChangelogStream
+    from summary_engine import SummaryEngine, data_metadata
+except ImportError:
+    from scripts.artifact_index import record_artifact, summary_headline
+    from scripts.classify import TOP_ITEMS, ActivityClassifier, activity_items, classify_batch, empty_categories
+    from scripts.columnar import url_hash
+    from scripts.data_io import file_date, list_files, load_json
+    from scripts.dedup import collapse_duplicates
+    from scripts.json_stream import ChangelogStream
+    from scripts.summary_engine import SummaryEngine, data_metadata
+
+
+DATA_DIR = "changelog_data/data"
+OUTPUT_DIR = "changelog_data/summaries"
+
+DATA_PREFIX = "weekly_changelog_"
+STATS_PREFIX = "weekly_stats_"
+# Bump when the record layout changes so older records are rebuilt
+STATS_VERSION = 1
+
+ITEM_KINDS = ["commits", "pulls", "issues"]
+
+ROLLUP_KINDS = ("monthly", "quarterly")
+# Stated in every rollup, since a week can straddle two windows
+WEEK_RULE = "Each week is counted whole in the window that contains its end date"
+
+
+def stats_name(data_name: str) -> str:
+    """`weekly_changelog_A_to_B.json` -> `weekly_stats_A_to_B.json`"""
+    return STATS_PREFIX + data_name[len(DATA_PREFIX):]
+
+
+def _item_hash(repo_key: str, kind: str, item: Dict[str, Any]) -> int:
+    url = item.get("url") or f"{repo_key}#{kind}:{item.get('sha') or item.get('title') or item.get('message')}"
+    return url_hash(url)
+
+
+def repo_stats(org: str, repo_data: Dict[str, Any]) -> Dict[str, Any]:
+    """The aggregate record for one repo in one week."""
+    repo_key = f"{org}/{repo_data.get('name', 'Unknown')}"
+    record = {
+        "org": org or "unknown",
+        "name": repo_data.get("name", "Unknown"),
+        "url": repo_data.get("url", ""),
+    }
+    for kind in ITEM_KINDS:
+        record[kind] = [_item_hash(repo_key, kind, item) for item in repo_data.get(kind) or []]
+
+    record["changelog_entries"] = [
+        f"{entry.get('version')}@{entry.get('date')}" for entry in repo_data.get("changelog_entries") or []
+    ]
+    record["merged"] = [
+        [_item_hash(repo_key, "pulls", pr), pr["merged_at"][:10]]
+        for pr in repo_data.get("pulls") or []
+        if pr.get("merged") and pr.get("merged_at")
+    ]
+    record["new_issues"] = [
+        _item_hash(repo_key, "issues", issue) for issue in repo_data.get("issues") or [] if issue.get("is_new")
+    ]
+    return record
+
+
+def week_stats(data_file: str) -> Dict[str, Any]:
+    """Build the aggregate record for one weekly data file in a single streaming pass."""
+    engine = SummaryEngine()
+    stream = ChangelogStream(data_file)
+    repos = []
+    activity = []
+
+    for org, repo_data in stream:
+        engine.add_repo(org, repo_data)
+        repos.append(repo_stats(org, repo_data))
+
+        items = activity_items(repo_data)
+        for item, (_, bucket) in zip(items, classify_batch([item["text"] for item in items])):
+            activity.append([url_hash(item["url"] or f"{org}/{item['repo']}#{item['text']}"), bucket])
+
+    engine.set_metadata(**data_metadata(stream.skeleton))
+    full = engine.full_summary()
+    condensed = engine.condensed_summary()
+
+    return {
+        "version": STATS_VERSION,
+        "source": os.path.basename(data_file),
+        "period": full["period"],
+        "generated_at": full["generated_at"],
+        "total_repos": full["total_repos"],
+        "repos": repos,
+        "key_changes": full["key_change_records"],
+        # Before near-duplicate suppression, which runs again on the merged weeks
+        "categorized": {bucket: items for bucket, items in engine.categorized.items() if items},
+        "activity": {"items": activity, "top_items": condensed["activity_types"]["top_items"]},
+    }
+
+
+def update_stats(data_dir: str = DATA_DIR) -> List[str]:
+    """Write the aggregate record for every weekly data file that lacks a current one."""
+    existing = set(list_files(data_dir, STATS_PREFIX))
+    written = []
+
+    for name in list_files(data_dir, DATA_PREFIX):
+        target = stats_name(name)
+        if target in existing and load_json(os.path.join(data_dir, target)).get("version") == STATS_VERSION:
+            continue
+
+        stats = week_stats(os.path.join(data_dir, name))
+        path = os.path.join(data_dir, target)
+        with open(path + ".tmp", "w") as f:
+            json.dump(stats, f, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+        record_artifact(path, stats["period"], stats["generated_at"], {"total_repos": stats["total_repos"]})
+        written.append(target)
+
+    return written
+
+
+def month_window(label: str) -> Tuple[date, date]:
+    """'2026-07' -> (2026-07-01, 2026-07-31)"""
+    year, month = (int(part) for part in label.split("-"))
+    return date(year, month, 1), date(year, month, monthrange(year, month)[1])
+
+
+def quarter_window(label: str) -> Tuple[date, date]:
+    """'2026-Q3' -> (2026-07-01, 2026-09-30)"""
+    year, quarter = label.upper().split("-Q")
+    first_month = 3 * (int(quarter) - 1) + 1
+    start, _ = month_window(f"{year}-{first_month}")
+    _, end = month_window(f"{year}-{first_month + 2}")
+    return start, end
+
+
+def previous_windows(today: date) -> Dict[str, str]:
+    """Labels of the last complete month and quarter before `today`."""
+    last_month = today.replace(day=1) - timedelta(days=1)
+    quarter_start = date(today.year, 3 * ((today.month - 1) // 3) + 1, 1)
+    last_quarter = quarter_start - timedelta(days=1)
+    return {
+        "monthly": last_month.strftime("%Y-%m"),
+        "quarterly": f"{last_quarter.year}-Q{(last_quarter.month - 1) // 3 + 1}",
+    }
+
+
+class Rollup:
+    """
+    Merges weekly aggregate records into one window. Every item is keyed by
+    its URL hash (key changes and categorized changes without a URL by their
+    text), so a week that overlaps another adds only what is new.
+    """
+
+    def __init__(self, start: date, end: date):
+        self.start = start.isoformat()
+        self.end = end.isoformat()
+        self.weeks: List[str] = []
+        self.total_repos = 0
+        self.repos: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.key_changes: Dict[Tuple[str, str, str, str], Dict[str, str]] = {}
+        self.categorized: Dict[str, Dict[Any, Dict[str, Any]]] = {bucket: {} for bucket in empty_categories()}
+        self.activity: Dict[int, str] = {}
+        self.top_items: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def add(self, stats: Dict[str, Any]):
+        self.weeks.append(stats["source"])
+        self.total_repos = max(self.total_repos, stats.get("total_repos") or 0)
+
+        for record in stats["repos"]:
+            repo = self.repos.get((record["org"], record["name"]))
+            if repo is None:
+                repo = self.repos[(record["org"], record["name"])] = {
+                    "org": record["org"], "name": record["name"], "url": record["url"],
+                    "commits": set(), "pulls": set(), "issues": set(), "changelog_entries": set(),
+                    "merged": {}, "new_issues": set(),
+                }
+            for kind in ITEM_KINDS + ["changelog_entries", "new_issues"]:
+                repo[kind].update(record[kind])
+            repo["merged"].update((h, merged_on) for h, merged_on in record["merged"])
+
+        for change in stats["key_changes"]:
+            self.key_changes.setdefault((change["org"], change["repo"], change["kind"], change["text"]), change)
+
+        for bucket, items in stats["categorized"].items():
+            merged = self.categorized.setdefault(bucket, {})
+            for item in items:
+                key = item.get("url") or (item["repo"], item.get("category"), item["text"])
+                merged.setdefault(key, item)
+
+        for h, bucket in stats["activity"]["items"]:
+            self.activity.setdefault(h, bucket)
+        for bucket, items in stats["activity"]["top_items"].items():
+            merged = self.top_items.setdefault(bucket, {})
+            for item in items:
+                merged.setdefault(item["url"] or item["text"], item)
+
+    def _period(self) -> Dict[str, str]:
+        return {"start": self.start, "end": self.end}
+
+    def _totals(self) -> Dict[str, int]:
+        return {
+            kind: sum(len(repo[kind]) for repo in self.repos.values())
+            for kind in ITEM_KINDS + ["changelog_entries"]
+        }
+
+    def _active(self) -> List[Dict[str, Any]]:
+        return [repo for repo in self.repos.values()
+                if repo["issues"] or repo["pulls"] or repo["commits"] or repo["changelog_entries"]]
+
+    def full_summary(self) -> Dict[str, Any]:
+        """A summary in the shape `generate_summary` produces."""
+        highlights: Dict[Tuple[str, str], List[str]] = {}
+        for change in self.key_changes.values():
+            highlights.setdefault((change["org"], change["repo"]), []).append(f"{change['kind']}: {change['text']}")
+
+        repos_with_activity = []
+        for key, repo in self.repos.items():
+            repo_highlights = list(highlights.get(key, []))
+            merged = sum(1 for merged_on in repo["merged"].values() if self.start <= merged_on <= self.end)
+            if merged:
+                repo_highlights.append(f"{merged} PR(s) merged")
+            if repo["new_issues"]:
+                repo_highlights.append(f"{len(repo['new_issues'])} new issue(s)")
+            repos_with_activity.append({
+                "name": repo["name"],
+                "org": repo["org"],
+                "url": repo["url"],
+                "issues": len(repo["issues"]),
+                "pulls": len(repo["pulls"]),
+                "commits": len(repo["commits"]),
+                "changelog_entries": len(repo["changelog_entries"]),
+                "highlights": repo_highlights,
+            })
+
+        totals = self._totals()
+        records = list(self.key_changes.values())
+        return {
+            "period": self._period(),
+            "week_rule": WEEK_RULE,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "total_repos": self.total_repos or len(self.repos),
+            "active_repos": len(self._active()),
+            "total_issues": totals["issues"],
+            "total_pulls": totals["pulls"],
+            "total_commits": totals["commits"],
+            "total_changelog_entries": totals["changelog_entries"],
+            "repos_with_activity": repos_with_activity,
+            "key_changes": [f"{r['repo']}: {r['kind']} {r['text']}" for r in records],
+            "key_change_records": records,
+            "weeks": list(self.weeks),
+        }
+
+    def condensed_summary(self) -> Dict[str, Any]:
+        """A summary in the shape the condensed summary produces."""
+        totals = self._totals()
+        categorized, suppressed = collapse_duplicates(
+            {bucket: list(items.values()) for bucket, items in self.categorized.items()})
+
+        counts: Dict[str, int] = {}
+        for bucket in self.activity.values():
+            counts[bucket] = counts.get(bucket, 0) + 1
+        rank = ActivityClassifier.RANK
+        top_items = {
+            bucket: sorted(items.values(), key=lambda item: rank[item["type"]])[:TOP_ITEMS]
+            for bucket, items in self.top_items.items() if items
+        }
+
+        return {
+            "period": self._period(),
+            "week_rule": WEEK_RULE,
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "total_repos": self.total_repos or len(self.repos),
+            "active_repos": len(self._active()),
+            "total_commits": totals["commits"],
+            "total_pulls": totals["pulls"],
+            "total_issues": totals["issues"],
+            "total_changelog_entries": totals["changelog_entries"],
+            "categorized_changes": categorized,
+            "change_counts": {bucket: len(items) for bucket, items in categorized.items() if items},
+            "duplicates_suppressed": suppressed,
+            "active_repos_list": [{
+                "name": repo["name"],
+                "url": repo["url"],
+                "org": repo["org"],
+                "commits": len(repo["commits"]),
+                "pulls": len(repo["pulls"]),
+                "issues": len(repo["issues"]),
+            } for repo in self._active()],
+            "activity_types": {
+                "classified": len(self.activity),
+                "counts": counts,
+                "top_items": top_items,
+            },
+            "weeks": list(self.weeks),
+        }
+
+
+def rollup(start: date, end: date, data_dir: str = DATA_DIR) -> Rollup:
+    """Merge the aggregate records of every week that ends within [start, end]."""
+    result = Rollup(start, end)
+    for name in list_files(data_dir, STATS_PREFIX):
+        week_end = file_date(name)
+        if week_end is not None and start <= week_end <= end:
+            result.add(load_json(os.path.join(data_dir, name)))
+    return result
+
+
+def write_rollup(kind: str, label: str, data_dir: str = DATA_DIR,
+                 output_dir: str = OUTPUT_DIR) -> Optional[Dict[str, str]]:
+    """Build and write the `kind` ("monthly" or "quarterly") rollup for `label`."""
+    if kind not in ROLLUP_KINDS:
+        raise ValueError(f"Unknown rollup kind '{kind}', expected one of: {', '.join(ROLLUP_KINDS)}")
+    start, end = quarter_window(label) if kind == "quarterly" else month_window(label)
+    result = rollup(start, end, data_dir)
+    if not result.weeks:
+        print(f"No weekly stats found for {label}")
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {
+        "summary": os.path.join(output_dir, f"summary_{kind}_{label}.json"),
+        "summary_condensed": os.path.join(output_dir, f"summary_condensed_{kind}_{label}.json"),
+    }
+    for output_kind, summary in (("summary", result.full_summary()),
+                                 ("summary_condensed", result.condensed_summary())):
+        with open(paths[output_kind], "w") as f:
+            json.dump(summary, f, indent=2)
+        record_artifact(paths[output_kind], summary["period"], summary["generated_at"], summary_headline(summary))
+
+    print(f"{kind.capitalize()} rollup {label}: {len(result.weeks)} weeks, {len(result.repos)} repos")
+    return paths
+
+
+def main(argv: Optional[List[str]] = None):
+    """Update missing weekly stats, then write the requested (or last complete) rollups."""
+    argv = sys.argv[1:] if argv is None else argv
+
+    written = update_stats()
+    if written:
+        print(f"Wrote weekly stats for {len(written)} data files")
+
+    if argv:
+        kind = {"month": "monthly", "quarter": "quarterly"}.get(argv[0], argv[0])
+        windows = {kind: argv[1]}
+    else:
+        windows = previous_windows(datetime.now(timezone.utc).date())
+
+    return {kind: write_rollup(kind, label) for kind, label in windows.items()}
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,121 @@
 import os
 import sys
-import subprocess
 from datetime import datetime, timezone
 
-def run_script(script_path, description):
-    """Run a Python script and handle errors."""
-    print(f"{description}...")
+try:
+    from pipeline import MANIFEST_FILE, BuildManifest, Stage, format_timings, run_graph
+except ImportError:
+    from scripts.pipeline import MANIFEST_FILE, BuildManifest, Stage, format_timings, run_graph
+
+def generate_summaries(context):
+    """Summarize the weekly data handed over by the fetch stage, if it ran in process."""
     try:
-        result = subprocess.run([sys.executable, script_path],
-                                capture_output=True, text=True, check=True)
-        print(f"{description} completely successfully")
-        if result.stdout:
-            print(result.stdout)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"{description} failed:")
-        print(f"Exit code: {e.returncode}")
-        if e.stdout:
-            print(f"stdout: {e.stdout}")
-        if e.stderr:
-            print(f"stderr: {e.stderr}")
-        return False
-    except FileNotFoundError:
-        print(f"Script not found: {script_path}")
-        return False
-    
+        import summary_engine
+    except ImportError:
+        from scripts import summary_engine
+
+    weekly = context.get("fetch")
+    if weekly:
+        data_file, data = weekly
+        return summary_engine.generate_all(data_file, data=data)
+    return summary_engine.main()
+
+def generate_team_digests(context):
+    """Write the team digests from the weekly data of the fetch stage, if it ran in process."""
+    try:
+        import digests
+    except ImportError:
+        from scripts import digests
+
+    teams = digests.load_teams()
+    weekly = context.get("fetch")
+    if weekly and teams:
+        data_file, data = weekly
+        return digests.generate_digests(data_file, teams, data=data)
+    return digests.main()
+
+def build_stages(script_dir="scripts"):
+    """
+    The weekly pipeline graph: fetch first, then the archive, search index,
+    team digests and rollups (in parallel when isolated), and summaries once
+    the archive has the new week.
+    """
+    try:
+        from digests import digest_paths, load_teams
+        from generate_changelog_weekly import weekly_window
+        from rollup import stats_name
+        from summary_engine import output_paths
+    except ImportError:
+        from scripts.digests import digest_paths, load_teams
+        from scripts.generate_changelog_weekly import weekly_window
+        from scripts.rollup import stats_name
+        from scripts.summary_engine import output_paths
+
+    start_date, end_date, data_file = weekly_window()
+    catalog_file = os.getenv("REPO_CATALOG", "changelog_data/repos.json")
+    archive_dir = os.getenv("COLUMNAR_ARCHIVE_DIR", "changelog_data/columnar")
+    teams_config = os.getenv("TEAMS_CONFIG", "teams.json")
+    search_dir = os.getenv("SEARCH_INDEX_DIR", "changelog_data/search")
+    selection_config = os.getenv("REPO_SELECTION", "repo_selection.json")
+
+    def code(*names):
+        return [os.path.join(script_dir, name) for name in names]
+
+    # From the config rather than the run context, which isolated stages never fill
+    def team_digest_outputs(ctx):
+        return [path for team in load_teams(teams_config) for path in digest_paths(team).values()]
+
+    stats_file = os.path.join(os.path.dirname(data_file), stats_name(os.path.basename(data_file)))
+
+    return [
+        Stage(os.path.join(script_dir, "generate_changelog_weekly.py"),
+              "Generating weekly changelog data", name="fetch",
+              inputs=lambda ctx: [selection_config],
+              outputs=lambda ctx: [data_file, catalog_file],
+              code=code("util.py", "actors.py", "repo_select.py", "store.py", "catalog.py",
+                        "profiles.py", "data_io.py"),
+              params={"window": [start_date, end_date],
+                      "profile": os.getenv("OUTPUT_PROFILE", "full"),
+                      "activity_db": os.getenv("ACTIVITY_DB"),
+                      "actor_filter": os.getenv("ACTOR_FILTER")}),
+        Stage(os.path.join(script_dir, "summary_engine.py"),
+              "Generating full and condensed summaries", name="summaries",
+              run=generate_summaries, deps=["fetch", "columnar"],
+              outputs=lambda ctx: list(output_paths().values()),
+              code=code("classify.py", "dedup.py", "generate_summary.py",
+                        "generate_summary_condensed.py", "trends.py", "flow.py", "columnar.py",
+                        "delta.py", "data_io.py", "catalog.py", "profiles.py")),
+        Stage(os.path.join(script_dir, "columnar.py"),
+              "Updating columnar activity archive", name="columnar", deps=["fetch"],
+              outputs=lambda ctx: [os.path.join(archive_dir, "meta.json")],
+              code=code("data_io.py", "catalog.py", "profiles.py")),
+        Stage(os.path.join(script_dir, "search.py"),
+              "Updating full-text search index", name="search", deps=["fetch"],
+              outputs=lambda ctx: [os.path.join(search_dir, "meta.json")],
+              code=code("columnar.py", "store.py", "data_io.py", "catalog.py", "profiles.py")),
+        Stage(os.path.join(script_dir, "digests.py"),
+              "Generating team digests", name="digests",
+              run=generate_team_digests, deps=["fetch"],
+              inputs=lambda ctx: [teams_config],
+              outputs=team_digest_outputs,
+              code=code("summary_engine.py", "classify.py", "dedup.py", "generate_summary.py",
+                        "generate_summary_condensed.py", "json_stream.py", "data_io.py",
+                        "catalog.py", "profiles.py")),
+        Stage(os.path.join(script_dir, "rollup.py"),
+              "Updating weekly stats and monthly/quarterly rollups", name="rollup",
+              deps=["fetch"],
+              outputs=lambda ctx: [stats_file],
+              code=code("classify.py", "dedup.py", "summary_engine.py", "json_stream.py",
+                        "columnar.py", "data_io.py", "catalog.py", "profiles.py")),
+    ]
+
+USAGE = """Usage: python scripts/run_weekly.py [--isolate] [--force]
+
+  --isolate  run each stage as a separate script; independent stages then run
+             concurrently (also PIPELINE_ISOLATE=1). Without it every stage
+             runs in this interpreter, one at a time.
+  --force    run every stage, even those unchanged since their last success"""
+
 def check_environment():
     """Check if required environment variables are set."""
     required_vars = ["GH_TOKEN", "GITHUB_TOKEN"]
@@ -43,6 +134,14 @@ def check_environment():
 
 def main():
     """Main function to run weekly changelog workflow."""
+    if any(arg in ("-h", "--help") for arg in sys.argv[1:]):
+        print(USAGE)
+        sys.exit(0)
+
+    # Stream stage output as it is printed, even when stdout is a pipe
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=True)
+
     print("Starting weekly chngelog generation workflow")
     print(f"Started at: {datetime.now(timezone.utc).isoformat()}")
     print("-" * 60)
@@ -50,22 +149,19 @@ def main():
     if not check_environment():
         sys.exit(1)
 
-    script_dir = "scripts"
-    scripts = [
-        (os.path.join(script_dir, "generate_changelog_weekly.py"),
-         "Generating weekly changelog data"),
-        (os.path.join(script_dir, "generate_summary.py"),
-         "Generating summary and notifications"),
-        (os.path.join(script_dir, "generate_summary_condensed.py"),
-         "Generating condensed changelog summary"),
-    ]
+    # --isolate (or PIPELINE_ISOLATE=1) runs each stage in its own interpreter
+    isolate = "--isolate" in sys.argv[1:] or os.getenv("PIPELINE_ISOLATE") == "1"
+    # Stages whose inputs and code are unchanged since their last success are skipped
+    force = "--force" in sys.argv[1:]
 
-    all_success = True
-    for script_path, description in scripts:
-        if not run_script(script_path, description):
-            all_success = False
-            break
-        print()
+    stages = build_stages()
+    manifest = BuildManifest(os.getenv("BUILD_MANIFEST", MANIFEST_FILE))
+
+    results = run_graph(stages, isolate=isolate, manifest=manifest, force=force)
+    all_success = len(results) == len(stages) and all(r.success for r in results)
+
+    print(format_timings(results))
+    print()
 
     if all_success:
         print("Weekly changelog generated successfully!")
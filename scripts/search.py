@@ -0,0 +1,403 @@
+"""
+Full-text search over commit messages, PR and issue titles, release notes
+and changelog items.
+
+The index lives in `changelog_data/search/` as a list of segments, one per
+update. Each segment holds its documents (`docs.json`), a term dictionary
+(`terms.json`, term -> [offset, count]) and its postings (`postings.npy`: one
+(document, position) row per token, grouped by term). An update only tokenizes
+data files not indexed before and writes their new items as a new segment.
+Items already indexed from an overlapping week are skipped by their key
+(`store.item_key`). Once there are more than MAX_SEGMENTS segments they are
+merged into one. Queries memory-map the postings and intersect them with
+NumPy, so a search over the whole archive takes milliseconds.
+
+    python scripts/search.py                            # index new data files
+    python scripts/search.py 'fhir "code json" repo:DSACMS/* kind:pulls since:2026-01-01'
+    python scripts/search.py --limit 50 'fhir'          # print up to 50 results
+
+Query syntax: bare words must all appear, "quoted phrases" must appear in
+order, and `repo:` (a name or `org/name`, `*` wildcards allowed), `org:`,
+`kind:` (commits, pulls, issues, releases, changelog), `since:` and `until:`
+(YYYY-MM-DD) filter the matches. Results are newest first.
+"""
+
+import fnmatch
+import json
+import os
+import re
+import shlex
+import sys
+import urllib.parse
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from columnar import url_hash
+    from data_io import iter_org_repos, list_files, load_data
+    from store import item_key
+except ImportError:
+    from scripts.columnar import url_hash
+    from scripts.data_io import iter_org_repos, list_files, load_data
+    from scripts.store import item_key
+
+
+INDEX_DIR = "changelog_data/search"
+DATA_DIR = "changelog_data/data"
+
+# Segments beyond this are merged into one on the next update
+MAX_SEGMENTS = 8
+# Positions are packed with the document number into one int64 for phrase matching
+POSITION_BITS = 20
+# Characters of a document's text kept for display
+SNIPPET_LENGTH = 200
+RESULT_LIMIT = 20
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+FILTERS = {"repo", "org", "kind", "since", "until"}
+KIND_ALIASES = {"commit": "commits", "pr": "pulls", "prs": "pulls", "pull": "pulls", "issue": "issues",
+                "release": "releases", "changelog": "changelog_entries"}
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _snippet(text: str) -> str:
+    first_line = text.strip().split("\n", 1)[0]
+    return first_line[:SNIPPET_LENGTH]
+
+
+def resolve_org(org: str, repo: Dict[str, Any]) -> str:
+    """
+    The repo's org. Files from before multi-org support have none, so it is
+    read from the repo URL (`https://github.com/<org>/<name>`).
+    """
+    if org != "unknown":
+        return org
+    parts = urllib.parse.urlparse(repo.get("url") or "").path.strip("/").split("/")
+    return parts[0] if len(parts) == 2 and parts[0] else org
+
+
+def repo_documents(org: str, repo: Dict[str, Any],
+                   period_start: Optional[str] = None) -> Iterable[Tuple[str, Dict[str, Any], str]]:
+    """Yield (key, document, full text) for every searchable item of a repo."""
+    repo_url = repo.get("url") or f"{org}/{repo.get('name')}"
+    repo_name = f"{org}/{repo.get('name', 'Unknown')}"
+
+    def document(kind, item, text, date):
+        return {"repo": repo_name, "kind": kind, "date": (date or period_start or "")[:10],
+                "url": item.get("url", ""), "text": _snippet(text)}
+
+    for commit in repo.get("commits") or []:
+        text = commit.get("message") or ""
+        yield item_key(repo_url, "commits", commit), document("commits", commit, text, commit.get("created_at")), text
+    for kind in ("pulls", "issues"):
+        for item in repo.get(kind) or []:
+            text = item.get("title") or ""
+            yield item_key(repo_url, kind, item), document(kind, item, text, item.get("created_at")), text
+    for release in repo.get("releases") or []:
+        text = "\n".join(part for part in (release.get("name") or release.get("tag_name"), release.get("body")) if part)
+        date = release.get("published_at") or release.get("created_at")
+        yield item_key(repo_url, "releases", release), document("releases", release, text, date), text
+    for entry in repo.get("changelog_entries") or []:
+        key = item_key(repo_url, "changelog_entries", entry)
+        for change in entry.get("changes", []):
+            for text in change.get("items", []):
+                doc = document("changelog_entries", {"url": repo.get("url", "")}, text, entry.get("date"))
+                doc["version"] = entry.get("version")
+                yield f"{key}:{change.get('category')}:{text}", doc, text
+
+
+class Segment:
+    """One immutable, memory-mapped piece of the index."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "docs.json"), "r") as f:
+            self.docs: List[Dict[str, Any]] = json.load(f)
+        with open(os.path.join(path, "terms.json"), "r") as f:
+            self.terms: Dict[str, List[int]] = json.load(f)
+        self.postings = np.load(os.path.join(path, "postings.npy"), mmap_mode="r")
+        self.keys = np.load(os.path.join(path, "keys.npy"), mmap_mode="r")
+
+    def term_postings(self, term: str) -> np.ndarray:
+        """(document, position) rows for a term, sorted by document then position."""
+        offset, count = self.terms.get(term, (0, 0))
+        return np.asarray(self.postings[offset:offset + count])
+
+    def term_docs(self, term: str) -> np.ndarray:
+        return np.unique(self.term_postings(term)[:, 0])
+
+    def phrase_docs(self, terms: List[str]) -> np.ndarray:
+        """Documents where `terms` appear next to each other, in order."""
+        matches = None
+        for offset, term in enumerate(terms):
+            rows = self.term_postings(term).astype(np.int64)
+            # Align every term to the phrase start, then intersect (document, start) pairs
+            starts = (rows[:, 0] << POSITION_BITS) + rows[:, 1] - offset
+            matches = starts if matches is None else np.intersect1d(matches, starts, assume_unique=True)
+            if not len(matches):
+                break
+        return np.unique(matches >> POSITION_BITS)
+
+
+def write_segment(path: str, documents: List[Tuple[str, Dict[str, Any], str]]):
+    """Tokenize documents and write them as a segment."""
+    by_term: Dict[str, List[Tuple[int, int]]] = {}
+    for doc_id, (_, _, text) in enumerate(documents):
+        for position, token in enumerate(tokenize(text)[:1 << POSITION_BITS]):
+            by_term.setdefault(token, []).append((doc_id, position))
+
+    terms = {}
+    chunks = []
+    offset = 0
+    for term in sorted(by_term):
+        rows = by_term[term]
+        terms[term] = [offset, len(rows)]
+        chunks.append(np.asarray(rows, dtype=np.int32).reshape(-1, 2))
+        offset += len(rows)
+
+    _write_segment_files(
+        path,
+        [doc for _, doc, _ in documents],
+        terms,
+        np.concatenate(chunks) if chunks else np.empty((0, 2), dtype=np.int32),
+        np.asarray([url_hash(key) for key, _, _ in documents], dtype=np.int64),
+    )
+
+
+def _write_segment_files(path: str, docs: List[Dict[str, Any]], terms: Dict[str, List[int]],
+                         postings: np.ndarray, keys: np.ndarray):
+    tmp_path = f"{path}.tmp"
+    os.makedirs(tmp_path, exist_ok=True)
+    with open(os.path.join(tmp_path, "docs.json"), "w") as f:
+        json.dump(docs, f)
+    with open(os.path.join(tmp_path, "terms.json"), "w") as f:
+        json.dump(terms, f)
+    np.save(os.path.join(tmp_path, "postings.npy"), postings)
+    np.save(os.path.join(tmp_path, "keys.npy"), keys)
+    os.replace(tmp_path, path)
+
+
+def merge_segments(path: str, segments: List[Segment]):
+    """Write the union of several segments as one, without re-tokenizing."""
+    docs: List[Dict[str, Any]] = []
+    bases = []
+    for segment in segments:
+        bases.append(len(docs))
+        docs.extend(segment.docs)
+
+    terms = {}
+    chunks = []
+    offset = 0
+    for term in sorted({term for segment in segments for term in segment.terms}):
+        parts = []
+        for base, segment in zip(bases, segments):
+            rows = segment.term_postings(term)
+            if len(rows):
+                parts.append(rows + np.asarray([base, 0], dtype=np.int32))
+        rows = np.concatenate(parts)
+        terms[term] = [offset, len(rows)]
+        chunks.append(rows)
+        offset += len(rows)
+
+    _write_segment_files(
+        path, docs, terms,
+        np.concatenate(chunks) if chunks else np.empty((0, 2), dtype=np.int32),
+        np.concatenate([np.asarray(segment.keys) for segment in segments]),
+    )
+
+
+class SearchIndex:
+    """The segments of a search index directory, oldest first."""
+
+    def __init__(self, path: str = INDEX_DIR):
+        self.path = path
+        meta_file = os.path.join(path, "meta.json")
+        if os.path.exists(meta_file):
+            with open(meta_file, "r") as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {"sources": [], "segments": [], "next_segment": 0}
+        self.segments = [Segment(os.path.join(path, name)) for name in self.meta["segments"]]
+
+    def __len__(self):
+        return sum(len(segment.docs) for segment in self.segments)
+
+    def save(self):
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.path, "meta.json"))
+
+    def _new_segment_name(self) -> str:
+        name = f"segment_{self.meta['next_segment']:06d}"
+        self.meta["next_segment"] += 1
+        return name
+
+    def update(self, data_files: List[str]) -> int:
+        """
+        Index the items of data files not indexed before as one new segment.
+        Returns the number of documents added.
+        """
+        new_sources = [f for f in data_files if os.path.basename(f) not in self.meta["sources"]]
+        if not new_sources:
+            return 0
+
+        seen = set()
+        for segment in self.segments:
+            seen.update(np.asarray(segment.keys).tolist())
+
+        documents = []
+        for data_file in new_sources:
+            data = load_data(data_file)
+            for org, repo in iter_org_repos(data):
+                period = data.get("period") or (data.get(org) or {}).get("period") or {}
+                for key, doc, text in repo_documents(resolve_org(org, repo), repo, period.get("start")):
+                    hashed = url_hash(key)
+                    if hashed in seen:
+                        continue
+                    seen.add(hashed)
+                    documents.append((key, doc, text))
+
+        os.makedirs(self.path, exist_ok=True)
+        if documents:
+            name = self._new_segment_name()
+            write_segment(os.path.join(self.path, name), documents)
+            self.meta["segments"].append(name)
+            self.segments.append(Segment(os.path.join(self.path, name)))
+        self.meta["sources"].extend(os.path.basename(f) for f in new_sources)
+
+        if len(self.segments) > MAX_SEGMENTS:
+            self.optimize()
+        self.save()
+        return len(documents)
+
+    def optimize(self):
+        """Merge every segment into one."""
+        if len(self.segments) < 2:
+            return
+        old_names = list(self.meta["segments"])
+        name = self._new_segment_name()
+        merge_segments(os.path.join(self.path, name), self.segments)
+        self.meta["segments"] = [name]
+        self.segments = [Segment(os.path.join(self.path, name))]
+        self.save()
+        for old_name in old_names:
+            old_path = os.path.join(self.path, old_name)
+            for file_name in os.listdir(old_path):
+                os.remove(os.path.join(old_path, file_name))
+            os.rmdir(old_path)
+
+    def search(self, query: str, limit: Optional[int] = RESULT_LIMIT) -> List[Dict[str, Any]]:
+        """Documents matching a query (see the module docstring), newest first."""
+        clauses, filters = parse_query(query)
+        results = []
+        for segment in self.segments:
+            matches = None
+            for terms in clauses:
+                docs = segment.term_docs(terms[0]) if len(terms) == 1 else segment.phrase_docs(terms)
+                matches = docs if matches is None else np.intersect1d(matches, docs, assume_unique=True)
+                if not len(matches):
+                    break
+            doc_ids = range(len(segment.docs)) if matches is None else matches.tolist()
+            results.extend(doc for doc in (segment.docs[i] for i in doc_ids) if _matches_filters(doc, filters))
+        results.sort(key=lambda doc: (doc["date"], doc["repo"], doc["url"]), reverse=True)
+        return results[:limit] if limit else results
+
+
+def parse_query(query: str) -> Tuple[List[List[str]], Dict[str, List[str]]]:
+    """
+    Split a query into term clauses (a phrase is one clause of several terms)
+    and filters: `'fix "code json" repo:x'` -> ([["fix"], ["code", "json"]], {"repo": ["x"]})
+    """
+    clauses = []
+    filters: Dict[str, List[str]] = {}
+    for part in shlex.split(query):
+        name, sep, value = part.partition(":")
+        if sep and name.lower() in FILTERS and value:
+            filters.setdefault(name.lower(), []).append(value)
+            continue
+        # A quoted phrase, or a word like code.json, is one clause of several terms
+        terms = tokenize(part)
+        if terms:
+            clauses.append(terms)
+    return clauses, filters
+
+
+def _matches_filters(doc: Dict[str, Any], filters: Dict[str, List[str]]) -> bool:
+    for pattern in filters.get("repo", []):
+        pattern = pattern.lower()
+        target = doc["repo"].lower() if "/" in pattern else doc["repo"].lower().split("/", 1)[-1]
+        if not fnmatch.fnmatchcase(target, pattern):
+            return False
+    for org in filters.get("org", []):
+        if doc["repo"].split("/", 1)[0].lower() != org.lower():
+            return False
+    kinds = [KIND_ALIASES.get(kind.lower(), kind.lower()) for kind in filters.get("kind", [])]
+    if kinds and doc["kind"] not in kinds:
+        return False
+    if any(doc["date"] < since for since in filters.get("since", [])):
+        return False
+    if any(doc["date"] > until for until in filters.get("until", [])):
+        return False
+    return True
+
+
+def update_index(index_dir: str = INDEX_DIR, data_files: Optional[List[str]] = None) -> int:
+    """Add any new weekly data files to the index. Returns the number of documents added."""
+    if data_files is None:
+        data_files = [
+            os.path.join(DATA_DIR, f) for f in list_files(DATA_DIR, "weekly_changelog_")
+            if f.endswith(".json")
+        ]
+    return SearchIndex(index_dir).update(data_files)
+
+
+def format_result(doc: Dict[str, Any]) -> str:
+    kind = "changelog" if doc["kind"] == "changelog_entries" else doc["kind"]
+    return f"{doc['date']}  {doc['repo']:<40} {kind:<9} {doc['text']}\n{'':12}{doc['url']}"
+
+
+USAGE = "Usage: python scripts/search.py [--limit N] [query]"
+
+
+def main(argv: Optional[List[str]] = None):
+    """Index new data files, or run a query when one is given."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    index_dir = os.getenv("SEARCH_INDEX_DIR", INDEX_DIR)
+
+    limit = RESULT_LIMIT
+    if argv[:1] == ["--limit"] and len(argv) > 1 and argv[1].isdigit():
+        limit = int(argv[1])
+        argv = argv[2:]
+        if not argv:
+            print(USAGE)
+            sys.exit(1)
+    # Queries have no options, so anything else that looks like one is a mistake
+    if any(arg.startswith("-") for arg in argv):
+        print(USAGE)
+        print("Query syntax: words, \"quoted phrases\", repo:, org:, kind:, since: and until: filters")
+        sys.exit(0 if argv[0] in ("-h", "--help") else 1)
+
+    if not argv:
+        added = update_index(index_dir)
+        index = SearchIndex(index_dir)
+        print(f"Added {added} documents to {index_dir}/ ({len(index)} documents, "
+              f"{len(index.meta['sources'])} source files, {len(index.segments)} segments)")
+        return added
+
+    results = SearchIndex(index_dir).search(" ".join(argv), limit=None)
+    for doc in results[:limit]:
+        print(format_result(doc))
+    if len(results) > limit:
+        print(f"...and {len(results) - limit} more")
+    print(f"{len(results)} matches")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+SQLite-backed activity store.
+
+Every issue, PR, commit and release is keyed by its URL, so the same item seen
+by overlapping runs is stored once. Weekly and historical JSON files can be
+exported from the store for any window without re-crawling GitHub.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+
+ITEM_KINDS = ["issues", "pulls", "commits", "releases", "changelog_entries", "contributors"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    url TEXT PRIMARY KEY,
+    org TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT,
+    archived INTEGER NOT NULL DEFAULT 0,
+    topics TEXT,
+    last_seen TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_repos_org ON repos (org);
+
+CREATE TABLE IF NOT EXISTS items (
+    key TEXT PRIMARY KEY,
+    repo_url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    start_day TEXT NOT NULL,
+    end_day TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_items_repo_kind ON items (repo_url, kind);
+CREATE INDEX IF NOT EXISTS idx_items_window ON items (end_day, start_day);
+
+CREATE TABLE IF NOT EXISTS runs (
+    org TEXT NOT NULL,
+    start TEXT,
+    end TEXT,
+    generated_at TEXT,
+    total_repo_count INTEGER,
+    PRIMARY KEY (org, start, end)
+);
+"""
+
+
+def item_key(repo_url: str, kind: str, item: Dict[str, Any]) -> str:
+    """Return the deduplication key for an item."""
+    if item.get("url"):
+        return item["url"]
+    if kind == "contributors":
+        return f"{repo_url}#contributor:{item.get('name')}"
+    if kind == "changelog_entries":
+        return f"{repo_url}#changelog:{item.get('version')}:{item.get('date')}"
+    return f"{repo_url}#{kind}:{json.dumps(item, sort_keys=True)}"
+
+
+def item_span(kind: str, item: Dict[str, Any], observed_start: Optional[str] = None) -> tuple:
+    """
+    Return the (start_day, end_day) interval during which an item was active.
+
+    Issues are listed with `since=start`, so an issue seen by a run was updated
+    no earlier than that run's start even if it was created long before.
+    """
+    if kind == "releases":
+        stamps = [item.get("published_at"), item.get("created_at")]
+    elif kind == "changelog_entries":
+        stamps = [item.get("date")]
+    else:
+        stamps = [item.get("created_at"), item.get("updated_at"), item.get("merged_at")]
+
+    days = [s[:10] for s in stamps if s]
+    if kind == "issues" and observed_start:
+        days.append(observed_start)
+    if not days:
+        days = [observed_start or datetime.now(timezone.utc).strftime("%Y-%m-%d")]
+
+    start_day = days[0] if kind != "releases" else min(days)
+    return start_day, max(days)
+
+
+class ActivityStore:
+    """Deduplicating store for repos and their activity, keyed by URL."""
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def commit(self):
+        self.conn.commit()
+
+    def upsert_repo(self, org: str, repo_data: Dict[str, Any], observed_start: Optional[str] = None):
+        """Insert or update a repo and every item it carries."""
+        repo_url = repo_data["url"]
+        topics = repo_data.get("topics")
+        self.conn.execute(
+            """
+            INSERT INTO repos (url, org, name, description, archived, topics, last_seen)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (url) DO UPDATE SET
+                org = excluded.org,
+                name = excluded.name,
+                description = excluded.description,
+                archived = excluded.archived,
+                topics = COALESCE(excluded.topics, repos.topics),
+                last_seen = MAX(COALESCE(repos.last_seen, ''), COALESCE(excluded.last_seen, ''))
+            """,
+            (
+                repo_url,
+                org,
+                repo_data.get("name"),
+                repo_data.get("description"),
+                int(bool(repo_data.get("archived"))),
+                json.dumps(topics) if topics is not None else None,
+                observed_start,
+            ),
+        )
+
+        rows = []
+        for kind in ITEM_KINDS:
+            for item in repo_data.get(kind) or []:
+                start_day, end_day = item_span(kind, item, observed_start)
+                rows.append((
+                    item_key(repo_url, kind, item),
+                    repo_url,
+                    kind,
+                    start_day,
+                    end_day,
+                    json.dumps(item),
+                ))
+
+        self.conn.executemany(
+            """
+            INSERT INTO items (key, repo_url, kind, start_day, end_day, payload)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                start_day = MIN(items.start_day, excluded.start_day),
+                end_day = MAX(items.end_day, excluded.end_day),
+                payload = excluded.payload
+            """,
+            rows,
+        )
+
+    def record_run(self, org: str, data: Dict[str, Any]):
+        """Record the period and repo count of a completed fetch."""
+        period = data.get("period") or {}
+        self.conn.execute(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?)",
+            (
+                org,
+                period.get("start"),
+                period.get("end"),
+                data.get("generated_at"),
+                data.get("total_repo_count"),
+            ),
+        )
+        self.conn.commit()
+
+    def export_window(self, org: str, start: str, end: str,
+                      include_inactive: bool = False) -> Dict[str, Any]:
+        """
+        Export a single-org data dict, in the same shape `ChangelogGenerator.get_data`
+        returns, for every item active between `start` and `end` (inclusive days).
+        """
+        repos = {}
+        for url, name, description, archived, topics in self.conn.execute(
+            "SELECT url, name, description, archived, topics FROM repos WHERE org = ? ORDER BY name",
+            (org,),
+        ):
+            repo_data = {
+                "name": name,
+                "url": url,
+                "description": description,
+                "archived": bool(archived),
+            }
+            if topics is not None:
+                repo_data["topics"] = json.loads(topics)
+            for kind in ITEM_KINDS:
+                repo_data[kind] = []
+            repos[url] = repo_data
+
+        rows = self.conn.execute(
+            """
+            SELECT items.repo_url, items.kind, items.payload
+            FROM items JOIN repos ON repos.url = items.repo_url
+            WHERE repos.org = ? AND items.end_day >= ? AND items.start_day <= ?
+            ORDER BY items.start_day DESC, items.key
+            """,
+            (org, start, end),
+        )
+        for repo_url, kind, payload in rows:
+            repos[repo_url][kind].append(json.loads(payload))
+
+        total = self.conn.execute(
+            "SELECT COUNT(*) FROM repos WHERE org = ?", (org,)
+        ).fetchone()[0]
+
+        return {
+            "repos": [
+                r for r in repos.values()
+                if include_inactive or r["archived"] or any(r[kind] for kind in ITEM_KINDS)
+            ],
+            "period": {"start": start, "end": end},
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "total_repo_count": total,
+        }
+
+    def orgs(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT org FROM repos ORDER BY org")]
+
+
+def main():
+    """Export a window from the activity store to a JSON data file."""
+    if len(sys.argv) < 4:
+        print("Usage: python scripts/store.py <db_path> <start_date> <end_date> [output_file]")
+        sys.exit(1)
+
+    db_path, start_date, end_date = sys.argv[1:4]
+    output_file = sys.argv[4] if len(sys.argv) > 4 else os.path.join(
+        "changelog_data/data", f"weekly_changelog_{start_date}_to_{end_date}.json"
+    )
+
+    with ActivityStore(db_path) as store:
+        combined_data = {org: store.export_window(org, start_date, end_date) for org in store.orgs()}
+
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    with open(output_file, "w") as f:
+        json.dump(combined_data, f, indent=2)
+
+    print(f"Exported {len(combined_data)} org(s) from {db_path} to {output_file}")
+
+
+if __name__ == "__main__":
+    main()
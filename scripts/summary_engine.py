@@ -0,0 +1,478 @@
+"""
+Single-pass summary engine.
+
+Loads and normalizes a weekly data file once, then walks every repo a single
+time to build both the full summary (`generate_summary`) and the categorized
+condensed summary (`generate_summary_condensed`). `generate_all` adds the
+week's trends and PR/issue flow metrics from the columnar archive (see
+`trends.py` and `flow.py`) and the delta against the previous week (see
+`delta.py`), and renders the mailto, Slack and PR outputs from those two
+summaries.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+try:
+    from artifact_index import latest_file, record_artifacts, summary_headline
+    from classify import ActivityClassifier, categorize_repo, empty_categories
+    from delta import load_delta
+    from data_io import iter_org_repos, load_data
+    from dedup import collapse_duplicates
+    from flow import load_flow
+    from json_stream import ChangelogStream
+    from render import blob_url
+    from trends import load_trends
+except ImportError:
+    from scripts.artifact_index import latest_file, record_artifacts, summary_headline
+    from scripts.classify import ActivityClassifier, categorize_repo, empty_categories
+    from scripts.delta import load_delta
+    from scripts.data_io import iter_org_repos, load_data
+    from scripts.dedup import collapse_duplicates
+    from scripts.flow import load_flow
+    from scripts.json_stream import ChangelogStream
+    from scripts.render import blob_url
+    from scripts.trends import load_trends
+
+
+DATA_DIR = "changelog_data/data"
+OUTPUT_DIR = "changelog_data/summaries"
+
+
+def normalize_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize changelog data into a single top-level structure with a flat
+    `repos` list, regardless of whether the source file is single-org
+    (legacy: {"repos": [...]}) or multi-org ({"DSACMS": {"repos": [...]}, ...}).
+
+    Each repo in the returned `repos` list is a shallow copy tagged with its
+    `org`; the input is not modified.
+    """
+    metadata = data_metadata(data)
+    return {
+        "repos": [dict(repo, org=org) for org, repo in iter_org_repos(data)],
+        "period": metadata["period"],
+        "generated_at": metadata["generated_at"],
+        "total_repo_count": metadata["total_repo_count"],
+    }
+
+
+def data_metadata(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return period, generated_at and total_repo_count for single- or multi-org data."""
+    if "repos" in data:
+        return {
+            "period": data.get("period", {}),
+            "generated_at": data.get("generated_at"),
+            "total_repo_count": data.get("total_repo_count", len(data["repos"])),
+        }
+
+    metadata = {"period": {}, "generated_at": None, "total_repo_count": 0}
+    repo_count = 0
+    for org_data in data.values():
+        if not isinstance(org_data, dict) or "repos" not in org_data:
+            continue
+
+        if not metadata["period"] and org_data.get("period"):
+            metadata["period"] = org_data["period"]
+        if metadata["generated_at"] is None and org_data.get("generated_at"):
+            metadata["generated_at"] = org_data["generated_at"]
+
+        metadata["total_repo_count"] += org_data.get("total_repo_count", len(org_data["repos"]))
+        repo_count += len(org_data["repos"])
+
+    if not repo_count:
+        raise ValueError("Invalid data structure: no repos found in any org")
+
+    return metadata
+
+
+def _is_active(repo_data: Dict[str, Any]) -> bool:
+    return bool(repo_data.get("issues") or repo_data.get("pulls") or
+                repo_data.get("commits") or repo_data.get("changelog_entries"))
+
+
+class SummaryEngine:
+    """
+    Accumulates the full and condensed summaries one repo at a time.
+
+    Feed repos with `add_repo`, then call `set_metadata` (before or after the
+    repos) and read `full_summary()` / `condensed_summary()`.
+    """
+
+    def __init__(self, full: bool = True, condensed: bool = True):
+        self.full = full
+        self.condensed = condensed
+        self.metadata = {"period": {}, "generated_at": None, "total_repo_count": None}
+        self.repo_count = 0
+
+        # Counted once and shared by both summaries
+        self.totals = {"issues": 0, "pulls": 0, "commits": 0, "changelog_entries": 0}
+        self.active_repos = 0
+
+        # Full summary state
+        self.repo_summaries: List[Dict[str, Any]] = []
+        self.key_changes: List[str] = []
+        self.key_change_records: List[Dict[str, str]] = []
+
+        # Condensed summary state
+        self.categorized = empty_categories()
+        self.activity = ActivityClassifier()
+        self.active_repos_list: List[Dict[str, Any]] = []
+
+    def set_metadata(self, period: Optional[Dict[str, str]] = None, generated_at: Optional[str] = None,
+                     total_repo_count: Optional[int] = None):
+        self.metadata = {
+            "period": period or {},
+            "generated_at": generated_at,
+            "total_repo_count": total_repo_count,
+        }
+
+    def add_repo(self, org: str, repo_data: Dict[str, Any]):
+        self.repo_count += 1
+        active = _is_active(repo_data)
+        for key in self.totals:
+            self.totals[key] += len(repo_data.get(key, []))
+        if active:
+            self.active_repos += 1
+
+        if self.condensed:
+            if active:
+                self.active_repos_list.append({
+                    "name": repo_data.get("name"),
+                    "url": repo_data.get("url"),
+                    "org": org or "unknown",
+                    "commits": len(repo_data.get("commits", [])),
+                    "pulls": len(repo_data.get("pulls", [])),
+                    "issues": len(repo_data.get("issues", []))
+                })
+            categorize_repo(repo_data, self.categorized)
+            self.activity.add_repo(repo_data)
+
+        if self.full:
+            try:
+                self._add_full(org, repo_data)
+            except Exception as e:
+                print(f"Error processing repo {repo_data.get('name', 'Unknown')}: {e}")
+
+    def merge(self, other: "SummaryEngine"):
+        """
+        Add the repos another engine has accumulated, as if they had been
+        added here. Summarizing a repo once and merging it into several
+        engines gives each the same result as adding the repo to each.
+        """
+        self.repo_count += other.repo_count
+        for key in self.totals:
+            self.totals[key] += other.totals[key]
+        self.active_repos += other.active_repos
+
+        self.repo_summaries.extend(other.repo_summaries)
+        self.key_changes.extend(other.key_changes)
+        self.key_change_records.extend(other.key_change_records)
+
+        for bucket, changes in other.categorized.items():
+            self.categorized[bucket].extend(changes)
+        self.activity.merge(other.activity)
+        self.active_repos_list.extend(other.active_repos_list)
+
+    def _add_full(self, org: str, repo_data: Dict[str, Any]):
+        repo_name = repo_data.get("name", "Unknown")
+
+        repo_summary = {
+            "name": repo_name,
+            "org": org or "unknown",
+            "url": repo_data["url"],
+            "issues": len(repo_data["issues"]),
+            "pulls": len(repo_data["pulls"]),
+            "commits": len(repo_data["commits"]),
+            "changelog_entries": len(repo_data.get("changelog_entries", [])),
+            "highlights": []
+        }
+
+        for entry in repo_data.get("changelog_entries", []):
+            for change in entry.get("changes", []):
+                category = change.get("category", "")
+                items = change.get("items", [])
+
+                if category.lower().startswith(('add', 'new')):
+                    for item in items[:2]:
+                        repo_summary["highlights"].append(f"Added: {item}")
+                        self._add_key_change(org, repo_name, "Added", item)
+
+                elif category.lower().startswith(('fix', 'bug')):
+                    for item in items[:2]:
+                        repo_summary["highlights"].append(f"Fixed: {item}")
+                        self._add_key_change(org, repo_name, "Fixed", item)
+
+                elif category.lower().startswith(('chang')):
+                    for item in items[:1]:
+                        repo_summary["highlights"].append(f"Changed: {item}")
+                        self._add_key_change(org, repo_name, "Changed", item)
+
+        # Merged-in-period counts need the period, which may only be known
+        # after all repos are read, so the highlight is finished later
+        merged_dates = [
+            pr["merged_at"][:10] for pr in repo_data.get("pulls", [])
+            if pr.get("merged") and pr.get("merged_at")
+        ]
+        new_issues = sum(1 for issue in repo_data["issues"] if issue.get("is_new"))
+
+        self.repo_summaries.append((repo_summary, merged_dates, new_issues))
+
+    def _add_key_change(self, org: str, repo_name: str, kind: str, item: str):
+        self.key_changes.append(f"{repo_name}: {kind} {item}")
+        self.key_change_records.append({"org": org or "unknown", "repo": repo_name, "kind": kind, "text": item})
+
+    def _total_repos(self) -> int:
+        total = self.metadata.get("total_repo_count")
+        return self.repo_count if total is None else total
+
+    def full_summary(self) -> Dict[str, Any]:
+        period = self.metadata.get("period") or {}
+        period_start = period.get("start", "")
+        period_end = period.get("end", "")
+
+        repos_with_activity = []
+        for repo_summary, merged_dates, new_issues in self.repo_summaries:
+            repo_summary = dict(repo_summary, highlights=list(repo_summary["highlights"]))
+            merged = sum(1 for d in merged_dates if period_start <= d <= period_end)
+            if merged:
+                repo_summary["highlights"].append(f"{merged} PR(s) merged")
+            if new_issues:
+                repo_summary["highlights"].append(f"{new_issues} new issue(s)")
+            repos_with_activity.append(repo_summary)
+
+        return {
+            "period": period,
+            "generated_at": self.metadata.get("generated_at"),
+            "total_repos": self._total_repos(),
+            "active_repos": self.active_repos,
+            "total_issues": self.totals["issues"],
+            "total_pulls": self.totals["pulls"],
+            "total_commits": self.totals["commits"],
+            "total_changelog_entries": self.totals["changelog_entries"],
+            "repos_with_activity": repos_with_activity,
+            "key_changes": list(self.key_changes),
+            "key_change_records": list(self.key_change_records)
+        }
+
+    def condensed_summary(self) -> Dict[str, Any]:
+        summary = {
+            "period": self.metadata.get("period") or {},
+            "generated_at": self.metadata.get("generated_at"),
+            "total_repos": self._total_repos(),
+            "active_repos": self.active_repos,
+            "total_commits": self.totals["commits"],
+            "total_pulls": self.totals["pulls"],
+            "total_issues": self.totals["issues"],
+            "total_changelog_entries": self.totals["changelog_entries"],
+        }
+
+        # The same change from a changelog and a PR title, or from many repos, is listed once
+        categorized, suppressed = collapse_duplicates(self.categorized)
+        summary["categorized_changes"] = categorized
+
+        summary["change_counts"] = {
+            category: len(changes)
+            for category, changes in categorized.items()
+            if changes
+        }
+        summary["duplicates_suppressed"] = suppressed
+
+        summary["active_repos_list"] = self.active_repos_list
+
+        # Every PR title and commit subject, not just changelogs and the first merged PRs
+        summary["activity_types"] = self.activity.summary()
+
+        return summary
+
+
+def summarize(data: Dict[str, Any], full: bool = True, condensed: bool = True) -> SummaryEngine:
+    """Run the engine over already-loaded data."""
+    engine = SummaryEngine(full=full, condensed=condensed)
+    engine.set_metadata(**data_metadata(data))
+    for org, repo_data in iter_org_repos(data):
+        engine.add_repo(org, repo_data)
+    return engine
+
+
+def summarize_stream(data_file: str, full: bool = True, condensed: bool = True) -> SummaryEngine:
+    """
+    Run the engine over a data file read one repo at a time, so only the
+    repo being summarized is held in memory alongside the accumulators.
+    """
+    engine = SummaryEngine(full=full, condensed=condensed)
+    stream = ChangelogStream(data_file)
+    for org, repo_data in stream:
+        engine.add_repo(org, repo_data)
+    engine.set_metadata(**data_metadata(stream.skeleton))
+    return engine
+
+
+def summarize_file(data_file: str, full: bool = True, condensed: bool = True,
+                   stream: Optional[bool] = None) -> SummaryEngine:
+    """
+    Read a data file once and run the engine over it. The file is streamed
+    unless `stream` is False (default: on, unless SUMMARY_STREAM=0).
+    """
+    if stream is None:
+        stream = os.getenv("SUMMARY_STREAM", "1") != "0"
+
+    try:
+        if stream:
+            return summarize_stream(data_file, full=full, condensed=condensed)
+        data = load_data(data_file)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error reading data file {data_file}: {e}")
+        raise
+
+    return summarize(data, full=full, condensed=condensed)
+
+
+def add_trends(summary: Dict[str, Any], archive_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Add trends and flow metrics for the summary's week from the columnar archive, when there is one."""
+    end = (summary.get("period") or {}).get("end")
+    trends = load_trends(end, archive_dir) if end else None
+    if trends:
+        summary["trends"] = trends
+        summary["flow"] = load_flow(end, archive_dir)
+    return summary
+
+
+def add_week_delta(summary: Dict[str, Any], data_file: str,
+                   data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Add the delta against the previous week's data file, when there is one."""
+    delta = load_delta(data_file, data)
+    if delta:
+        summary["week_delta"] = delta
+    return summary
+
+
+def render_outputs(summary: Dict[str, Any], condensed: Dict[str, Any],
+                   links: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Render every output format, keyed by output file prefix. `links` maps
+    "pr_appendix" / "pr_appendix_condensed" to where each PR body should
+    link to its appendix.
+    """
+    # Imported here because both modules import this one for their wrappers
+    try:
+        from generate_summary import create_mailto_link, create_pr_appendix, create_pr_content, create_slack_message
+        from generate_summary_condensed import create_condensed_appendix, create_condensed_pr_content
+    except ImportError:
+        from scripts.generate_summary import create_mailto_link, create_pr_appendix, create_pr_content, create_slack_message
+        from scripts.generate_summary_condensed import create_condensed_appendix, create_condensed_pr_content
+
+    links = links or {}
+    pr_title, pr_body = create_pr_content(summary, links.get("pr_appendix"))
+    condensed_title, condensed_body = create_condensed_pr_content(condensed, links.get("pr_appendix_condensed"))
+
+    return {
+        "mailto": create_mailto_link(summary),
+        "slack": create_slack_message(summary),
+        "pr_title": pr_title,
+        "pr_body": pr_body,
+        "pr_title_condensed": condensed_title,
+        "pr_body_condensed": condensed_body,
+        "pr_appendix": create_pr_appendix(summary),
+        "pr_appendix_condensed": create_condensed_appendix(condensed),
+    }
+
+
+def output_paths(output_dir: str = OUTPUT_DIR, now: Optional[datetime] = None) -> Dict[str, str]:
+    """Return {output kind: path} for the files `generate_all` writes on a given day."""
+    now = now or datetime.now(timezone.utc)
+    short_stamp = now.strftime("%y-%m-%d")
+    long_stamp = now.strftime("%Y-%m-%d")
+
+    names = {
+        "summary": f"summary_{short_stamp}.json",
+        "mailto": f"mailto_{short_stamp}.txt",
+        "slack": f"slack_{short_stamp}.txt",
+        "pr_title": f"pr_title_{short_stamp}.txt",
+        "pr_body": f"pr_body_{short_stamp}.md",
+        "pr_appendix": f"pr_appendix_{short_stamp}.md",
+        "summary_condensed": f"summary_condensed_{long_stamp}.json",
+        "pr_title_condensed": f"pr_title_condensed_{long_stamp}.txt",
+        "pr_body_condensed": f"pr_body_condensed_{long_stamp}.md",
+        "pr_appendix_condensed": f"pr_appendix_condensed_{long_stamp}.md",
+    }
+    return {kind: os.path.join(output_dir, name) for kind, name in names.items()}
+
+
+def pr_branch(now: Optional[datetime] = None, condensed: bool = False) -> str:
+    """Branch the workflow commits a day's summaries to before opening its PR."""
+    now = now or datetime.now(timezone.utc)
+    prefix = "weekly-changelog-condensed" if condensed else "weekly-changelog"
+    return f"{prefix}-{now.strftime('%Y-%m-%d')}"
+
+
+def generate_all(data_file: str, output_dir: str = OUTPUT_DIR,
+                 data: Optional[Dict[str, Any]] = None, now: Optional[datetime] = None) -> Dict[str, str]:
+    """
+    Build and write every summary output for one data file. File names match
+    what `generate_summary.main` and `generate_summary_condensed.main` write.
+    Pass `data` when the file's contents are already in memory to skip
+    reading it back, and `now` to date the outputs (and PR branch links) as
+    of another day. Returns {output kind: path}.
+    """
+    engine = summarize(data) if data is not None else summarize_file(data_file)
+    summary = add_week_delta(add_trends(engine.full_summary()), data_file, data)
+    condensed = engine.condensed_summary()
+    if "week_delta" in summary:
+        condensed["week_delta"] = summary["week_delta"]
+
+    now = now or datetime.now(timezone.utc)
+    paths = output_paths(output_dir, now)
+    links = {
+        "pr_appendix": blob_url(paths["pr_appendix"], pr_branch(now)),
+        "pr_appendix_condensed": blob_url(paths["pr_appendix_condensed"], pr_branch(now, condensed=True)),
+    }
+    rendered = render_outputs(summary, condensed, links)
+
+    contents = {
+        "summary": json.dumps(summary, indent=2),
+        "summary_condensed": json.dumps(condensed, indent=2),
+    }
+    contents.update(rendered)
+
+    os.makedirs(output_dir, exist_ok=True)
+    for kind, path in paths.items():
+        with open(path, 'w') as f:
+            f.write(contents[kind])
+
+    condensed_kinds = [kind for kind in paths if kind.endswith("_condensed")]
+    for source, kinds in ((summary, [kind for kind in paths if kind not in condensed_kinds]),
+                          (condensed, condensed_kinds)):
+        record_artifacts([paths[kind] for kind in kinds], source["period"], source["generated_at"],
+                         summary_headline(source))
+
+    return paths
+
+
+def main():
+    """Generate the full and condensed summaries from the latest data file in one pass."""
+    if not os.path.exists(DATA_DIR):
+        print("Data directory not found. Run the weekly changelog generator first.")
+        return
+
+    data_file = latest_file(DATA_DIR, "weekly_changelog")
+    if not data_file:
+        print("No weekly changelog files found.")
+        return
+
+    print(f"Generating full and condensed summaries from {os.path.basename(data_file)}")
+
+    paths = generate_all(data_file)
+
+    print(f"Summaries generated successfully!")
+    print(f"Files saved to {OUTPUT_DIR}/")
+    for kind, path in paths.items():
+        print(f"  {kind}: {path}")
+
+    return paths
+
+
+if __name__ == "__main__":
+    main()
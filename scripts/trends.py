@@ -0,0 +1,258 @@
+"""
+Trends and anomalies over the weekly history.
+
+Activity from the columnar archive (see `columnar.py`) is counted into one
+repos x weeks x metrics NumPy array with a single `bincount`. The weeks are
+aligned to the report period, so the last week is the seven days ending on
+the period's end date. Moving averages, week-over-week deltas and rolling
+z-scores are computed for every repo and week at once from cumulative sums.
+Repos that "went quiet" were active most weeks before but have had no activity
+in recent weeks. `weekly_trends` reduces all of this to a small dict for the
+latest week, which the PR body renders as its trends section.
+
+    python scripts/trends.py [end_date]
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from columnar import ARCHIVE_DIR, KIND_IDS, STATE_IDS, WEEK_SECONDS, ColumnarArchive, parse_timestamps
+except ImportError:
+    from scripts.columnar import ARCHIVE_DIR, KIND_IDS, STATE_IDS, WEEK_SECONDS, ColumnarArchive, parse_timestamps
+
+
+METRICS = ["commits", "pulls", "merged", "issues", "releases", "contributors"]
+METRIC_IDS = {metric: i for i, metric in enumerate(METRICS)}
+# Archive kind counted by each metric; "merged" counts pulls by their merge time
+METRIC_KINDS = {"commits": "commits", "pulls": "pulls", "issues": "issues",
+                "releases": "releases", "contributors": "contributors"}
+METRIC_LABELS = {"commits": "Commits", "pulls": "Pull requests opened", "merged": "Pull requests merged",
+                 "issues": "Issues opened", "releases": "Releases", "contributors": "New contributors"}
+
+MOVING_WEEKS = 4
+# Weeks before the current one that a z-score is measured against
+BASELINE_WEEKS = 12
+ANOMALY_Z = 3.0
+# Standard deviations below this are raised to it, so a repo going from zero
+# to one commit is not an anomaly
+MIN_STD = 1.0
+# A repo went quiet when it has had no activity for QUIET_WEEKS weeks after
+# being active in at least QUIET_MIN_ACTIVE of the BASELINE_WEEKS before
+QUIET_WEEKS = 2
+QUIET_MIN_ACTIVE = 6
+# Anomalies and quiet repos kept in the report
+TOP_TRENDS = 10
+
+DAY_SECONDS = 24 * 3600
+
+
+def repo_rows(repo_names: List[str]) -> Tuple[List[str], np.ndarray]:
+    """
+    Cube rows for archive repos. Files from before multi-org support archive
+    repos as `unknown/<name>`; those share the row of the one org repo with
+    the same name, if there is exactly one.
+
+    Returns (row names, row index of each archive repo).
+    """
+    orgs_by_name: Dict[str, List[str]] = {}
+    for repo_name in repo_names:
+        org, _, name = repo_name.partition("/")
+        if org != "unknown":
+            orgs_by_name.setdefault(name, []).append(repo_name)
+
+    names: List[str] = []
+    row_of: Dict[str, int] = {}
+    rows = []
+    for repo_name in repo_names:
+        org, _, name = repo_name.partition("/")
+        if org == "unknown" and len(orgs_by_name.get(name, [])) == 1:
+            repo_name = orgs_by_name[name][0]
+        if repo_name not in row_of:
+            row_of[repo_name] = len(names)
+            names.append(repo_name)
+        rows.append(row_of[repo_name])
+    return names, np.asarray(rows, dtype=np.int64)
+
+
+def activity_cube(archive: ColumnarArchive, end: str,
+                  weeks: Optional[int] = None) -> Tuple[List[str], List[str], np.ndarray]:
+    """
+    Count every metric per repo per week, for the `weeks` weeks ending on
+    `end` (all history when None).
+
+    Returns (repo_names, week_starts, cube) where `cube` has shape
+    (len(repo_names), len(week_starts), len(METRICS)).
+    """
+    kind = np.asarray(archive["kind"])
+    metric = np.full(len(kind), -1, dtype=np.int64)
+    for name, kind_name in METRIC_KINDS.items():
+        metric[kind == KIND_IDS[kind_name]] = METRIC_IDS[name]
+
+    ts_end = np.asarray(archive["ts_end"])
+    merged = (kind == KIND_IDS["pulls"]) & (np.asarray(archive["state"]) == STATE_IDS["merged"]) & (ts_end >= 0)
+
+    repo = np.asarray(archive["repo"])
+    ts = np.concatenate([np.asarray(archive["ts"]), ts_end[merged]])
+    repo = np.concatenate([repo, repo[merged]])
+    metric = np.concatenate([metric, np.full(int(merged.sum()), METRIC_IDS["merged"], dtype=np.int64)])
+
+    # Weeks back from the end of the period: 0 is the last seven days
+    end_ts = parse_timestamps([end])[0] + DAY_SECONDS
+    back = (end_ts - 1 - ts) // WEEK_SECONDS
+    valid = (metric >= 0) & (ts >= 0) & (back >= 0)
+    if weeks is not None:
+        valid &= back < weeks
+
+    names, dense = repo_rows(archive.repo_names())
+    n_weeks = weeks if weeks is not None else int(back[valid].max() + 1) if valid.any() else 0
+    n_metrics = len(METRICS)
+
+    lookup = np.full(len(archive.strings), -1, dtype=np.int64)
+    lookup[np.asarray(archive.meta["repo_ids"], dtype=np.int64)] = dense
+    rows = lookup[repo[valid]]
+    columns = n_weeks - 1 - back[valid]
+
+    cube = np.bincount(
+        (rows * n_weeks + columns) * n_metrics + metric[valid],
+        minlength=len(names) * n_weeks * n_metrics,
+    ).reshape(len(names), n_weeks, n_metrics)
+
+    week_starts = [
+        str(np.datetime64(int(end_ts - (n_weeks - w) * WEEK_SECONDS), "s").astype("datetime64[D]"))
+        for w in range(n_weeks)
+    ]
+    return names, week_starts, cube
+
+
+def _window_sums(cube: np.ndarray, window: int) -> np.ndarray:
+    """Sum of the `window` weeks before each week (excluding it), along axis 1."""
+    cumulative = np.zeros((cube.shape[0], cube.shape[1] + 1) + cube.shape[2:], dtype=np.float64)
+    np.cumsum(cube, axis=1, out=cumulative[:, 1:])
+    sums = cumulative[:, :-1]
+    if window < cube.shape[1]:
+        sums[:, window:] -= cumulative[:, :cube.shape[1] - window].copy()
+    return sums
+
+
+def moving_average(cube: np.ndarray, window: int = MOVING_WEEKS) -> np.ndarray:
+    """Mean of each week and the `window - 1` weeks before it (fewer at the start of the history)."""
+    sums = _window_sums(cube, window - 1) + cube
+    counts = np.minimum(np.arange(cube.shape[1]) + 1, window)
+    return sums / counts.reshape((1, -1) + (1,) * (cube.ndim - 2))
+
+
+def week_over_week(cube: np.ndarray) -> np.ndarray:
+    """Change from the week before; the first week is compared to zero."""
+    return np.diff(cube.astype(np.int64), axis=1, prepend=0)
+
+
+def zscores(cube: np.ndarray, baseline: int = BASELINE_WEEKS, min_std: float = MIN_STD) -> np.ndarray:
+    """
+    z-score of each week against the mean and standard deviation of the
+    `baseline` weeks before it. Weeks without a full baseline are NaN.
+    """
+    values = cube.astype(np.float64)
+    mean = _window_sums(values, baseline) / baseline
+    variance = _window_sums(values * values, baseline) / baseline - mean * mean
+    std = np.maximum(np.sqrt(np.maximum(variance, 0.0)), min_std)
+
+    scores = (values - mean) / std
+    scores[:, :baseline] = np.nan
+    return scores
+
+
+def went_quiet(cube: np.ndarray, quiet_weeks: int = QUIET_WEEKS, baseline: int = BASELINE_WEEKS,
+               min_active: int = QUIET_MIN_ACTIVE) -> np.ndarray:
+    """
+    Repos with no activity in the last `quiet_weeks` weeks that were active in
+    at least `min_active` of the `baseline` weeks before them.
+    """
+    active = cube.sum(axis=2) > 0
+    recent = active[:, active.shape[1] - quiet_weeks:]
+    before = active[:, max(active.shape[1] - quiet_weeks - baseline, 0):active.shape[1] - quiet_weeks]
+    return ~recent.any(axis=1) & (before.sum(axis=1) >= min_active)
+
+
+def weekly_trends(archive: ColumnarArchive, end: str, weeks: int = BASELINE_WEEKS + QUIET_WEEKS + 1,
+                  top: int = TOP_TRENDS) -> Dict[str, Any]:
+    """Trends for the week ending on `end`: totals, anomalies and repos that went quiet."""
+    weeks = max(weeks, BASELINE_WEEKS + 1, QUIET_WEEKS + 1)
+    repos, week_starts, cube = activity_cube(archive, end, weeks)
+
+    totals = cube.sum(axis=0, keepdims=True)
+    average = moving_average(totals)[0, -1]
+    delta = week_over_week(totals)[0, -1]
+    summary = {
+        metric: {
+            "this_week": int(totals[0, -1, i]),
+            "last_week": int(totals[0, -2, i]),
+            "delta": int(delta[i]),
+            "moving_average": round(float(average[i]), 1),
+        }
+        for i, metric in enumerate(METRICS)
+    }
+
+    scores = zscores(cube)[:, -1]
+    baseline_mean = _window_sums(cube, BASELINE_WEEKS)[:, -1] / BASELINE_WEEKS
+    rows, metrics = np.nonzero(np.abs(np.nan_to_num(scores)) >= ANOMALY_Z)
+    order = np.argsort(-np.abs(scores[rows, metrics]), kind="stable")
+    anomalies = [
+        {
+            "repo": repos[r],
+            "metric": METRICS[m],
+            "count": int(cube[r, -1, m]),
+            "baseline": round(float(baseline_mean[r, m]), 1),
+            "z": round(float(scores[r, m]), 1),
+        }
+        for r, m in zip(rows[order], metrics[order])
+    ]
+
+    quiet_rows = np.nonzero(went_quiet(cube))[0]
+    active = cube.sum(axis=2) > 0
+    # Index of the last active week, counted from the start of the cube
+    last_active = active.shape[1] - 1 - np.argmax(active[:, ::-1], axis=1)
+    quiet = sorted(
+        ({"repo": repos[r], "last_active_week": week_starts[last_active[r]],
+          "active_weeks": int(active[r].sum())} for r in quiet_rows),
+        key=lambda entry: (-entry["active_weeks"], entry["repo"]),
+    )
+
+    return {
+        "period": {"start": week_starts[-1], "end": end},
+        "weeks": len(week_starts),
+        "totals": summary,
+        "anomaly_count": len(anomalies),
+        "anomalies": anomalies[:top],
+        "quiet_count": len(quiet),
+        "went_quiet": quiet[:top],
+    }
+
+
+def load_trends(end: str, archive_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Trends for the week ending on `end`, or None when there is no columnar archive."""
+    archive_dir = archive_dir or os.getenv("COLUMNAR_ARCHIVE_DIR", ARCHIVE_DIR)
+    if not os.path.exists(os.path.join(archive_dir, "meta.json")):
+        return None
+    return weekly_trends(ColumnarArchive(archive_dir), end[:10])
+
+
+def main():
+    """Print the trends for the week ending on a date (today by default)."""
+    end = sys.argv[1] if len(sys.argv) > 1 else datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    trends = load_trends(end)
+    if trends is None:
+        print("Columnar archive not found. Run scripts/columnar.py first.")
+        return
+
+    print(json.dumps(trends, indent=2))
+    return trends
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,13 @@ import shutil
 import tempfile
 import subprocess
 
+try:
+    from actors import ActorFilter, empty_counts
+    from repo_select import RepoSelector
+except ImportError:
+    from scripts.actors import ActorFilter, empty_counts
+    from scripts.repo_select import RepoSelector
+
 def parse_changelog(content):
     categories = [
         r'[Aa]dd(?:ed|s|ing)?',
@@ -82,7 +89,8 @@ def parse_changelog(content):
     return release
 
 class ChangelogGenerator:
-    def __init__(self, token, filename=None,log_history_start=None, log_history_end=None):
+    def __init__(self, token, filename=None,log_history_start=None, log_history_end=None, store=None,
+                 actor_filter=None, repo_selector=None):
         self.now = datetime.now(timezone.utc)
         self.log_history_start = log_history_start
         self.log_history_end = log_history_end
@@ -93,6 +101,11 @@ class ChangelogGenerator:
 
         self.filename = filename
         self.token = token
+        self.store = store
+        # Bot accounts whose issues, PRs and commits are counted but not fetched
+        self.actor_filter = actor_filter if actor_filter is not None else ActorFilter.from_env()
+        # Repos to process, decided from the org listing alone
+        self.repo_selector = repo_selector if repo_selector is not None else RepoSelector.from_env()
 
         self.g = Github(token, per_page=100, lazy=True)
         
@@ -173,6 +186,8 @@ class ChangelogGenerator:
             # Filter for contributors whose FIRST commit falls within the target period
             new_users = []
             for name, first_date in author_first_commits.items():
+                if self.actor_filter.matches(name):
+                    continue
                 is_after_start = (not self.start_date) or (first_date >= self.start_date)
                 is_before_end = (not self.end_date) or (first_date <= self.end_date)
 
@@ -213,7 +228,7 @@ class ChangelogGenerator:
                 new_users = {}
                 for contributor in stats:
                     author = contributor.author  
-                    if author is None:
+                    if author is None or self.actor_filter.matches(author.login):
                         continue  
 
                     had_prior_activity = any(
@@ -271,9 +286,15 @@ class ChangelogGenerator:
             num_issues = 0
             num_prs = 0
             
+            filtered = data.setdefault("filtered_actors", empty_counts())
             for item in issues_and_prs:
                 
                 is_pr = item.pull_request is not None
+
+                # The listing already carries the author, so bot items cost no further calls
+                if self.actor_filter.matches(item.user.login if item.user else None):
+                    filtered["pulls" if is_pr else "issues"] += 1
+                    continue
                 
                 if not is_pr:
                     num_issues += 1
@@ -305,6 +326,8 @@ class ChangelogGenerator:
                     
             print(f"Found {num_issues} issues")
             print(f"Found {num_prs} pull requests")
+            if filtered["issues"] or filtered["pulls"]:
+                print(f"Skipped {filtered['issues']} issues and {filtered['pulls']} pull requests by filtered actors")
                     
         except Exception as e:
                 print(f"Error getting issues and PRs: {e}")
@@ -355,11 +378,23 @@ class ChangelogGenerator:
                 "end": self.log_history_end
             },
             "generated_at": self.now.isoformat(),
-            "total_repo_count": 0
+            "total_repo_count": 0,
+            # Issues, PRs and commits skipped because their author matched the actor filter
+            "filtered_actors": empty_counts(),
+            # Listed repos left out by the repo selection, which total_repo_count does not include
+            "excluded_repo_count": 0
         }
 
         total_repos = 0
         for repo in org.get_repos(type="public"):
+            # Decided before the rate limit check, so a skipped repo makes no request at all
+            if self.repo_selector:
+                reason = self.repo_selector.rejects(org_name, repo)
+                if reason:
+                    print(f"Skipping repo {repo.name}: {reason}")
+                    data["excluded_repo_count"] += 1
+                    continue
+
             self._check_rate_limit()
             total_repos += 1
             print(f"Processing repo: {repo.name}")
@@ -378,6 +413,8 @@ class ChangelogGenerator:
             if repo.archived:
                 print(f"Skipping archived repo: {repo.name}")
                 data["repos"].append(repo_data)
+                if self.store:
+                    self.store.upsert_repo(org_name, repo_data, self.log_history_start)
                 continue
             
             if not archival:
@@ -402,7 +439,13 @@ class ChangelogGenerator:
 
             try:
                 if self.start_date:
+                    filtered = repo_data.setdefault("filtered_actors", empty_counts())
                     for commit in repo.get_commits(since=self.start_date, until=self.end_date):
+                        # Bot commits are counted before any record is built for them
+                        if self.actor_filter.matches(commit.commit.author.name,
+                                                     commit.author.login if commit.author else None):
+                            filtered["commits"] += 1
+                            continue
                         repo_data["commits"].append({
                             "message": commit.commit.message,
                             "url": commit.html_url,
@@ -461,14 +504,28 @@ class ChangelogGenerator:
             except Exception as e:
                 print(f"Error fetching releases for {repo.name}: {str(e)}")
             
+            # Counts are only kept for repos where something was filtered
+            filtered = repo_data.pop("filtered_actors", None)
+            if filtered and any(filtered.values()):
+                repo_data["filtered_actors"] = filtered
+                for kind, count in filtered.items():
+                    data["filtered_actors"][kind] += count
+
             if not archival: 
                 if  (repo_data["issues"] or repo_data["pulls"] or
                     repo_data["commits"] or repo_data["changelog_entries"] or repo_data["releases"]):
                     data["repos"].append(repo_data)
             else: 
                 data["repos"].append(repo_data)
+
+            if self.store:
+                self.store.upsert_repo(org_name, repo_data, self.log_history_start)
                         
         data["total_repo_count"] = total_repos
+
+        if self.store:
+            self.store.record_run(org_name, data)
+
         return data
               
     def save_data(self, data):
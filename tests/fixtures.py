@@ -79,6 +79,24 @@ def mock_changelog_data(mock_repo_data):
         "generated_at": "2024-01-08T12:00:00Z"
     }
 
+def write_weekly(directory, data, start=None, end=None, name=None):
+    """
+    Write weekly changelog data to `directory` and return the file's path.
+    With `start` and `end` the period (of each org, for multi-org data) is
+    set to them and the file is named `weekly_changelog_<start>_to_<end>.json`,
+    unless `name` is given.
+    """
+    if start and end:
+        period = {"start": start, "end": end}
+        if "repos" in data:
+            data = dict(data, period=period)
+        else:
+            data = {org: dict(org_data, period=period) for org, org_data in data.items()}
+    path = os.path.join(directory, name or f"weekly_changelog_{start}_to_{end}.json")
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return path
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for test files"""
@@ -0,0 +1,96 @@
+import pytest
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from scripts.artifact_index import ArtifactIndex, index_for, kind_for, latest_file, rebuild, record_artifact
+from scripts.summary_engine import generate_all
+
+from tests.fixtures import mock_changelog_data, mock_repo_data, temp_dir
+
+
+def _touch(path, content="x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+    return path
+
+
+class TestArtifactIndex:
+    """Test the changelog_data artifact index."""
+
+    @pytest.mark.parametrize("name, kind", [
+        ("weekly_changelog_2026-08-07_to_2026-08-14.json", "weekly_changelog"),
+        ("summary_26-08-14.json", "summary"),
+        ("pr_body_condensed_2026-08-14.md", "pr_body_condensed"),
+        ("summary_condensed_quarterly_2026-Q3.json", "summary_condensed_quarterly"),
+        ("repos.json", None),
+    ])
+    def test_kind_for(self, name, kind):
+        """The kind is the file name prefix before its date stamp."""
+        assert kind_for(name) == kind
+
+    def test_index_lives_at_tree_root(self, temp_dir):
+        """Files in data/ and summaries/ share one index."""
+        assert index_for(os.path.join(temp_dir, "summaries")) == os.path.join(temp_dir, "index.json")
+        assert index_for(os.path.join(temp_dir, "data")) == os.path.join(temp_dir, "index.json")
+
+    def test_latest_is_by_period_not_write_order(self, temp_dir):
+        """Backfilling an older week does not replace the latest entry."""
+        data_dir = os.path.join(temp_dir, "data")
+        new = _touch(os.path.join(data_dir, "weekly_changelog_2026-08-07_to_2026-08-14.json"))
+        old = _touch(os.path.join(data_dir, "weekly_changelog_2026-01-01_to_2026-01-08.json"))
+
+        record_artifact(new, {"start": "2026-08-07", "end": "2026-08-14"}, "2026-08-14T00:00:00")
+        record_artifact(old, {"start": "2026-01-01", "end": "2026-01-08"}, "2026-08-15T00:00:00")
+
+        assert latest_file(data_dir, "weekly_changelog") == new
+        index = ArtifactIndex(index_for(data_dir))
+        assert [e["path"] for e in index.find("weekly_changelog", "2026-01-01", "2026-01-31")] == [
+            "data/weekly_changelog_2026-01-01_to_2026-01-08.json"
+        ]
+
+    def test_scan_fallback_handles_mixed_stamps(self, temp_dir):
+        """Without an index, two- and four-digit years are compared as dates and kinds are not mixed."""
+        summaries = os.path.join(temp_dir, "summaries")
+        _touch(os.path.join(summaries, "pr_title_25-12-31.txt"))
+        newest = _touch(os.path.join(summaries, "pr_title_2026-01-05.txt"))
+        _touch(os.path.join(summaries, "pr_title_condensed_2026-02-01.txt"))
+
+        assert latest_file(summaries, "pr_title") == newest
+
+    def test_concurrent_writers_keep_every_entry(self, temp_dir):
+        """Concurrent updates are serialized, so no entry is lost."""
+        paths = [_touch(os.path.join(temp_dir, "data", f"weekly_stats_2026-01-{day:02d}.json"), str(day))
+                 for day in range(1, 21)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(record_artifact, paths))
+
+        assert len(ArtifactIndex(index_for(os.path.join(temp_dir, "data"))).artifacts) == 20
+
+    def test_generate_all_records_outputs(self, mock_changelog_data, temp_dir):
+        """Summary outputs are indexed with their period, hash and headline counts."""
+        data_file = _touch(os.path.join(temp_dir, "data", "weekly_changelog_a.json"), json.dumps(mock_changelog_data))
+
+        paths = generate_all(data_file, os.path.join(temp_dir, "summaries"))
+
+        index = ArtifactIndex(os.path.join(temp_dir, "index.json"))
+        entry = index.latest("summary_condensed")
+        assert index.resolve(entry) == paths["summary_condensed"]
+        assert entry["period"] == mock_changelog_data["period"]
+        assert entry["counts"]["total_commits"] == 1
+        assert len(entry["sha256"]) == 64
+        assert latest_file(os.path.join(temp_dir, "summaries"), "pr_body") == paths["pr_body"]
+
+    def test_rebuild_reads_metadata(self, mock_changelog_data, temp_dir):
+        """Rebuilding indexes existing files with periods and counts read from their contents."""
+        _touch(os.path.join(temp_dir, "data", "weekly_changelog_2025-01-01_to_2025-01-08.json"),
+               json.dumps(mock_changelog_data))
+        _touch(os.path.join(temp_dir, "summaries", "mailto_25-01-08.txt"))
+
+        index = rebuild(temp_dir)
+
+        data_entry = index.latest("weekly_changelog")
+        assert data_entry["period"] == mock_changelog_data["period"]
+        assert data_entry["counts"]["active_repos"] == 1
+        assert index.latest("mailto")["generated_at"] == "2025-01-08"
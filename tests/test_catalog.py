@@ -0,0 +1,100 @@
+import os
+from scripts.catalog import RepoCatalog, hydrate
+from scripts.data_io import load_data
+from scripts.generate_summary import generate_summary
+
+from tests.fixtures import mock_changelog_data, mock_repo_data, temp_dir, write_weekly
+
+
+def _inactive_repo():
+    return {
+        "name": "open",
+        "url": "https://github.com/DSACMS/open",
+        "description": None,
+        "archived": True,
+        "topics": [],
+        "issues": [],
+        "pulls": [],
+        "commits": [],
+        "releases": [],
+    }
+
+
+class TestRepoCatalog:
+    """Test registering repos and tracking changes."""
+
+    def test_register_assigns_stable_ids(self, mock_repo_data, temp_dir):
+        """The same URL always maps to the same ID."""
+        catalog = RepoCatalog(os.path.join(temp_dir, "repos.json"))
+
+        first = catalog.register("DSACMS", mock_repo_data, "2025-01-08")
+        second = catalog.register("DSACMS", mock_repo_data, "2025-01-15")
+
+        assert first == second
+        assert len(catalog.repos) == 1
+
+    def test_changes_are_recorded_and_rolled_back(self, mock_repo_data, temp_dir):
+        """A changed description is recorded and `get(as_of=...)` returns the old value."""
+        catalog = RepoCatalog(os.path.join(temp_dir, "repos.json"))
+        repo_id = catalog.register("DSACMS", mock_repo_data, "2025-01-08")
+
+        catalog.register("DSACMS", dict(mock_repo_data, description="Renamed"), "2025-01-15")
+
+        assert catalog.get(repo_id)["description"] == "Renamed"
+        assert catalog.get(repo_id, as_of="2025-01-08")["description"] == "A test repo"
+        assert catalog.repos[repo_id]["history"][0]["field"] == "description"
+
+    def test_older_snapshot_does_not_overwrite_newer_values(self, mock_repo_data, temp_dir):
+        """Registering an older file after a newer one leaves current values alone."""
+        catalog = RepoCatalog(os.path.join(temp_dir, "repos.json"))
+        repo_id = catalog.register("DSACMS", dict(mock_repo_data, description="New"), "2025-02-01")
+
+        catalog.register("DSACMS", mock_repo_data, "2025-01-01")
+
+        assert catalog.get(repo_id)["description"] == "New"
+        assert catalog.repos[repo_id]["first_seen"] == "2025-01-01"
+
+    def test_save_and_reload(self, mock_repo_data, temp_dir):
+        """The catalog round-trips through its JSON file."""
+        path = os.path.join(temp_dir, "repos.json")
+        catalog = RepoCatalog(path)
+        repo_id = catalog.register("DSACMS", mock_repo_data, "2025-01-08")
+        catalog.save()
+
+        assert RepoCatalog(path).get(repo_id)["url"] == mock_repo_data["url"]
+
+
+class TestNormalizeAndHydrate:
+    """Test slimming weekly data and restoring it."""
+
+    def test_normalize_drops_static_fields_and_inactive_repos(self, mock_changelog_data, temp_dir):
+        """Weekly repos keep only repo_id and activity; inactive repos are dropped."""
+        mock_changelog_data["repos"].append(_inactive_repo())
+        mock_changelog_data["total_repo_count"] = 2
+        catalog = RepoCatalog(os.path.join(temp_dir, "repos.json"))
+
+        normalized = catalog.normalize("DSACMS", mock_changelog_data, "2025-01-08", catalog_ref="repos.json")
+
+        assert len(normalized["repos"]) == 1
+        assert "name" not in normalized["repos"][0]
+        assert "repo_id" in normalized["repos"][0]
+        assert normalized["total_repo_count"] == 2
+        assert len(catalog.repos) == 2
+
+    def test_summary_reads_normalized_file(self, mock_changelog_data, temp_dir):
+        """generate_summary hydrates repo references through load_data."""
+        catalog = RepoCatalog(os.path.join(temp_dir, "repos.json"))
+        normalized = {"DSACMS": catalog.normalize("DSACMS", mock_changelog_data, "2025-01-08", catalog_ref="repos.json")}
+        catalog.save()
+        data_file = write_weekly(temp_dir, normalized, name="weekly_changelog_2025-01-01_to_2025-01-08.json")
+
+        summary = generate_summary(data_file)
+
+        assert load_data(data_file)["DSACMS"]["repos"][0]["name"] == "test-repo"
+        assert summary["repos_with_activity"][0]["name"] == "test-repo"
+        assert summary["repos_with_activity"][0]["org"] == "DSACMS"
+        assert summary["total_commits"] == 1
+
+    def test_hydrate_leaves_plain_data_untouched(self, mock_changelog_data, temp_dir):
+        """Files without a catalog reference are returned as-is."""
+        assert hydrate(mock_changelog_data, os.path.join(temp_dir, "x.json")) is mock_changelog_data
@@ -0,0 +1,120 @@
+import pytest
+import re
+from scripts.classify import (
+    EMOJI_MAP,
+    ActivityClassifier,
+    CategoryClassifier,
+    classify_batch,
+    conventional_type,
+    get_emoji_for_category,
+)
+
+from tests.fixtures import mock_repo_data
+
+
+def _reference(category):
+    """The original EMOJI_MAP loop, kept here to check the classifier against."""
+    category_lower = category.lower()
+    for category_key, config in EMOJI_MAP.items():
+        for pattern in config['patterns']:
+            if re.search(pattern, category, re.IGNORECASE):
+                return (config['emoji'], category_key)
+        for keyword in config['keywords']:
+            if keyword in category_lower:
+                return (config['emoji'], category_key)
+    return ('❓', 'other')
+
+
+CATEGORIES = [
+    "Added", "ADDED", "Fixed", "Bug Fixes", "Changed", "Deprecated", "Removed",
+    "Security", "Performance", "Documentation", "Docs", "Improvements", "Misc", "",
+    "feat: add export button", "fix(api): handle empty page", "Update README.md",
+    "Bump numpy from 1.26 to 2.0", "Merge pull request #14 from DSACMS/feature",
+    "Delete stale workflow", "Optimize query", "Secure cookies", "Renew cert",
+    "docker cleanup", "Prefix handling", "İmprove İnput", "ſecurity audit", "Ｆix widths",
+    "Kelvin K test", "Änderungen", "Modifying 🧪 tests",
+]
+
+
+class TestCategoryClassifier:
+    """Test the precompiled classifier against the original loop."""
+
+    @pytest.mark.parametrize("category", CATEGORIES)
+    def test_matches_original_loop(self, category):
+        """Every bucket decision is the same as the original implementation."""
+        assert get_emoji_for_category(category) == _reference(category)
+
+    def test_bucket_order_decides_ties(self):
+        """When several buckets match, the first in map order wins."""
+        assert get_emoji_for_category("Fix docs and add tests") == ('✅', 'added')
+        assert get_emoji_for_category("Fix docs") == ('🪲', 'fixed')
+
+    def test_repeated_categories_are_memoized(self):
+        """A repeated string is answered from the cache."""
+        classifier = CategoryClassifier(EMOJI_MAP)
+
+        classifier.classify("Added")
+        classifier.classify("Added")
+
+        assert classifier.classify.cache_info().hits == 1
+
+    def test_custom_map(self):
+        """Buckets without patterns or keywords are handled."""
+        classifier = CategoryClassifier({
+            'ci': {'emoji': '🤖', 'patterns': [], 'keywords': ['workflow']},
+            'tests': {'emoji': '🧪', 'patterns': [r'\bTests?\b'], 'keywords': []},
+        })
+
+        assert classifier.classify("Update Workflow") == ('🤖', 'ci')
+        assert classifier.classify("add TESTS") == ('🧪', 'tests')
+        assert classifier.classify("Contests") == ('❓', 'other')
+
+
+class TestActivityClassifier:
+    """Test batch classification of PR titles and commit subjects."""
+
+    @pytest.mark.parametrize("subject, bucket", [
+        ("feat: add export", "added"),
+        ("fix(api): handle empty page", "fixed"),
+        ("feat!: drop python 3.8", "added"),
+        ("perf(db): index urls", "performance"),
+        ("chore(deps): bump numpy", "other"),
+        ("LICENSE: Add CC0", None),
+        ("Update README", None),
+        ("fix(api: broken scope", None),
+    ])
+    def test_conventional_type(self, subject, bucket):
+        """Known conventional-commit prefixes map to buckets; anything else is left to keywords."""
+        assert conventional_type(subject) == bucket
+
+    def test_batch_falls_back_to_keywords(self):
+        """Subjects without a prefix are classified like get_emoji_for_category."""
+        texts = ["docs: usage", "Update README", "Update README", "Misc"]
+
+        assert classify_batch(texts) == [
+            ('📚', 'documentation'),
+            get_emoji_for_category("Update README"),
+            get_emoji_for_category("Update README"),
+            ('❓', 'other'),
+        ]
+
+    def test_summary_counts_and_ranks_all_activity(self, mock_repo_data):
+        """Every PR and commit is counted; merged PRs rank above commits."""
+        mock_repo_data["pulls"] = [
+            {"title": "Fix login", "url": "pr/1", "merged": True},
+            {"title": "Fix logout", "url": "pr/2", "merged": False},
+        ]
+        mock_repo_data["commits"] = [
+            {"message": "fix: typo\n\nbody", "url": "c/1"},
+            {"message": "Fix login", "url": "c/2"},
+            {"message": "Merge pull request #1 from DSACMS/x", "url": "c/3"},
+            {"message": "chore: tidy", "url": "c/4"},
+        ]
+        activity = ActivityClassifier(top_items=2)
+
+        activity.add_repo(mock_repo_data)
+        summary = activity.summary()
+
+        assert summary["classified"] == 4
+        assert summary["counts"] == {"fixed": 3, "other": 1}
+        assert [item["url"] for item in summary["top_items"]["fixed"]] == ["pr/1", "pr/2"]
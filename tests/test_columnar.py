@@ -0,0 +1,137 @@
+import pytest
+import copy
+import os
+import numpy as np
+from scripts.columnar import ColumnarArchive, update_archive, parse_timestamps, KIND_IDS, STATE_IDS
+
+from tests.fixtures import mock_changelog_data, mock_repo_data, temp_dir, write_weekly
+
+
+class TestParseTimestamps:
+    """Test vectorized timestamp parsing."""
+
+    def test_parses_iso_strings_and_missing_values(self):
+        """ISO strings become epoch seconds, None becomes -1."""
+        result = parse_timestamps(["1970-01-02T00:00:00+00:00", None])
+        assert result.tolist() == [86400, -1]
+
+
+class TestUpdateArchive:
+    """Test building and incrementally updating the archive."""
+
+    def test_builds_columns_from_data_file(self, mock_changelog_data, temp_dir):
+        """Every item becomes one row with its kind and repo."""
+        data_file = write_weekly(temp_dir, mock_changelog_data, name="weekly_changelog_a.json")
+        archive_dir = os.path.join(temp_dir, "columnar")
+
+        added = update_archive(archive_dir, [data_file])
+        archive = ColumnarArchive(archive_dir)
+
+        assert added == 3
+        assert len(archive) == 3
+        assert isinstance(archive["ts"], np.memmap)
+        assert sorted(archive["kind"].tolist()) == sorted(
+            [KIND_IDS["issues"], KIND_IDS["pulls"], KIND_IDS["commits"]]
+        )
+        assert archive.repo_names() == ["unknown/test-repo"]
+
+    def test_overlapping_files_are_deduplicated_by_url(self, mock_changelog_data, temp_dir):
+        """Items already stored from an earlier file are not added again."""
+        first = write_weekly(temp_dir, mock_changelog_data, name="weekly_changelog_a.json")
+        second = write_weekly(temp_dir, mock_changelog_data, name="weekly_changelog_b.json")
+        archive_dir = os.path.join(temp_dir, "columnar")
+
+        update_archive(archive_dir, [first])
+        added = update_archive(archive_dir, [first, second])
+
+        assert added == 0
+        assert ColumnarArchive(archive_dir).meta["sources"] == [
+            "weekly_changelog_a.json", "weekly_changelog_b.json"
+        ]
+
+    def test_interrupted_update_keeps_columns_in_step_with_meta(self, mock_changelog_data, temp_dir,
+                                                                monkeypatch):
+        """Columns swapped in before a crash are cut back to meta.json, and the next run redoes the file."""
+        first = write_weekly(temp_dir, mock_changelog_data, name="weekly_changelog_a.json")
+        second_data = copy.deepcopy(mock_changelog_data)
+        second_data["repos"][0]["commits"][0]["url"] = "https://github.com/test/repo/commit/other"
+        second = write_weekly(temp_dir, second_data, name="weekly_changelog_b.json")
+        archive_dir = os.path.join(temp_dir, "columnar")
+        update_archive(archive_dir, [first])
+
+        replace = os.replace
+
+        def crash_before_meta(src, dst):
+            if dst.endswith("meta.json"):
+                raise OSError("interrupted")
+            replace(src, dst)
+
+        monkeypatch.setattr(os, "replace", crash_before_meta)
+        with pytest.raises(OSError):
+            update_archive(archive_dir, [first, second])
+        monkeypatch.setattr(os, "replace", replace)
+
+        archive = ColumnarArchive(archive_dir)
+        assert len(archive) == 3
+        assert all(len(archive[name]) == 3 for name in archive.columns)
+        assert archive.meta["sources"] == ["weekly_changelog_a.json"]
+
+        assert update_archive(archive_dir, [first, second]) == 1
+        assert len(ColumnarArchive(archive_dir)) == 4
+
+    @pytest.mark.parametrize("separate_updates", [False, True])
+    def test_later_files_close_and_merge_open_items(self, mock_changelog_data, temp_dir, separate_updates):
+        """An open issue or PR seen closed or merged later takes its new state and end time."""
+        later = copy.deepcopy(mock_changelog_data)
+        later["period"] = {"start": "2025-01-08", "end": "2025-01-15"}
+        later["repos"][0]["issues"][0]["state"] = "closed"
+        later["repos"][0]["pulls"][0].update(state="closed", merged=True, merged_at="2025-01-10T12:00:00+00:00")
+        first = write_weekly(temp_dir, mock_changelog_data, name="weekly_changelog_a.json")
+        second = write_weekly(temp_dir, later, name="weekly_changelog_b.json")
+        archive_dir = os.path.join(temp_dir, "columnar")
+
+        if separate_updates:
+            update_archive(archive_dir, [first])
+        update_archive(archive_dir, [first, second])
+        archive = ColumnarArchive(archive_dir)
+
+        kinds = archive["kind"].tolist()
+        issue, pull = kinds.index(KIND_IDS["issues"]), kinds.index(KIND_IDS["pulls"])
+        assert len(archive) == 3
+        assert archive["state"][issue] == STATE_IDS["closed"]
+        assert archive["ts_end"][issue] == parse_timestamps(["2025-01-15"])[0]
+        assert archive["state"][pull] == STATE_IDS["merged"]
+        assert archive["ts_end"][pull] == parse_timestamps(["2025-01-10T12:00:00"])[0]
+
+
+class TestCountsPerRepoPerWeek:
+    """Test aggregate queries over the archive."""
+
+    def test_counts_commits_per_week(self, mock_changelog_data, mock_repo_data, temp_dir):
+        """Commits are bucketed into Monday-based weeks per repo."""
+        mock_repo_data["commits"].append({
+            "message": "Another commit",
+            "url": "https://github.com/DSACMS/test-repo/commit/def456",
+            "author": "Test Author",
+            "created_at": "2025-06-30T10:00:00+00:00",
+        })
+        data_file = write_weekly(temp_dir, mock_changelog_data, name="weekly_changelog_a.json")
+        archive_dir = os.path.join(temp_dir, "columnar")
+        update_archive(archive_dir, [data_file])
+
+        repos, weeks, counts = ColumnarArchive(archive_dir).counts_per_repo_per_week("commits")
+
+        assert repos == ["unknown/test-repo"]
+        assert weeks == ["2025-06-16", "2025-06-23", "2025-06-30"]
+        assert counts.tolist() == [[1, 0, 1]]
+
+    def test_since_filter(self, mock_changelog_data, temp_dir):
+        """Rows before `since` are excluded."""
+        data_file = write_weekly(temp_dir, mock_changelog_data, name="weekly_changelog_a.json")
+        archive_dir = os.path.join(temp_dir, "columnar")
+        update_archive(archive_dir, [data_file])
+
+        _, weeks, counts = ColumnarArchive(archive_dir).counts_per_repo_per_week("commits", since="2025-07-01")
+
+        assert weeks == []
+        assert counts.shape == (1, 0)
@@ -0,0 +1,91 @@
+import pytest
+import gzip
+import json
+import os
+from datetime import date
+from scripts.compact import compact_directory
+from scripts.data_io import file_date, list_files, load_json, read_text
+from scripts.generate_summary import generate_summary
+
+from tests.fixtures import mock_changelog_data, mock_repo_data, temp_dir, write_weekly
+
+
+def _write(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    return path
+
+
+class TestFileDate:
+    """Test parsing dates out of file names."""
+
+    @pytest.mark.parametrize("name, expected", [
+        ("weekly_changelog_2025-08-14_to_2025-08-21.json", date(2025, 8, 21)),
+        ("summary_25-09-12.json", date(2025, 9, 12)),
+        ("summary_condensed_2026-01-23.json", date(2026, 1, 23)),
+        ("index.json", None),
+    ])
+    def test_file_date(self, name, expected):
+        """Both two- and four-digit years are recognized."""
+        assert file_date(name) == expected
+
+
+class TestTransparentReads:
+    """Test reading loose, compressed and bundled files."""
+
+    def test_reads_gzip_sibling(self, mock_changelog_data, temp_dir):
+        """A missing loose file falls back to its .gz sibling."""
+        path = os.path.join(temp_dir, "weekly_changelog_2025-01-01_to_2025-01-08.json")
+        with gzip.open(path + ".gz", "wt") as f:
+            json.dump(mock_changelog_data, f)
+
+        assert load_json(path) == mock_changelog_data
+        assert list_files(temp_dir, "weekly_changelog_") == [os.path.basename(path)]
+
+    def test_missing_file_raises_file_not_found(self, temp_dir):
+        """Files that are nowhere to be found still raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            read_text(os.path.join(temp_dir, "missing.json"))
+
+
+class TestCompactDirectory:
+    """Test rolling old files into monthly bundles."""
+
+    def test_compacts_old_months_and_keeps_recent_files(self, mock_changelog_data, temp_dir):
+        """Files from months ending before the cutoff are bundled and removed."""
+        old = write_weekly(temp_dir, mock_changelog_data, "2025-08-07", "2025-08-14")
+        older = write_weekly(temp_dir, mock_changelog_data, "2025-08-14", "2025-08-21")
+        recent = write_weekly(temp_dir, mock_changelog_data, "2025-09-05", "2025-09-12")
+        original = read_text(old)
+
+        added = compact_directory(temp_dir, cutoff=date(2025, 9, 15), codec=".gz")
+
+        assert list(added) == ["2025-08.json.gz"]
+        assert not os.path.exists(old) and not os.path.exists(older)
+        assert os.path.exists(recent)
+        assert read_text(old) == original
+        assert list_files(temp_dir, "weekly_changelog_") == sorted(
+            os.path.basename(p) for p in (old, older, recent)
+        )
+
+    def test_compacting_again_merges_into_existing_bundle(self, mock_changelog_data, temp_dir):
+        """A later file for an already-bundled month is added to the same bundle."""
+        first = _write(os.path.join(temp_dir, "summary_25-08-14.json"), {"a": 1})
+        compact_directory(temp_dir, cutoff=date(2025, 9, 15), codec=".gz")
+        second = _write(os.path.join(temp_dir, "summary_25-08-21.json"), {"b": 2})
+
+        compact_directory(temp_dir, cutoff=date(2025, 9, 15), codec=".gz")
+
+        assert load_json(first) == {"a": 1}
+        assert load_json(second) == {"b": 2}
+        with open(os.path.join(temp_dir, "bundles", "index.json")) as f:
+            assert json.load(f)["bundles"]["2025-08.json.gz"]["count"] == 2
+
+    def test_generate_summary_reads_bundled_file(self, mock_changelog_data, temp_dir):
+        """generate_summary accepts the logical path of a bundled data file."""
+        path = write_weekly(temp_dir, mock_changelog_data, "2025-01-01", "2025-01-08")
+        compact_directory(temp_dir, cutoff=date(2025, 3, 1), codec=".gz")
+
+        summary = generate_summary(path)
+
+        assert summary["total_commits"] == 1
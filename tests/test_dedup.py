@@ -0,0 +1,94 @@
+import copy
+from scripts.dedup import cluster, collapse_duplicates, normalize, shared_text, signatures
+from scripts.generate_summary_condensed import create_condensed_appendix, create_condensed_pr_content
+from scripts.summary_engine import summarize
+
+from tests.fixtures import mock_changelog_data, mock_repo_data, temp_dir
+
+
+def _update_pr(url):
+    return {"title": "Update axios from 1.6.0 to 1.7.2", "url": url, "state": "closed", "merged": True,
+            "merged_at": "2025-01-05T00:00:00+00:00", "created_at": "2025-01-04T00:00:00+00:00"}
+
+
+class TestNearDuplicates:
+    """Test normalizing, MinHash signatures and LSH clustering."""
+
+    def test_normalize(self):
+        """Versions and PR references are replaced and word endings dropped; bare versions are kept."""
+        assert normalize("Added code.json support (#12)") == normalize("Add code.json support")
+        assert normalize("Bump axios from 1.6.0 to 1.7.2") == normalize("Bump axios from 1.5.1 to 1.6.0")
+
+    def test_shared_text_drops_versions_and_pr_references(self):
+        assert shared_text("Bump axios from 1.6.0 to 1.7.2 in /app (#41)") == "Bump axios in /app"
+        assert shared_text("Update vite to v5.0.1") == "Update vite"
+        assert shared_text("v1.2.0") == "v1.2.0"
+        assert normalize("v1.2.0") != normalize("v1.2.1")
+
+    def test_identical_texts_have_identical_signatures(self):
+        """Signatures depend only on the text, not on its position in the batch."""
+        sigs = signatures(["add login page", "fix bug", "add login page"])
+
+        assert (sigs[0] == sigs[2]).all()
+        assert not (sigs[0] == sigs[1]).all()
+
+    def test_cluster(self):
+        """Near-duplicates share a group; texts differing in a key word do not."""
+        groups = cluster([
+            "Added code.json support",
+            "Bump vite from 5.0.0 to 5.0.1 in /app",
+            "Add code.json support (#12)",
+            "Bump vitest from 5.0.0 to 5.0.1 in /app",
+            "Fix issue 107",
+            "Fix issue 93",
+        ])
+
+        assert groups == [0, 1, 0, 3, 4, 5]
+
+    def test_near_matches_do_not_chain(self):
+        """A text close to a group's member but not to its first entry starts its own group."""
+        base = ("refresh the deployment guide for the staging cluster and the production cluster with the new "
+                "runbook links and the updated on call rotation schedule for the platform team and the "
+                "incident review template")
+        middle = base.replace("platform", "payment")
+        # base ~ middle and middle ~ far are both above SIMILARITY; base ~ far is not
+        far = middle.replace("staging", "preview")
+
+        assert cluster([base, middle, far]) == [0, 0, 2]
+
+
+class TestCollapseDuplicates:
+    """Test collapsing categorized changes."""
+
+    def test_within_repo_prefers_changelog_item(self):
+        """A PR title repeating a changelog item in the same repo is dropped, whichever comes first."""
+        categorized = {
+            "added": [
+                {"repo": "app", "text": "Add code.json support (#12)", "type": "pr", "url": "https://x/pull/12"},
+                {"repo": "app", "text": "Added code.json support", "category": "Added"},
+            ],
+            "fixed": [{"repo": "app", "text": "Fix login redirect"}],
+        }
+
+        collapsed, removed = collapse_duplicates(categorized)
+
+        assert removed == 1
+        assert collapsed["added"] == [{"repo": "app", "text": "Added code.json support", "category": "Added"}]
+        assert collapsed["fixed"] == categorized["fixed"]
+
+    def test_cross_repo_changes_become_one_entry(self, mock_changelog_data):
+        """The same bot PR in several repos is one entry listing every repo, in the condensed PR body too."""
+        for name in ("web", "api", "Docs"):
+            repo = copy.deepcopy(mock_changelog_data["repos"][0])
+            repo.update(name=name, changelog_entries=[], pulls=[_update_pr(f"https://github.com/DSACMS/{name}/pull/1")])
+            mock_changelog_data["repos"].append(repo)
+
+        summary = summarize(mock_changelog_data).condensed_summary()
+        updates = [change for change in summary["categorized_changes"]["changed"] if "axios" in change["text"]]
+
+        assert summary["duplicates_suppressed"] == 2
+        assert [change["repos"] for change in updates] == [["api", "Docs", "web"]]
+        _, body = create_condensed_pr_content(summary)
+        assert ("### Across repositories\n"
+                "- Update axios (*3 repositories*)") in body
+        assert "- Update axios (api, Docs, web)" in create_condensed_appendix(summary)
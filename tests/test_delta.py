@@ -0,0 +1,131 @@
+import pytest
+import copy
+import os
+from scripts.catalog import RepoCatalog
+from scripts.delta import WeekIndex, add_delta, load_delta, previous_data_file, week_delta
+from scripts.generate_summary_condensed import create_condensed_pr_content
+from scripts.render import Budget
+
+from tests.fixtures import mock_changelog_data, mock_repo_data, temp_dir, write_weekly
+
+
+@pytest.fixture
+def two_weeks(mock_changelog_data):
+    """Last week's data, and this week's after the PR merged and the issue closed."""
+    previous = copy.deepcopy(mock_changelog_data)
+    previous["period"] = {"start": "2025-06-18", "end": "2025-06-25"}
+    previous["repos"][0]["topics"] = ["open-source"]
+    previous["repos"].append({"name": "old-repo", "url": "https://github.com/DSACMS/old-repo",
+                              "commits": [{"message": "Last commit", "url": "https://github.com/DSACMS/old-repo/commit/1"}]})
+
+    current = copy.deepcopy(mock_changelog_data)
+    current["period"] = {"start": "2025-06-25", "end": "2025-07-02"}
+    repo = current["repos"][0]
+    repo["topics"] = ["open-source", "python"]
+    repo["pulls"][0].update(state="closed", merged=True)
+    repo["issues"][0]["state"] = "closed"
+    repo["releases"] = [{"name": "v1.0.0", "url": "https://github.com/DSACMS/test-repo/releases/tag/v1.0.0"}]
+    current["repos"].append({"name": "new-repo", "url": "https://github.com/DSACMS/new-repo",
+                             "issues": [{"title": "First issue", "url": "https://github.com/DSACMS/new-repo/issues/1",
+                                         "state": "open"}]})
+    return {"DSACMS": current}, {"DSACMS": previous}
+
+
+class TestWeekDelta:
+    """Test joining two weeks by repo and item URL."""
+
+    def test_joins_repos_and_items(self, two_weeks):
+        """Each section lists what changed since the previous week."""
+        current, previous = two_weeks
+
+        delta = week_delta(WeekIndex(current), WeekIndex(previous))
+
+        assert [r["repo"] for r in delta["newly_active"]] == ["new-repo"]
+        assert [r["repo"] for r in delta["gone_quiet"]] == ["old-repo"]
+        assert [p["url"] for p in delta["prs_merged"]] == ["https://github.com/DSACMS/test-repo/pull/1"]
+        assert [i["url"] for i in delta["issues_closed"]] == ["https://github.com/DSACMS/test-repo/issues/1"]
+        assert [r["title"] for r in delta["new_releases"]] == ["v1.0.0"]
+        assert delta["new_topics"] == [{"org": "DSACMS", "repo": "test-repo",
+                                        "url": "https://github.com/DSACMS/test-repo", "topics": ["python"]}]
+        assert delta["counts"]["prs_merged"] == 1
+        assert delta["previous_period"] == {"start": "2025-06-18", "end": "2025-06-25"}
+
+    def test_new_topics_come_from_the_catalog_history(self, two_weeks, temp_dir):
+        """A repo missing from last week's file still reports topics added since then."""
+        current, previous = two_weeks
+        previous["DSACMS"]["repos"] = previous["DSACMS"]["repos"][1:]
+        repo = current["DSACMS"]["repos"][0]
+        catalog = RepoCatalog(os.path.join(temp_dir, "repos.json"))
+        catalog.register("DSACMS", dict(repo, topics=["open-source"]), "2025-06-11")
+        catalog.register("DSACMS", repo, "2025-07-02")
+
+        delta = week_delta(WeekIndex(current), WeekIndex(previous), catalog)
+
+        assert [(r["repo"], r["topics"]) for r in delta["new_topics"]] == [("test-repo", ["python"])]
+        assert week_delta(WeekIndex(current), WeekIndex(previous))["new_topics"] == []
+
+    def test_unchanged_week_has_no_delta(self, two_weeks):
+        """Comparing a week with itself reports nothing."""
+        current, _ = two_weeks
+
+        delta = week_delta(WeekIndex(current), WeekIndex(current))
+
+        assert not any(delta["counts"].values())
+
+
+class TestPreviousDataFile:
+    """Test finding the week before a data file."""
+
+    def test_prefers_the_window_ending_at_the_start(self, temp_dir):
+        """Overlapping windows are skipped in favor of the one ending where this one starts."""
+        for name in ["weekly_changelog_2025-06-11_to_2025-06-18.json",
+                     "weekly_changelog_2025-06-18_to_2025-06-25.json",
+                     "weekly_changelog_2025-06-19_to_2025-06-26.json",
+                     "weekly_changelog_2025-06-25_to_2025-07-02.json"]:
+            open(os.path.join(temp_dir, name), "w").close()
+
+        current = os.path.join(temp_dir, "weekly_changelog_2025-06-25_to_2025-07-02.json")
+        first = os.path.join(temp_dir, "weekly_changelog_2025-06-11_to_2025-06-18.json")
+
+        assert previous_data_file(current) == os.path.join(temp_dir, "weekly_changelog_2025-06-18_to_2025-06-25.json")
+        assert previous_data_file(first) is None
+
+    def test_load_delta_reads_the_previous_file(self, two_weeks, temp_dir):
+        """The current week can be passed in memory; the previous one is read from disk."""
+        current, previous = two_weeks
+        write_weekly(temp_dir, previous, "2025-06-18", "2025-06-25")
+
+        delta = load_delta(os.path.join(temp_dir, "weekly_changelog_2025-06-25_to_2025-07-02.json"), current,
+                           catalog_file=os.path.join(temp_dir, "repos.json"))
+
+        assert delta["counts"]["gone_quiet"] == 1
+
+
+class TestAddDelta:
+    """Test rendering the delta in PR bodies."""
+
+    def test_sections_are_capped(self, two_weeks):
+        """Long sections end with an "...and N more" line."""
+        current, previous = two_weeks
+        delta = week_delta(WeekIndex(current), WeekIndex(previous))
+        delta["gone_quiet"] = [{"org": "DSACMS", "repo": f"repo-{n}", "url": ""} for n in range(5)]
+
+        body = Budget(10000)
+        add_delta(body, delta, "## Since Last Week", limit=2)
+        text = body.render()
+
+        assert text.startswith("## Since Last Week\n*Compared with 2025-06-18 to 2025-06-25:")
+        assert "**Repositories that went quiet** (5):" in text
+        assert "- *...and 3 more*" in text
+        assert "- **test-repo**: [Test PR](https://github.com/DSACMS/test-repo/pull/1)" in text
+
+    def test_condensed_pr_body_includes_delta(self, two_weeks):
+        """The condensed PR shows the delta after its quick stats."""
+        current, previous = two_weeks
+        summary = {"period": {"start": "2025-06-25", "end": "2025-07-02"}, "generated_at": "now",
+                   "week_delta": week_delta(WeekIndex(current), WeekIndex(previous))}
+
+        _, body = create_condensed_pr_content(summary)
+
+        assert body.index("## 📊 Quick Stats") < body.index("## 🔄 Since Last Week")
+        assert "- **test-repo**: python" in body
@@ -0,0 +1,98 @@
+import pytest
+import copy
+import json
+import os
+from scripts.artifact_index import ArtifactIndex
+from scripts.digests import TeamIndex, fan_out, generate_digests, load_teams, team_slug
+from scripts.summary_engine import summarize
+
+from tests.fixtures import mock_changelog_data, mock_repo_data, temp_dir
+
+
+@pytest.fixture
+def org_data(mock_changelog_data):
+    """Three repos: one tagged `infra`, one tagged `data`, one untagged."""
+    repos = []
+    for name, topics in [("infra-repo", ["infra"]), ("data-repo", ["Data"]), ("plain-repo", [])]:
+        repo = copy.deepcopy(mock_changelog_data["repos"][0])
+        repo.update(name=name, url=f"https://github.com/DSACMS/{name}", topics=topics)
+        for kind in ("issues", "pulls", "commits"):
+            for item in repo[kind]:
+                item["url"] = item["url"].replace("test-repo", name)
+        repos.append(repo)
+    return {"DSACMS": dict(mock_changelog_data, repos=repos)}
+
+
+TEAMS = {
+    "Platform": {"topics": ["infra"]},
+    "Data Team": {"topics": ["data"], "repos": ["DSACMS/plain-repo"]},
+    "Everyone": {"topics": ["infra", "data"], "repos": ["plain-repo"]},
+}
+
+
+class TestTeamIndex:
+    """Test mapping repos to teams."""
+
+    def test_matches_topics_and_repo_names(self):
+        """Topics match case-insensitively; repos match by name or org/name."""
+        index = TeamIndex(TEAMS)
+
+        assert index.teams_for("DSACMS", {"name": "x", "topics": ["INFRA"]}) == ["Platform", "Everyone"]
+        assert index.teams_for("DSACMS", {"name": "plain-repo"}) == ["Data Team", "Everyone"]
+        assert index.teams_for("other-org", {"name": "plain-repo"}) == ["Everyone"]
+        assert index.teams_for("DSACMS", {"name": "x", "topics": ["docs"]}) == []
+
+    def test_load_teams(self, temp_dir):
+        """A missing config means no teams; a team needs topics or repos."""
+        path = os.path.join(temp_dir, "teams.json")
+        assert load_teams(path) == {}
+
+        with open(path, "w") as f:
+            json.dump({"empty": {"title": "Empty"}}, f)
+        with pytest.raises(ValueError, match="empty"):
+            load_teams(path)
+
+    def test_team_slug(self):
+        assert team_slug("Data Team") == "data-team"
+
+
+class TestFanOut:
+    """Test accumulating every team's summary in one pass."""
+
+    def test_matches_summarizing_each_team_separately(self, org_data):
+        """Merging each repo's summary gives the same result as summarizing the team's repos."""
+        engines = fan_out([("DSACMS", repo) for repo in org_data["DSACMS"]["repos"]], TeamIndex(TEAMS))
+
+        for team, names in [("Platform", ["infra-repo"]), ("Data Team", ["data-repo", "plain-repo"]),
+                            ("Everyone", ["infra-repo", "data-repo", "plain-repo"])]:
+            team_data = {"DSACMS": dict(org_data["DSACMS"],
+                                        repos=[r for r in org_data["DSACMS"]["repos"] if r["name"] in names])}
+            expected = summarize(team_data)
+            engines[team].set_metadata(**expected.metadata)
+
+            assert engines[team].full_summary() == expected.full_summary()
+            assert engines[team].condensed_summary() == expected.condensed_summary()
+
+
+class TestGenerateDigests:
+    """Test writing every team's outputs."""
+
+    def test_writes_prefixed_outputs_for_every_team(self, org_data, temp_dir, monkeypatch):
+        """Each team gets the org-wide outputs under its own name, indexed once."""
+        monkeypatch.setenv("REPO_CATALOG", os.path.join(temp_dir, "missing.json"))
+        output_dir = os.path.join(temp_dir, "digests")
+
+        written = generate_digests("weekly_changelog_2025-01-01_to_2025-01-08.json", TEAMS, output_dir, data=org_data)
+
+        assert list(written) == list(TEAMS)
+        paths = written["Data Team"]
+        assert os.path.basename(paths["pr_body_condensed"]).startswith("data-team_pr_body_condensed_")
+        with open(paths["pr_title"]) as f:
+            assert f.read().startswith("[Data Team] Weekly Changelog Summary")
+        with open(paths["summary"]) as f:
+            summary = json.load(f)
+        assert (summary["team"], summary["total_repos"], summary["active_repos"]) == ("Data Team", 2, 2)
+
+        index = ArtifactIndex(os.path.join(temp_dir, "index.json"))
+        assert index.latest("platform_summary")["counts"]["total_repos"] == 1
+        assert len(index.artifacts) == sum(len(p) for p in written.values())
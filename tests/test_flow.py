@@ -0,0 +1,108 @@
+import pytest
+import os
+import numpy as np
+from scripts.columnar import ColumnarArchive, update_archive
+from scripts.flow import flow_metrics, group_medians, load_flow, percentiles
+from scripts.generate_summary import create_pr_content, generate_summary
+
+from tests.fixtures import mock_changelog_data, mock_repo_data, temp_dir, write_weekly
+
+
+def _pull(repo, n, created, state="open", merged_at=None):
+    return {"title": f"PR {n}", "url": f"https://github.com/DSACMS/{repo}/pull/{n}", "created_at": created,
+            "state": "closed" if merged_at else state, "merged": bool(merged_at), "merged_at": merged_at}
+
+
+def _issue(n, created, state="open"):
+    return {"title": f"Issue {n}", "url": f"https://github.com/DSACMS/app/issues/{n}",
+            "created_at": created, "state": state}
+
+
+@pytest.fixture
+def flow_archive(temp_dir):
+    """
+    Two weeks ending 2025-06-27. `app` has PRs 1-2 open in the first week and
+    merged in the second, PR 3 merged within the first week and PR 4 still
+    open; issue 1 is closed in the second week. `lib` has one PR merged in
+    the second week.
+    """
+    first = write_weekly(temp_dir, {"DSACMS": {"repos": [
+        {"name": "app", "url": "https://github.com/DSACMS/app",
+         "pulls": [_pull("app", 1, "2025-06-16T00:00:00+00:00"), _pull("app", 2, "2025-06-17T00:00:00+00:00"),
+                   _pull("app", 3, "2025-06-14T00:00:00+00:00", merged_at="2025-06-15T00:00:00+00:00"),
+                   _pull("app", 4, "2025-05-28T00:00:00+00:00")],
+         "issues": [_issue(1, "2025-06-14T00:00:00+00:00"), _issue(2, "2025-06-18T00:00:00+00:00")]},
+    ]}}, "2025-06-13", "2025-06-20")
+    second = write_weekly(temp_dir, {"DSACMS": {"repos": [
+        {"name": "app", "url": "https://github.com/DSACMS/app",
+         "pulls": [_pull("app", 1, "2025-06-16T00:00:00+00:00", merged_at="2025-06-22T00:00:00+00:00"),
+                   _pull("app", 2, "2025-06-17T00:00:00+00:00", merged_at="2025-06-25T00:00:00+00:00")],
+         "issues": [_issue(1, "2025-06-14T00:00:00+00:00", state="closed"),
+                    _issue(3, "2025-06-24T00:00:00+00:00")]},
+        {"name": "lib", "url": "https://github.com/DSACMS/lib",
+         "pulls": [_pull("lib", 1, "2025-06-26T00:00:00+00:00", merged_at="2025-06-26T06:00:00+00:00")]},
+    ]}}, "2025-06-20", "2025-06-27")
+    archive_dir = os.path.join(temp_dir, "columnar")
+    update_archive(archive_dir, [first, second])
+    return archive_dir
+
+
+class TestAggregates:
+    """Test the vectorized percentile helpers."""
+
+    def test_percentiles(self):
+        """Percentiles are rounded; empty input has a count but no values."""
+        assert percentiles(np.arange(11.0)) == {"count": 11, "p50": 5.0, "p75": 7.5, "p90": 9.0}
+        assert percentiles(np.array([])) == {"count": 0, "p50": None, "p75": None, "p90": None}
+
+    def test_group_medians(self):
+        """Every group's median at once, averaging the middle pair; NaN for empty groups."""
+        medians = group_medians(np.array([0, 2, 0, 0, 2]), np.array([5.0, 1.0, 1.0, 3.0, 4.0]), 3)
+
+        assert medians[0] == 3.0
+        assert np.isnan(medians[1])
+        assert medians[2] == 2.5
+
+
+class TestFlowMetrics:
+    """Test the flow report over the archive."""
+
+    def test_time_to_merge_and_throughput(self, flow_archive):
+        """PRs count at their merge time, including those first archived while open."""
+        flow = flow_metrics(ColumnarArchive(flow_archive), "2025-06-27", weeks=2)
+
+        assert flow["week_starts"] == ["2025-06-14", "2025-06-21"]
+        assert flow["time_to_merge"]["this_week"] == {"count": 3, "p50": 144.0, "p75": 168.0, "p90": 182.4}
+        assert flow["time_to_merge"]["trailing"]["count"] == 4
+        assert flow["throughput"]["weekly"] == [1, 3]
+        assert flow["throughput"]["top_repos"] == [
+            {"repo": "DSACMS/app", "merged": 3, "median_hours": 144.0},
+            {"repo": "DSACMS/lib", "merged": 1, "median_hours": 6.0},
+        ]
+
+    def test_open_pulls_and_issue_backlog(self, flow_archive):
+        """Open PRs are aged at the end of the period; issues close at the end of the week they were seen closed."""
+        flow = flow_metrics(ColumnarArchive(flow_archive), "2025-06-27", weeks=2)
+
+        assert flow["open_pulls"]["count"] == 1
+        assert flow["open_pulls"]["p50"] == 31.0
+        assert flow["open_pulls"]["buckets"]["1-3 months"] == 1
+        assert flow["issue_backlog"] == {"opened": [2, 1], "closed": [0, 1], "open": [2, 2], "growth": 2}
+
+    def test_no_archive(self, temp_dir):
+        """Without a columnar archive there are no flow metrics."""
+        assert load_flow("2025-06-27", os.path.join(temp_dir, "missing")) is None
+
+    def test_pr_body_includes_flow(self, flow_archive, mock_changelog_data, temp_dir):
+        """The full PR body shows the flow section after the overview."""
+        data_file = write_weekly(temp_dir, mock_changelog_data, name="test_data.json")
+        summary = generate_summary(data_file)
+        summary["flow"] = load_flow("2025-06-27", flow_archive)
+
+        _, body = create_pr_content(summary)
+
+        assert "## Flow" in body
+        assert "- **PRs merged**: 3 this week" in body
+        assert "- **Issue backlog**: 2 open (1 opened and 1 closed this week, +2 over the last 12 weeks)" in body
+        assert "- **DSACMS/app**: 3 merged, median 6.0d to merge" in body
+        assert body.index("## Overview") < body.index("## Flow") < body.index("## Key Changes")
@@ -0,0 +1,107 @@
+import pytest
+import gzip
+import io
+import json
+import os
+from scripts.catalog import RepoCatalog
+from scripts.data_io import iter_org_repos, load_data
+from scripts.json_stream import ChangelogStream, JsonStream
+from scripts.profiles import to_slim
+from scripts.summary_engine import summarize_file
+
+from tests.fixtures import mock_changelog_data, mock_repo_data, temp_dir, write_weekly
+
+
+def _second_repo(mock_repo_data):
+    return dict(mock_repo_data, name="other-repo", url="https://github.com/DSACMS/other-repo",
+                commits=[], changelog_entries=[])
+
+
+class TestJsonStream:
+    """Test the incremental parser."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 4096])
+    def test_values_split_across_chunks(self, chunk_size):
+        """Values are decoded correctly wherever the chunk boundaries fall."""
+        doc = {"a": 12345, "b": [1.5e3, -7, True, None], "c": "é\\\"ü ☃", "d": {"e": []}, "f": 987}
+        stream = JsonStream(io.StringIO(json.dumps(doc)), chunk_size=chunk_size)
+
+        result = {}
+        for key in stream.keys():
+            result[key] = stream.value()
+
+        assert result == doc
+
+    def test_items_iterates_array(self):
+        """Array elements are consumed one at a time."""
+        stream = JsonStream(io.StringIO('[ {"x": 1}, {"x": 2} ]'), chunk_size=3)
+
+        assert [stream.value() for _ in stream.items()] == [{"x": 1}, {"x": 2}]
+
+    def test_malformed_input_raises_decode_error(self):
+        """Structural errors surface as JSONDecodeError, like json.load."""
+        with pytest.raises(json.JSONDecodeError):
+            list(JsonStream(io.StringIO("not valid json{{{")).keys())
+
+
+class TestChangelogStream:
+    """Test streaming repos out of data files."""
+
+    def _assert_matches_load(self, path):
+        stream = ChangelogStream(path, chunk_size=64)
+        assert list(stream) == list(iter_org_repos(load_data(path)))
+        return stream
+
+    def test_legacy_single_org(self, mock_changelog_data, mock_repo_data, temp_dir):
+        """Legacy files yield the same repos as the full loader."""
+        mock_changelog_data["repos"].append(_second_repo(mock_repo_data))
+        path = write_weekly(temp_dir, mock_changelog_data, name="weekly_changelog_a.json")
+
+        stream = self._assert_matches_load(path)
+
+        assert stream.skeleton["period"] == mock_changelog_data["period"]
+        assert stream.skeleton["repos"] == [None, None]
+
+    def test_multi_org_compressed(self, mock_changelog_data, mock_repo_data, temp_dir):
+        """Multi-org files are streamed from their gzip sibling."""
+        data = {"DSACMS": mock_changelog_data,
+                "CMS-Enterprise": dict(mock_changelog_data, repos=[_second_repo(mock_repo_data)])}
+        path = os.path.join(temp_dir, "weekly_changelog_a.json")
+        with gzip.open(path + ".gz", "wt") as f:
+            json.dump(data, f)
+
+        stream = self._assert_matches_load(path)
+
+        assert [org for org, _ in stream] == ["DSACMS", "CMS-Enterprise"]
+
+    def test_slim_with_tables_after_repos(self, mock_changelog_data, temp_dir):
+        """Repos that need tables listed later in the file are held until they arrive."""
+        slim = to_slim(mock_changelog_data, {})
+        reordered = {k: v for k, v in slim.items() if k != "tables"}
+        reordered["tables"] = slim["tables"]
+        path = write_weekly(temp_dir, {"DSACMS": reordered}, name="weekly_changelog_a.json")
+
+        self._assert_matches_load(path)
+
+    def test_catalog_references(self, mock_changelog_data, temp_dir):
+        """Catalog-normalized repos are hydrated per repo."""
+        catalog = RepoCatalog(os.path.join(temp_dir, "repos.json"))
+        normalized = catalog.normalize("DSACMS", mock_changelog_data, "2025-01-08", catalog_ref="repos.json")
+        catalog.save()
+        path = write_weekly(temp_dir, {"DSACMS": normalized}, name="weekly_changelog_a.json")
+
+        stream = self._assert_matches_load(path)
+
+        assert next(iter(stream))[1]["name"] == "test-repo"
+
+    def test_streamed_summary_matches_loaded(self, mock_changelog_data, mock_repo_data, temp_dir):
+        """Streaming and full loading produce identical summaries."""
+        data = {"DSACMS": dict(mock_changelog_data, total_repo_count=5),
+                "CMS-Enterprise": dict(mock_changelog_data, repos=[_second_repo(mock_repo_data)])}
+        path = write_weekly(temp_dir, data, name="weekly_changelog_a.json")
+
+        streamed = summarize_file(path, stream=True)
+        loaded = summarize_file(path, stream=False)
+
+        assert streamed.full_summary() == loaded.full_summary()
+        assert streamed.condensed_summary() == loaded.condensed_summary()
@@ -0,0 +1,77 @@
+import pytest
+import copy
+import json
+from scripts.merge import ActivitySet, merge_files
+from scripts.store import ActivityStore
+
+from tests.fixtures import mock_changelog_data, mock_repo_data, temp_dir, write_weekly
+
+
+@pytest.fixture
+def overlapping_files(mock_changelog_data, temp_dir):
+    """Two overlapping multi-org weeks; the second sees the PR merged and a new commit."""
+    first = copy.deepcopy(mock_changelog_data)
+    first["period"] = {"start": "2025-06-18", "end": "2025-06-25"}
+
+    second = copy.deepcopy(first)
+    second["period"] = {"start": "2025-06-20", "end": "2025-06-27"}
+    repo = second["repos"][0]
+    repo["pulls"][0].update(state="closed", merged=True, merged_at="2025-06-26T10:00:00+00:00")
+    repo["commits"].append({"message": "Second commit", "url": "https://github.com/DSACMS/test-repo/commit/def456",
+                            "created_at": "2025-06-26T09:00:00+00:00"})
+
+    return [
+        write_weekly(temp_dir, {"DSACMS": second}, "2025-06-20", "2025-06-27"),
+        write_weekly(temp_dir, {"DSACMS": first}, "2025-06-18", "2025-06-25"),
+    ]
+
+
+class TestActivitySet:
+    """Test merging overlapping data files."""
+
+    def test_items_are_deduplicated_by_url(self, overlapping_files):
+        """An item seen in both files is kept once, as of the newest file."""
+        merged = merge_files(overlapping_files)
+        data = merged.window("DSACMS", "2025-06-18", "2025-06-27")
+        repo = data["repos"][0]
+
+        assert merged.files == ["weekly_changelog_2025-06-18_to_2025-06-25.json",
+                                "weekly_changelog_2025-06-20_to_2025-06-27.json"]
+        assert merged.seen == 9
+        assert (len(repo["commits"]), len(repo["pulls"]), len(repo["issues"])) == (2, 1, 1)
+        assert repo["pulls"][0]["merged"] is True
+
+    def test_window_selects_by_activity_span(self, overlapping_files):
+        """A materialized range only holds items active during it."""
+        merged = merge_files(overlapping_files)
+
+        repo = merged.window("DSACMS", "2025-06-26", "2025-06-30")["repos"][0]
+
+        assert [c["url"] for c in repo["commits"]] == ["https://github.com/DSACMS/test-repo/commit/def456"]
+        assert len(repo["pulls"]) == 1
+        july = merged.materialize("2025-07-01", "2025-07-31")
+        assert list(july) == ["DSACMS"]
+        assert july["DSACMS"]["repos"] == []
+        assert july["DSACMS"]["period"] == {"start": "2025-07-01", "end": "2025-07-31"}
+
+    def test_matches_activity_store(self, overlapping_files):
+        """The in-memory merge exports the same repos as the SQLite store."""
+        merged = merge_files(overlapping_files)
+        store = ActivityStore(":memory:")
+        for path in reversed(overlapping_files):
+            with open(path) as f:
+                org_data = json.load(f)["DSACMS"]
+            for repo in org_data["repos"]:
+                store.upsert_repo("DSACMS", repo, org_data["period"]["start"])
+
+        for start, end in [("2025-06-18", "2025-06-27"), ("2025-06-24", "2025-06-24"), ("2025-01-01", "2025-01-31")]:
+            assert merged.window("DSACMS", start, end)["repos"] == store.export_window("DSACMS", start, end)["repos"]
+
+    def test_legacy_files_use_repo_org(self, mock_changelog_data):
+        """Single-org files without an org name fall back to each repo's org field."""
+        merged = ActivitySet()
+        mock_changelog_data["repos"][0]["org"] = "DSACMS"
+
+        merged.add_data(mock_changelog_data)
+
+        assert merged.orgs() == ["DSACMS"]
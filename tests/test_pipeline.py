@@ -0,0 +1,206 @@
+import pytest
+import os
+import sys
+import threading
+import time
+from scripts.pipeline import BuildManifest, Stage, format_timings, run_graph, run_pipeline
+
+from tests.fixtures import temp_dir
+
+
+def _write_script(temp_dir, name, body):
+    path = os.path.join(temp_dir, name)
+    with open(path, "w") as f:
+        f.write(body)
+    return path
+
+
+class TestRunPipeline:
+    """Test running stages in process and isolated."""
+
+    def test_in_process_stages_share_context(self, temp_dir):
+        """A stage's return value is available to later stages by module name."""
+        seen = []
+        stages = [
+            Stage(os.path.join(temp_dir, "fetch.py"), "Fetch", run=lambda ctx: ("file.json", {"repos": []})),
+            Stage(os.path.join(temp_dir, "summarize.py"), "Summarize", run=lambda ctx: seen.append(ctx["fetch"])),
+        ]
+
+        results = run_pipeline(stages)
+
+        assert [r.success for r in results] == [True, True]
+        assert seen == [("file.json", {"repos": []})]
+        assert all(r.seconds >= 0 for r in results)
+
+    def test_failure_stops_pipeline(self, temp_dir, capsys):
+        """An exception fails its stage and later stages are not run."""
+        def fail(ctx):
+            raise ValueError("no token")
+
+        stages = [
+            Stage("fetch.py", "Fetch", run=fail),
+            Stage("summarize.py", "Summarize", run=lambda ctx: None),
+        ]
+
+        results = run_pipeline(stages)
+
+        assert len(results) == 1
+        assert not results[0].success
+        assert "ValueError: no token" in capsys.readouterr().out
+
+    def test_isolated_stage_streams_output(self, temp_dir, capsys):
+        """Isolated stages run in a subprocess and their output is echoed."""
+        ok = _write_script(temp_dir, "ok.py", "print('hello from stage')\n")
+        bad = _write_script(temp_dir, "bad.py", "import sys\nprint('partial')\nsys.exit(3)\n")
+
+        results = run_pipeline([Stage(ok, "Ok"), Stage(bad, "Bad")], isolate=True)
+
+        out = capsys.readouterr().out
+        assert [r.success for r in results] == [True, False]
+        assert results[1].error == "Exit code: 3"
+        assert "hello from stage" in out
+        assert "partial" in out
+
+    def test_in_process_module_main(self, temp_dir, monkeypatch):
+        """Without a run function, the script's module main() is called without runner flags."""
+        script = _write_script(temp_dir, "stage_mod.py", "import sys\ndef main():\n    return list(sys.argv)\n")
+        monkeypatch.syspath_prepend(temp_dir)
+        monkeypatch.setattr(sys, "argv", ["run_weekly.py", "--isolate"])
+        context = {}
+
+        run_pipeline([Stage(script, "Module")], context=context)
+
+        assert context["stage_mod"] == ["run_weekly.py"]
+
+    def test_format_timings(self):
+        """The timing report lists every stage and a total."""
+        results = run_pipeline([Stage("a.py", "Alpha", run=lambda ctx: None)])
+
+        report = format_timings(results)
+
+        assert "Alpha" in report
+        assert "Total" in report
+
+
+class TestRunGraph:
+    """Test dependency ordering, concurrency and up-to-date checks."""
+
+    def _stages(self, temp_dir, calls, fail=()):
+        source = os.path.join(temp_dir, "source.txt")
+        fetched = os.path.join(temp_dir, "fetched.txt")
+
+        def step(name, output=None):
+            def run(ctx):
+                calls.append(name)
+                if name in fail:
+                    raise RuntimeError(f"{name} broke")
+                if output:
+                    with open(output, "w") as f:
+                        f.write(name)
+            return run
+
+        with open(source, "w") as f:
+            f.write("v1")
+        script = _write_script(temp_dir, "stage.py", "")
+        return source, [
+            Stage(script, "Fetch", name="fetch", run=step("fetch", fetched),
+                  inputs=lambda ctx: [source], outputs=lambda ctx: [fetched]),
+            Stage(script, "Summaries", name="summaries", run=step("summaries"), deps=["fetch"]),
+            Stage(script, "Archive", name="archive", run=step("archive"), deps=["fetch"]),
+        ]
+
+    def test_independent_isolated_stages_run_concurrently(self, temp_dir, capsys):
+        """Isolated stages with no path between them run at the same time, with prefixed output."""
+        def rendezvous(mine, other):
+            # Each script marks itself started and only succeeds once it sees the other one
+            return (
+                "import os, sys, time\n"
+                f"open({os.path.join(temp_dir, mine)!r}, 'w').close()\n"
+                "deadline = time.time() + 5\n"
+                f"while not os.path.exists({os.path.join(temp_dir, other)!r}):\n"
+                "    if time.time() > deadline:\n"
+                "        sys.exit(1)\n"
+                "    time.sleep(0.01)\n"
+                f"print('met {other}')\n"
+            )
+        stages = [
+            Stage(_write_script(temp_dir, "a.py", rendezvous("a", "b")), "A"),
+            Stage(_write_script(temp_dir, "b.py", rendezvous("b", "a")), "B"),
+        ]
+
+        results = run_graph(stages, isolate=True)
+
+        assert all(r.success for r in results)
+        output = capsys.readouterr().out
+        assert "[a] met b" in output and "[b] met a" in output
+
+    def test_in_process_stages_run_one_at_a_time(self):
+        """In-process stages share stdout and sys.argv, so they never overlap."""
+        lock = threading.Lock()
+        overlapped = []
+
+        def run(ctx):
+            if not lock.acquire(blocking=False):
+                overlapped.append(True)
+                return
+            try:
+                time.sleep(0.05)
+            finally:
+                lock.release()
+
+        results = run_graph([Stage("a.py", "A", run=run), Stage("b.py", "B", run=run)])
+
+        assert all(r.success for r in results)
+        assert overlapped == []
+
+    def test_up_to_date_stages_are_skipped(self, temp_dir):
+        """Unchanged inputs skip a stage; a rerun with identical output skips its dependents."""
+        calls = []
+        source, stages = self._stages(temp_dir, calls)
+        manifest_file = os.path.join(temp_dir, "manifest.json")
+
+        run_graph(stages, manifest=BuildManifest(manifest_file))
+        results = run_graph(stages, manifest=BuildManifest(manifest_file))
+
+        assert sorted(calls) == ["archive", "fetch", "summaries"]
+        assert all(r.up_to_date for r in results)
+
+        with open(source, "w") as f:
+            f.write("v2")
+        run_graph(stages, manifest=BuildManifest(manifest_file))
+
+        assert calls[3:] == ["fetch"]
+
+    def test_rerun_after_failure_only_runs_failed_stage(self, temp_dir):
+        """Only the stage that failed is repeated on the next run."""
+        calls = []
+        _, stages = self._stages(temp_dir, calls, fail=("summaries",))
+        manifest_file = os.path.join(temp_dir, "manifest.json")
+
+        first = run_graph(stages, manifest=BuildManifest(manifest_file))
+        stages[1].run = lambda ctx: calls.append("summaries-fixed")
+        second = run_graph(stages, manifest=BuildManifest(manifest_file))
+
+        assert not all(r.success for r in first)
+        assert [r.stage.name for r in second if not r.up_to_date] == ["summaries"]
+        assert calls[-1] == "summaries-fixed"
+
+    def test_dependents_of_failed_stage_do_not_run(self, temp_dir):
+        """Stages downstream of a failure are left out of the results."""
+        calls = []
+        _, stages = self._stages(temp_dir, calls, fail=("fetch",))
+
+        results = run_graph(stages)
+
+        assert calls == ["fetch"]
+        assert len(results) == 1
+
+    def test_cycles_are_rejected(self):
+        """A dependency cycle is reported before anything runs."""
+        stages = [
+            Stage("a.py", "A", deps=["b"]),
+            Stage("b.py", "B", deps=["a"]),
+        ]
+
+        with pytest.raises(ValueError):
+            run_graph(stages)
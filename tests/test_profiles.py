@@ -0,0 +1,87 @@
+import pytest
+import os
+from scripts.data_io import load_data
+from scripts.generate_summary import generate_summary
+from scripts.profiles import CommitBodies, bodies_file_for, to_slim, write_profile
+
+from tests.fixtures import mock_changelog_data, mock_repo_data, temp_dir
+
+
+@pytest.fixture
+def multi_paragraph_commit():
+    return {
+        "message": "Merge pull request #14 from DSACMS/feature\n\nAdd landing page links",
+        "url": "https://github.com/DSACMS/test-repo/commit/merge14",
+        "author": "Test Author",
+        "created_at": "2025-01-03T10:00:00+00:00",
+    }
+
+
+class TestToSlim:
+    """Test building the slim profile."""
+
+    def test_keeps_subject_and_moves_body(self, mock_changelog_data, multi_paragraph_commit):
+        """Only the subject line stays inline; the full message goes to bodies."""
+        mock_changelog_data["repos"][0]["commits"].append(multi_paragraph_commit)
+        bodies = {}
+
+        slim = to_slim(mock_changelog_data, bodies)
+
+        commits = slim["repos"][0]["commits"]
+        assert commits[1]["message"] == "Merge pull request #14 from DSACMS/feature"
+        assert bodies == {multi_paragraph_commit["url"]: multi_paragraph_commit["message"]}
+
+    def test_interns_authors_and_repo_names(self, mock_changelog_data, multi_paragraph_commit):
+        """Repeated authors share one table entry."""
+        mock_changelog_data["repos"][0]["commits"].append(multi_paragraph_commit)
+
+        slim = to_slim(mock_changelog_data, {})
+
+        assert slim["tables"] == {"authors": ["Test Author"], "repos": ["test-repo"]}
+        assert [c["author"] for c in slim["repos"][0]["commits"]] == [0, 0]
+        assert slim["repos"][0]["name"] == 0
+
+    def test_does_not_modify_input(self, mock_changelog_data, multi_paragraph_commit):
+        """The full data dict is left untouched."""
+        mock_changelog_data["repos"][0]["commits"].append(multi_paragraph_commit)
+
+        to_slim(mock_changelog_data, {})
+
+        assert mock_changelog_data["repos"][0]["commits"][1] == multi_paragraph_commit
+
+
+class TestWriteProfile:
+    """Test writing and reading each profile."""
+
+    def test_slim_round_trip(self, mock_changelog_data, multi_paragraph_commit, temp_dir):
+        """Slim files read back with names resolved and bodies available lazily."""
+        mock_changelog_data["repos"][0]["commits"].append(multi_paragraph_commit)
+        filename = os.path.join(temp_dir, "weekly_changelog_2025-01-01_to_2025-01-08.json")
+
+        write_profile({"DSACMS": mock_changelog_data}, filename, "slim")
+        data = load_data(filename)
+
+        repo = data["DSACMS"]["repos"][0]
+        assert repo["name"] == "test-repo"
+        assert repo["commits"][1]["author"] == "Test Author"
+        assert bodies_file_for(filename).endswith("commit_bodies_2025-01-01_to_2025-01-08.json")
+        bodies = CommitBodies(bodies_file_for(filename))
+        assert bodies.get(repo["commits"][1]) == multi_paragraph_commit["message"]
+        assert bodies.get(repo["commits"][0]) == "Test commit"
+
+    def test_summary_matches_between_profiles(self, mock_changelog_data, temp_dir):
+        """generate_summary gives the same result for full and slim files."""
+        full_file = os.path.join(temp_dir, "full", "weekly_changelog_a.json")
+        slim_file = os.path.join(temp_dir, "slim", "weekly_changelog_a.json")
+        os.makedirs(os.path.dirname(full_file))
+        os.makedirs(os.path.dirname(slim_file))
+
+        write_profile({"DSACMS": mock_changelog_data}, full_file, "full")
+        write_profile({"DSACMS": mock_changelog_data}, slim_file, "slim")
+
+        assert generate_summary(full_file) == generate_summary(slim_file)
+
+    def test_unknown_profile_raises(self, mock_changelog_data, temp_dir):
+        """Only known profile names are accepted."""
+        with pytest.raises(ValueError):
+            write_profile(mock_changelog_data, os.path.join(temp_dir, "x.json"), "tiny")
@@ -0,0 +1,66 @@
+import pytest
+import os
+from scripts.rebuild import format_report, rebuild
+
+from tests.fixtures import mock_changelog_data, mock_repo_data, temp_dir, write_weekly
+
+
+def _data_files(temp_dir, data, *names):
+    data_dir = os.path.join(temp_dir, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    return [write_weekly(data_dir, data, name=name) for name in names]
+
+
+class TestRebuild:
+    """Test rebuilding historical summaries."""
+
+    def test_outputs_are_dated_by_data_file(self, mock_changelog_data, temp_dir):
+        """Each data file's outputs carry its end date, whichever worker wrote them."""
+        data_files = _data_files(temp_dir, mock_changelog_data,
+                                 "weekly_changelog_2025-06-18_to_2025-06-25.json",
+                                 "weekly_changelog_2025-06-25_to_2025-07-02.json")
+        output_dir = os.path.join(temp_dir, "summaries")
+
+        results = rebuild(data_files, output_dir, workers=2)
+
+        assert [r.success for r in results] == [True, True]
+        assert os.path.basename(results[0].paths["summary"]) == "summary_25-06-25.json"
+        assert os.path.basename(results[1].paths["pr_body_condensed"]) == "pr_body_condensed_2025-07-02.md"
+        assert all(os.path.exists(path) for r in results for path in r.paths.values())
+
+    def test_rebuild_is_repeatable(self, mock_changelog_data, temp_dir):
+        """Rebuilding the same file writes the same names and contents."""
+        data_files = _data_files(temp_dir, mock_changelog_data, "weekly_changelog_2025-06-18_to_2025-06-25.json")
+        output_dir = os.path.join(temp_dir, "summaries")
+
+        first = rebuild(data_files, output_dir, workers=1)[0]
+        contents = {kind: open(path).read() for kind, path in first.paths.items()}
+        second = rebuild(data_files, output_dir, workers=1)[0]
+
+        assert second.paths == first.paths
+        assert {kind: open(path).read() for kind, path in second.paths.items()} == contents
+
+    def test_same_output_date_is_rejected(self, mock_changelog_data, temp_dir):
+        """Two files ending on the same day would overwrite each other's outputs."""
+        data_files = _data_files(temp_dir, mock_changelog_data,
+                                 "weekly_changelog_2025-06-18_to_2025-06-25.json",
+                                 "weekly_changelog_2025-06-19_to_2025-06-25.json")
+
+        with pytest.raises(ValueError, match="2025-06-25"):
+            rebuild(data_files, os.path.join(temp_dir, "summaries"), workers=1)
+
+    def test_failures_are_reported(self, mock_changelog_data, temp_dir):
+        """A broken data file fails on its own and shows up in the report."""
+        good, bad = _data_files(temp_dir, mock_changelog_data,
+                                "weekly_changelog_2025-06-18_to_2025-06-25.json",
+                                "weekly_changelog_2025-06-25_to_2025-07-02.json")
+        with open(bad, "w") as f:
+            f.write("{not json")
+
+        results = rebuild([good, bad], os.path.join(temp_dir, "summaries"), workers=1)
+        report = format_report(results, 1.0)
+
+        assert [r.success for r in results] == [True, False]
+        assert "weekly_changelog_2025-06-25_to_2025-07-02.json" in report
+        assert "(failed:" in report
+        assert "Wall clock" in report
@@ -0,0 +1,201 @@
+import urllib.parse
+from scripts.generate_summary import (
+    create_mailto_link,
+    create_pr_appendix,
+    create_pr_content,
+    create_slack_message,
+    key_changes_by_repo,
+)
+from scripts.generate_summary_condensed import create_condensed_appendix, create_condensed_pr_content
+from scripts.render import MAILTO_LIMIT, PR_BODY_LIMIT, SLACK_LIMIT, Budget, blob_url, url_length
+
+
+def _huge_summary(repo_count=2000):
+    repos = [{
+        "name": f"repo-{i}",
+        "url": f"https://github.com/DSACMS/repo-{i}",
+        "commits": i, "pulls": 1, "issues": 1, "changelog_entries": 0,
+        "highlights": [f"Merged PR: Fix résumé handling in module {i} & friends"] * 3,
+    } for i in range(repo_count)]
+    return {
+        "period": {"start": "2025-01-01", "end": "2025-01-08"},
+        "generated_at": "2025-01-08T00:00:00",
+        "total_repos": repo_count, "active_repos": repo_count,
+        "total_commits": 1, "total_pulls": 1, "total_issues": 1,
+        "key_changes": [f"repo-{i}: Added ünïcode support & more #{i}" for i in range(repo_count)],
+        "repos_with_activity": repos,
+    }
+
+
+class TestBudget:
+    """Test the size-budgeted line collector."""
+
+    def test_add_respects_limit(self):
+        """Blocks that would exceed the limit are rejected whole."""
+        budget = Budget(10)
+
+        assert budget.add("12345")
+        assert not budget.add(["abc", "def"])
+        assert budget.add("abcd")
+        assert budget.render() == "12345\nabcd"
+
+    def test_footer_is_reserved(self):
+        """Footer lines always render and count against the limit."""
+        budget = Budget(15, footer=["--", "end"])
+
+        budget.add_items(["aaaa", "bbbb"], more=lambda n: f"+{n}")
+
+        assert budget.render() == "aaaa\n+1\n--\nend"
+        assert len(budget.render()) <= 15
+
+    def test_add_items_reports_omitted(self):
+        """Items beyond the limit are summarized in the more line."""
+        budget = Budget(1000)
+
+        added = budget.add_items([f"item {i}" for i in range(7)], more=lambda n: f"...and {n} more", limit=3)
+
+        assert added == 3
+        assert budget.lines[-1] == "...and 4 more"
+
+    def test_reserve_and_limit_without_more_line(self):
+        """Reserved room is kept free, and a cut made only by the limit is not announced."""
+        budget = Budget(12)
+
+        assert budget.add_items(["aaaa", "bbbb", "cccc"], more=lambda n: f"+{n}", reserve=5) == 1
+        assert budget.render() == "aaaa\n+2"
+
+        budget = Budget(1000)
+        budget.add_items(["a", "b", "c"], more=lambda n: f"+{n}", limit=2, more_when_limited=False)
+        assert budget.render() == "a\nb"
+
+    def test_no_more_line_when_everything_fits(self):
+        """The more line is only added when something was left out."""
+        budget = Budget(1000)
+
+        budget.add_items(["a", "b"], more=lambda n: f"...and {n} more")
+
+        assert budget.render() == "a\nb"
+
+    def test_measure_counts_encoded_length(self):
+        """A custom measure is used for lines and separators."""
+        budget = Budget(20, measure=url_length)
+
+        budget.add_items(["é é", "x"], more=lambda n: f"+{n}")
+
+        assert url_length(budget.render()) <= 20
+
+
+class TestRenderedLimits:
+    """Test that every channel stays within its limit for a very large week."""
+
+    def test_mailto_fits_encoded(self):
+        """The whole URL-encoded link stays within the mailto limit."""
+        link = create_mailto_link(_huge_summary())
+
+        assert len(link) <= MAILTO_LIMIT
+        body = urllib.parse.unquote(link.split("&body=", 1)[1])
+        assert "• repo-9: Added ünïcode support & more #9" in body
+        assert "... and" not in body
+
+    def test_mailto_keeps_room_for_active_repos(self):
+        """Long key changes are cut before the most active repos are."""
+        summary = _huge_summary()
+        summary["key_changes"] = [f"repo-{i}: Added ünïcode support " + "x" * 150 for i in range(2000)]
+
+        link = create_mailto_link(summary)
+
+        assert len(link) <= MAILTO_LIMIT
+        body = urllib.parse.unquote(link.split("&body=", 1)[1])
+        assert "• ... and 19" in body
+        assert body.split("Most Active Repos:\n", 1)[1].splitlines() == [
+            f"• repo-{i}: {i} commits, 1 PRs" for i in range(1999, 1994, -1)
+        ]
+
+    def test_slack_fits(self):
+        """The Slack message stays within its limit."""
+        assert len(create_slack_message(_huge_summary())) <= SLACK_LIMIT
+
+    def test_slack_top_lists_have_no_more_line(self):
+        """Only a cut forced by the character limit adds a more line."""
+        assert "more_" not in create_slack_message(_huge_summary())
+
+    def test_pr_body_fits(self):
+        """The full PR body is capped, keeps its footer and says what was left out."""
+        _, body = create_pr_content(_huge_summary())
+
+        assert len(body) <= PR_BODY_LIMIT
+        assert "more repositories*" in body
+        assert body.endswith("*Generated automatically on 2025-01-08T00:00:00*")
+
+    def test_condensed_pr_body_fits(self):
+        """Category sections give way so the active repositories section is kept."""
+        changes = [{"repo": f"repo-{i}", "text": f"Added feature {i} " + "x" * 80,
+                    "type": "pr", "url": f"https://github.com/DSACMS/repo-{i}/pull/1"}
+                   for i in range(3000)]
+        summary = dict(_huge_summary(), categorized_changes={"added": changes},
+                       active_repos_list=_huge_summary()["repos_with_activity"])
+
+        _, body = create_condensed_pr_content(summary)
+
+        assert len(body) <= PR_BODY_LIMIT
+        assert "*...and changes in" in body
+        assert "- *...and 1990 more repositories*" in body
+
+
+class TestAppendix:
+    """Test the bounded PR bodies and the appendix files they link to."""
+
+    def test_key_change_records_keep_colons(self):
+        """Structured records are grouped without re-splitting on colons."""
+        summary = {"key_change_records": [
+            {"org": "DSACMS", "repo": "repo:one", "kind": "Added", "text": "scope: thing"},
+            {"org": "DSACMS", "repo": "repo:one", "kind": "Fixed", "text": "a: b: c"},
+        ]}
+
+        assert key_changes_by_repo(summary) == {"repo:one": ["Added scope: thing", "Fixed a: b: c"]}
+
+    def test_legacy_key_change_strings(self):
+        """Summaries without records split each string on the first separator only."""
+        summary = {"key_changes": ["repo-a: Added config: yaml support"]}
+
+        assert key_changes_by_repo(summary) == {"repo-a": ["Added config: yaml support"]}
+
+    def test_body_links_appendix_with_every_repo(self):
+        """The body shows the top repos and the appendix lists every one."""
+        summary = _huge_summary(300)
+        summary["key_change_records"] = [
+            {"org": "DSACMS", "repo": f"repo-{i}", "kind": "Added", "text": f"thing {i}"} for i in range(300)
+        ]
+
+        _, body = create_pr_content(summary, "changelog_data/summaries/pr_appendix_25-01-08.md")
+        appendix = create_pr_appendix(summary)
+
+        assert body.count("### [repo-") == 25
+        assert "*...and 275 more repositories in the [full details](changelog_data/summaries/pr_appendix_25-01-08.md)*" in body
+        assert "[Full details for every repository](changelog_data/summaries/pr_appendix_25-01-08.md)" in body
+        assert appendix.count("### [repo-") == 300
+        assert "- Added thing 299" in appendix
+
+    def test_condensed_appendix_has_every_change(self):
+        """The condensed appendix keeps every change, not only the first five per repo."""
+        changes = [{"repo": "repo-a", "text": f"Change {i}", "type": "changelog"} for i in range(8)]
+        summary = {"period": {"start": "2025-01-01", "end": "2025-01-08"},
+                   "categorized_changes": {"added": changes}, "active_repos_list": []}
+
+        _, body = create_condensed_pr_content(summary, "appendix.md")
+        appendix = create_condensed_appendix(summary)
+
+        assert "- *...and 3 more*" in body
+        assert "(appendix.md)" in body
+        assert "- Change 7" in appendix
+
+    def test_blob_url(self, monkeypatch):
+        """Links point at the PR branch inside Actions and fall back to the path."""
+        monkeypatch.delenv("GITHUB_REPOSITORY", raising=False)
+        assert blob_url("changelog_data/summaries/a.md", "weekly-changelog-2025-01-08") == "changelog_data/summaries/a.md"
+
+        monkeypatch.setenv("GITHUB_REPOSITORY", "DSACMS/ospo-changelog")
+        monkeypatch.delenv("GITHUB_SERVER_URL", raising=False)
+        assert blob_url("changelog_data/summaries/a.md", "weekly-changelog-2025-01-08") == (
+            "https://github.com/DSACMS/ospo-changelog/blob/weekly-changelog-2025-01-08/changelog_data/summaries/a.md"
+        )
@@ -0,0 +1,58 @@
+import json
+import os
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from scripts.repo_select import RepoSelector, load_selection
+from tests.fixtures import temp_dir
+
+
+def listed_repo(name, topics=(), fork=False, is_template=False, pushed_at="2025-01-10", size=100):
+    """A repo with only the fields of the org listing payload."""
+    return SimpleNamespace(
+        name=name, topics=list(topics), fork=fork, is_template=is_template, size=size,
+        pushed_at=datetime.fromisoformat(pushed_at).replace(tzinfo=timezone.utc),
+    )
+
+
+class TestRepoSelector:
+    def test_empty_config_selects_everything(self):
+        selector = RepoSelector({})
+        assert not selector
+        assert selector.rejects("DSACMS", listed_repo("anything", fork=True, size=10 ** 9)) is None
+
+    def test_include_and_exclude_globs(self):
+        selector = RepoSelector({"include": ["iv-*", "dsacms/metrics"], "exclude": ["*-sandbox"]})
+        assert selector.rejects("DSACMS", listed_repo("iv-cbv-payroll")) is None
+        assert selector.rejects("DSACMS", listed_repo("Metrics")) is None
+        assert selector.rejects("DSACMS", listed_repo("iv-sandbox")) == "excluded"
+        assert selector.rejects("DSACMS", listed_repo("repolinter")) == "not included"
+
+    @pytest.mark.parametrize("config,repo,reason", [
+        ({"topics": ["Terraform"]}, listed_repo("a", topics=["python"]), "no selected topic"),
+        ({"fork": False}, listed_repo("a", fork=True), "fork"),
+        ({"template": True}, listed_repo("a"), "not a template"),
+        ({"min_pushed_at": "2025-01-01"}, listed_repo("a", pushed_at="2024-12-31"), "not pushed recently"),
+        ({"max_size_kb": 1000}, listed_repo("a", size=5000), "too large"),
+    ])
+    def test_listing_fields(self, config, repo, reason):
+        assert RepoSelector(config).rejects("DSACMS", repo) == reason
+
+    def test_min_pushed_at_in_days(self):
+        selector = RepoSelector({"min_pushed_at": 30}, now=datetime(2025, 2, 1, tzinfo=timezone.utc))
+        assert selector.rejects("DSACMS", listed_repo("a", pushed_at="2025-01-10")) is None
+        assert selector.rejects("DSACMS", listed_repo("a", pushed_at="2024-12-01")) == "not pushed recently"
+
+
+class TestLoadSelection:
+    def test_missing_file_selects_everything(self, temp_dir):
+        assert load_selection(os.path.join(temp_dir, "repo_selection.json")) == {}
+
+    def test_unknown_keys_are_rejected(self, temp_dir):
+        path = os.path.join(temp_dir, "repo_selection.json")
+        with open(path, "w") as f:
+            json.dump({"include": ["iv-*"], "forks": False}, f)
+        with pytest.raises(ValueError, match="forks"):
+            load_selection(path)
@@ -0,0 +1,111 @@
+import pytest
+import copy
+import json
+import os
+from datetime import date
+from scripts.rollup import (
+    WEEK_RULE,
+    month_window,
+    previous_windows,
+    quarter_window,
+    rollup,
+    update_stats,
+    write_rollup,
+)
+from scripts.summary_engine import summarize
+
+from tests.fixtures import mock_changelog_data, mock_repo_data, temp_dir, write_weekly
+
+
+@pytest.fixture
+def overlapping_weeks(mock_changelog_data, temp_dir):
+    """Two overlapping weeks that share a PR, an issue and the changelog; the second adds a commit."""
+    write_weekly(temp_dir, mock_changelog_data, "2025-01-01", "2025-01-08")
+
+    second = copy.deepcopy(mock_changelog_data)
+    second["repos"][0]["commits"].append({
+        "message": "fix: handle empty page",
+        "url": "https://github.com/DSACMS/test-repo/commit/def456",
+        "author": "Test Author",
+        "created_at": "2025-01-10T10:00:00+00:00",
+    })
+    second["repos"][0]["pulls"][0].update(merged=True, merged_at="2025-01-09T10:00:00+00:00")
+    write_weekly(temp_dir, second, "2025-01-05", "2025-01-12")
+
+    update_stats(temp_dir)
+    return temp_dir
+
+
+class TestRollup:
+    """Test monthly and quarterly rollups from weekly stats."""
+
+    def test_windows(self):
+        """Month and quarter labels map to calendar windows."""
+        assert month_window("2024-02") == (date(2024, 2, 1), date(2024, 2, 29))
+        assert quarter_window("2025-Q4") == (date(2025, 10, 1), date(2025, 12, 31))
+        assert previous_windows(date(2025, 4, 15)) == {"monthly": "2025-03", "quarterly": "2025-Q1"}
+
+    def test_update_stats_is_incremental(self, overlapping_weeks):
+        """Stats are written once per data file."""
+        assert os.path.exists(os.path.join(overlapping_weeks, "weekly_stats_2025-01-01_to_2025-01-08.json"))
+        assert update_stats(overlapping_weeks) == []
+
+    def test_overlapping_weeks_are_deduplicated(self, overlapping_weeks):
+        """Items seen in both weeks are counted once."""
+        result = rollup(*month_window("2025-01"), overlapping_weeks)
+        full = result.full_summary()
+        condensed = result.condensed_summary()
+
+        assert len(result.weeks) == 2
+        assert (full["total_commits"], full["total_pulls"], full["total_issues"]) == (2, 1, 1)
+        assert full["total_changelog_entries"] == 1
+        assert full["key_changes"] == [
+            "test-repo: Added New feature X", "test-repo: Added New feature Y",
+            "test-repo: Fixed Bug fix A", "test-repo: Fixed Bug fix B",
+        ]
+        assert "1 PR(s) merged" in full["repos_with_activity"][0]["highlights"]
+        assert condensed["change_counts"]["added"] == 2
+        assert condensed["activity_types"]["classified"] == 3
+        assert condensed["activity_types"]["counts"]["fixed"] == 1
+
+    def test_single_week_matches_weekly_summary(self, mock_changelog_data, temp_dir):
+        """Rolling up one week reproduces the weekly summary's numbers and shape."""
+        write_weekly(temp_dir, mock_changelog_data, "2025-01-01", "2025-01-08")
+        update_stats(temp_dir)
+        engine = summarize(mock_changelog_data)
+
+        result = rollup(date(2025, 1, 1), date(2025, 1, 8), temp_dir)
+        full, expected_full = result.full_summary(), engine.full_summary()
+        condensed, expected_condensed = result.condensed_summary(), engine.condensed_summary()
+
+        assert set(full) - {"weeks", "week_rule"} == set(expected_full)
+        assert set(condensed) - {"weeks", "week_rule"} == set(expected_condensed)
+        for key in ("total_commits", "total_pulls", "total_issues", "active_repos", "key_changes"):
+            assert full[key] == expected_full[key]
+        assert full["repos_with_activity"][0]["highlights"] == expected_full["repos_with_activity"][0]["highlights"]
+        assert condensed["activity_types"] == expected_condensed["activity_types"]
+
+    def test_write_rollup(self, overlapping_weeks):
+        """Rollups are written next to the weekly summaries; empty windows write nothing."""
+        output_dir = os.path.join(overlapping_weeks, "summaries")
+
+        paths = write_rollup("quarterly", "2025-Q1", overlapping_weeks, output_dir)
+
+        assert os.path.basename(paths["summary"]) == "summary_quarterly_2025-Q1.json"
+        with open(paths["summary_condensed"]) as f:
+            summary = json.load(f)
+        assert summary["period"] == {"start": "2025-01-01", "end": "2025-03-31"}
+        assert summary["week_rule"] == WEEK_RULE
+        assert write_rollup("monthly", "2025-02", overlapping_weeks, output_dir) is None
+
+    def test_write_rollup_rejects_unknown_kind(self, overlapping_weeks):
+        with pytest.raises(ValueError, match="weekly"):
+            write_rollup("weekly", "2025-01", overlapping_weeks)
+
+    def test_write_rollup_reports_window_kind(self, overlapping_weeks, capsys):
+        """The log line names the rollup's window kind, not the last output written."""
+        output_dir = os.path.join(overlapping_weeks, "summaries")
+
+        write_rollup("monthly", "2025-01", overlapping_weeks, output_dir)
+
+        assert "Monthly rollup 2025-01: 2 weeks" in capsys.readouterr().out
@@ -0,0 +1,71 @@
+import copy
+import json
+import os
+
+import pytest
+
+from scripts.pipeline import run_graph
+from scripts.run_weekly import build_stages, main
+
+from tests.fixtures import temp_dir
+
+
+class TestBuildStages:
+    """Test the weekly stage graph."""
+
+    def test_stage_graph(self):
+        """Fetch feeds every stage, and the summaries wait for the columnar archive."""
+        stages = {stage.name: stage for stage in build_stages()}
+
+        assert set(stages) == {"fetch", "summaries", "columnar", "search", "digests", "rollup"}
+        assert stages["fetch"].deps == []
+        assert sorted(stages["summaries"].deps) == ["columnar", "fetch"]
+        for name in ("columnar", "search", "digests", "rollup"):
+            assert stages[name].deps == ["fetch"]
+
+    def test_digest_outputs_come_from_the_teams_config(self, temp_dir, monkeypatch):
+        """Isolated runs leave the context empty, so digest outputs are listed from the config."""
+        teams_config = os.path.join(temp_dir, "teams.json")
+        with open(teams_config, "w") as f:
+            json.dump({"Data Team": {"repos": ["test-repo"]}}, f)
+        monkeypatch.setenv("TEAMS_CONFIG", teams_config)
+
+        digests = next(stage for stage in build_stages() if stage.name == "digests")
+        outputs = digests.outputs({})
+
+        assert outputs and all(os.path.basename(path).startswith("data-team_") for path in outputs)
+
+    def test_runs_with_stub_stages(self):
+        """The graph runs in dependency order, passing the fetched data through the context."""
+        calls = []
+
+        def stub(name):
+            def run(ctx):
+                calls.append(name)
+                return "weekly data" if name == "fetch" else ctx["fetch"]
+            return run
+
+        stages = []
+        for stage in build_stages():
+            stage = copy.copy(stage)
+            stage.run, stage.outputs = stub(stage.name), None
+            stages.append(stage)
+        context = {}
+
+        results = run_graph(stages, context=context)
+
+        assert all(r.success for r in results)
+        assert calls[0] == "fetch"
+        assert calls.index("summaries") > calls.index("columnar")
+        assert context["summaries"] == "weekly data"
+
+
+class TestMain:
+    def test_help_describes_isolated_concurrency(self, capsys, monkeypatch):
+        monkeypatch.setattr("sys.argv", ["run_weekly.py", "--help"])
+
+        with pytest.raises(SystemExit) as exc:
+            main()
+
+        assert exc.value.code == 0
+        assert "--isolate" in capsys.readouterr().out
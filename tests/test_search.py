@@ -0,0 +1,127 @@
+import pytest
+import copy
+import os
+from scripts import search
+from scripts.search import SearchIndex, parse_query, tokenize, update_index
+
+from tests.fixtures import mock_changelog_data, mock_repo_data, temp_dir, write_weekly
+
+
+@pytest.fixture
+def index_dir(mock_changelog_data, temp_dir):
+    """An index of the fixture week, with a release added."""
+    mock_changelog_data["repos"][0]["releases"] = [{
+        "name": "v1.0.0", "body": "First stable release\n- code.json support",
+        "url": "https://github.com/DSACMS/test-repo/releases/tag/v1.0.0", "published_at": "2025-06-25T10:00:00+00:00",
+    }]
+    path = os.path.join(temp_dir, "search")
+    update_index(path, [write_weekly(temp_dir, {"DSACMS": mock_changelog_data}, name="weekly_changelog_2025-06-18_to_2025-06-25.json")])
+    return path
+
+
+class TestQueryParsing:
+    """Test tokenizing and splitting queries."""
+
+    def test_tokenize(self):
+        assert tokenize("feat(auth): Add code.json") == ["feat", "auth", "add", "code", "json"]
+
+    def test_terms_phrases_and_filters(self):
+        """Quoted text and dotted words become phrases; known prefixes become filters."""
+        clauses, filters = parse_query('fix "new feature" code.json repo:DSACMS/* since:2025-01-01 note:x')
+
+        assert clauses == [["fix"], ["new", "feature"], ["code", "json"], ["note", "x"]]
+        assert filters == {"repo": ["DSACMS/*"], "since": ["2025-01-01"]}
+
+
+class TestSearchIndex:
+    """Test building, updating and querying the index."""
+
+    def test_indexes_every_kind(self, index_dir):
+        """Commits, PRs, issues, releases and each changelog item are documents."""
+        index = SearchIndex(index_dir)
+
+        kinds = sorted(doc["kind"] for doc in index.search(""))
+        assert kinds == ["changelog_entries"] * 4 + ["commits", "issues", "pulls", "releases"]
+
+    def test_terms_and_phrases(self, index_dir):
+        """Every term must match; phrases must match in order."""
+        index = SearchIndex(index_dir)
+
+        assert [doc["kind"] for doc in index.search("test commit")] == ["commits"]
+        assert [doc["kind"] for doc in index.search('"test commit"')] == ["commits"]
+        assert index.search('"commit test"') == []
+        assert [doc["text"] for doc in index.search("code.json")] == ["v1.0.0"]
+        assert [doc["text"] for doc in index.search('"feature x"')] == ["New feature X"]
+
+    def test_filters(self, index_dir):
+        """repo, org, kind and date filters narrow the matches."""
+        index = SearchIndex(index_dir)
+
+        assert [doc["kind"] for doc in index.search("test kind:pr")] == ["pulls"]
+        assert len(index.search("test repo:test-repo org:dsacms")) == 3
+        assert index.search("test repo:other/*") == []
+        assert [doc["kind"] for doc in index.search("test since:2025-06-24")] == ["pulls"]
+        assert [doc["kind"] for doc in index.search("test until:2025-06-22")] == ["commits"]
+
+    def test_legacy_files_resolve_the_org(self, mock_changelog_data, temp_dir):
+        """Single-org files without an org name are indexed under the org in the repo URL."""
+        path = os.path.join(temp_dir, "search")
+        update_index(path, [write_weekly(temp_dir, mock_changelog_data, name="weekly_changelog_2025-06-18_to_2025-06-25.json")])
+        index = SearchIndex(path)
+
+        assert {doc["repo"] for doc in index.search("")} == {"DSACMS/test-repo"}
+        assert len(index.search("test repo:DSACMS/*")) == 3
+
+    def test_updates_add_only_new_items(self, index_dir, mock_changelog_data, temp_dir):
+        """A later, overlapping week adds a segment with just its new items."""
+        mock_changelog_data["repos"][0]["commits"].append({
+            "message": "Add search index", "url": "https://github.com/DSACMS/test-repo/commit/def456",
+            "created_at": "2025-06-30T10:00:00+00:00",
+        })
+        later = write_weekly(temp_dir, {"DSACMS": mock_changelog_data}, name="weekly_changelog_2025-06-25_to_2025-07-02.json")
+
+        added = update_index(index_dir, [later])
+        again = update_index(index_dir, [later])
+        index = SearchIndex(index_dir)
+
+        assert (added, again) == (1, 0)
+        assert len(index.segments) == 2
+        assert [doc["url"] for doc in index.search("search index")] == ["https://github.com/DSACMS/test-repo/commit/def456"]
+
+    def test_segments_are_merged(self, index_dir, mock_changelog_data, temp_dir, monkeypatch):
+        """Past MAX_SEGMENTS, segments are merged into one and queries still match."""
+        monkeypatch.setattr(search, "MAX_SEGMENTS", 1)
+        data = copy.deepcopy(mock_changelog_data)
+        data["repos"][0]["commits"][0].update(message="Test merge segments", url="https://example.com/commit/2")
+        update_index(index_dir, [write_weekly(temp_dir, {"DSACMS": data}, name="weekly_changelog_2025-06-25_to_2025-07-02.json")])
+
+        index = SearchIndex(index_dir)
+
+        assert len(index.segments) == 1
+        assert len(index) == 9
+        assert sorted(doc["url"] for doc in index.search('"test commit"')) == [
+            "https://github.com/DSACMS/test-repo/commit/abc123"]
+        assert [doc["url"] for doc in index.search("merge segments")] == ["https://example.com/commit/2"]
+        assert sorted(os.listdir(index_dir)) == ["meta.json", index.meta["segments"][0]]
+
+
+class TestMain:
+    """Test the command line."""
+
+    def test_limit_and_help(self, index_dir, monkeypatch, capsys):
+        """--limit caps the printed results; options are never searched for."""
+        monkeypatch.setenv("SEARCH_INDEX_DIR", index_dir)
+
+        results = search.main(["--limit", "1", "test"])
+        output = capsys.readouterr().out
+        assert len(results) == 3
+        assert "...and 2 more" in output and "3 matches" in output
+
+        with pytest.raises(SystemExit) as exit_info:
+            search.main(["--help"])
+        assert exit_info.value.code == 0
+        assert capsys.readouterr().out.startswith("Usage: python scripts/search.py")
+
+        with pytest.raises(SystemExit) as exit_info:
+            search.main(["--limt", "5", "test"])
+        assert exit_info.value.code == 1
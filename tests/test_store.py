@@ -0,0 +1,125 @@
+import os
+from unittest.mock import Mock
+from scripts.generate_changelog_weekly import with_fetch_counts
+from scripts.store import ActivityStore, item_key, item_span
+from scripts.util import ChangelogGenerator
+
+from tests.fixtures import mock_github_token, mock_repo_data, temp_dir
+
+
+class TestItemKeys:
+    """Test item key and span helpers."""
+
+    def test_item_key_prefers_url(self):
+        """Items with a URL are keyed by it."""
+        item = {"url": "https://github.com/DSACMS/test-repo/pull/1"}
+        assert item_key("https://github.com/DSACMS/test-repo", "pulls", item) == item["url"]
+
+    def test_item_key_for_contributor(self):
+        """Contributors have no URL and are keyed by repo and name."""
+        key = item_key("https://github.com/DSACMS/test-repo", "contributors", {"name": "octocat"})
+        assert key == "https://github.com/DSACMS/test-repo#contributor:octocat"
+
+    def test_issue_span_extends_to_observed_start(self):
+        """An old issue seen by a run was active at that run's start."""
+        span = item_span("issues", {"created_at": "2024-01-01T00:00:00+00:00"}, "2025-06-18")
+        assert span == ("2024-01-01", "2025-06-18")
+
+
+class TestActivityStore:
+    """Test upserting into and exporting from the activity store."""
+
+    def test_overlapping_runs_are_deduplicated(self, mock_repo_data):
+        """The same item upserted by two runs is stored once."""
+        with ActivityStore(":memory:") as store:
+            store.upsert_repo("DSACMS", mock_repo_data, "2025-06-18")
+            store.upsert_repo("DSACMS", mock_repo_data, "2025-06-20")
+
+            data = store.export_window("DSACMS", "2025-06-18", "2025-06-25")
+
+        repo = data["repos"][0]
+        assert len(repo["issues"]) == 1
+        assert len(repo["pulls"]) == 1
+        assert len(repo["commits"]) == 1
+
+    def test_export_window_filters_by_date(self, mock_repo_data):
+        """Only items active inside the window are exported."""
+        with ActivityStore(":memory:") as store:
+            store.upsert_repo("DSACMS", mock_repo_data, "2025-06-18")
+
+            data = store.export_window("DSACMS", "2025-06-24", "2025-06-30")
+
+        repo = data["repos"][0]
+        assert [p["url"] for p in repo["pulls"]] == ["https://github.com/DSACMS/test-repo/pull/1"]
+        assert repo["commits"] == []
+        assert data["period"] == {"start": "2025-06-24", "end": "2025-06-30"}
+
+    def test_export_skips_inactive_repos_unless_requested(self, mock_repo_data):
+        """Repos without activity in the window are dropped by default."""
+        with ActivityStore(":memory:") as store:
+            store.upsert_repo("DSACMS", mock_repo_data, "2025-06-18")
+
+            assert store.export_window("DSACMS", "2026-01-01", "2026-01-08")["repos"] == []
+            data = store.export_window("DSACMS", "2026-01-01", "2026-01-08", include_inactive=True)
+
+        assert data["total_repo_count"] == 1
+        assert data["repos"][0]["name"] == "test-repo"
+
+    def test_fetch_counts_survive_the_export(self, mock_repo_data):
+        """Filtered actor and excluded repo counts from the fetch are copied onto the export."""
+        counts = {"issues": 0, "pulls": 2, "commits": 1}
+        fetched = {
+            "repos": [dict(mock_repo_data, filtered_actors=counts)],
+            "filtered_actors": counts,
+            "excluded_repo_count": 4,
+        }
+        with ActivityStore(":memory:") as store:
+            store.upsert_repo("DSACMS", mock_repo_data, "2025-06-18")
+
+            data = with_fetch_counts(store.export_window("DSACMS", "2025-06-18", "2025-06-25"), fetched)
+
+        assert data["repos"][0]["filtered_actors"] == counts
+        assert data["filtered_actors"] == counts
+        assert data["excluded_repo_count"] == 4
+
+    def test_store_persists_to_disk(self, mock_repo_data, temp_dir):
+        """Data survives closing and reopening the database."""
+        db_path = os.path.join(temp_dir, "activity.db")
+        with ActivityStore(db_path) as store:
+            store.upsert_repo("DSACMS", mock_repo_data, "2025-06-18")
+
+        with ActivityStore(db_path) as store:
+            assert store.orgs() == ["DSACMS"]
+
+
+class TestChangelogGeneratorStore:
+    """Test that ChangelogGenerator upserts into a configured store."""
+
+    def test_get_data_upserts_repos_and_records_run(self, mock_github_token):
+        """get_data should write every processed repo into the store."""
+        mock_repo = Mock()
+        mock_repo.name = "test-repo"
+        mock_repo.html_url = "https://github.com/test/repo"
+        mock_repo.description = "Test repository"
+        mock_repo.archived = False
+        mock_repo.get_issues.return_value = []
+        mock_repo.get_commits.return_value = []
+        mock_repo.get_releases.return_value = []
+
+        mock_org = Mock()
+        mock_org.get_repos.return_value = [mock_repo]
+        mock_github = Mock()
+        mock_github.get_organization.return_value = mock_org
+
+        store = ActivityStore(":memory:")
+        generator = ChangelogGenerator(
+            mock_github_token, log_history_start="2025-01-01", log_history_end="2025-01-08", store=store
+        )
+        generator.g = mock_github
+
+        generator.get_data("test-org", archival=True)
+
+        data = store.export_window("test-org", "2025-01-01", "2025-01-08", include_inactive=True)
+        assert data["repos"][0]["url"] == "https://github.com/test/repo"
+        assert store.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 1
+        store.close()
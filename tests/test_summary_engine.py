@@ -0,0 +1,81 @@
+import pytest
+import copy
+import os
+from scripts.generate_summary import generate_summary
+from scripts.generate_summary_condensed import generate_condensed_summary
+from scripts.summary_engine import SummaryEngine, generate_all, normalize_data, summarize
+
+from tests.fixtures import mock_changelog_data, mock_repo_data, temp_dir, write_weekly
+
+
+@pytest.fixture
+def multi_org_data(mock_changelog_data, mock_repo_data):
+    merged_pr = {
+        "title": "Add export button",
+        "url": "https://github.com/CMS-Enterprise/other/pull/2",
+        "merged": True,
+        "merged_at": "2025-01-03T10:00:00+00:00",
+    }
+    other = dict(mock_repo_data, name="other", url="https://github.com/CMS-Enterprise/other",
+                 pulls=[merged_pr], changelog_entries=[])
+    return {
+        "DSACMS": dict(mock_changelog_data, total_repo_count=3),
+        "CMS-Enterprise": dict(mock_changelog_data, repos=[other]),
+    }
+
+
+class TestSummaryEngine:
+    """Test the single-pass summary engine."""
+
+    def test_matches_wrapper_outputs(self, multi_org_data, temp_dir):
+        """The engine and the existing entry points give identical summaries."""
+        data_file = write_weekly(temp_dir, multi_org_data, name="weekly_changelog_a.json")
+
+        engine = summarize(multi_org_data)
+
+        assert engine.full_summary() == generate_summary(data_file)
+        assert engine.condensed_summary() == generate_condensed_summary(data_file)
+        assert engine.full_summary()["total_repos"] == 4
+        assert engine.full_summary()["repos_with_activity"][1]["highlights"] == [
+            "1 PR(s) merged", "1 new issue(s)"
+        ]
+        assert engine.condensed_summary()["categorized_changes"]["added"][-1]["type"] == "pr"
+
+    def test_metadata_can_arrive_after_repos(self, mock_changelog_data):
+        """Period-dependent highlights are resolved when the summary is read."""
+        engine = SummaryEngine()
+        for repo in mock_changelog_data["repos"]:
+            engine.add_repo("DSACMS", repo)
+        engine.set_metadata(period=mock_changelog_data["period"])
+
+        assert engine.full_summary()["total_repos"] == 1
+        assert engine.full_summary()["period"] == mock_changelog_data["period"]
+
+    def test_normalize_data_does_not_modify_input(self, multi_org_data):
+        """Repos are tagged with their org on copies only."""
+        original = copy.deepcopy(multi_org_data)
+
+        normalized = normalize_data(multi_org_data)
+
+        assert multi_org_data == original
+        assert [r["org"] for r in normalized["repos"]] == ["DSACMS", "CMS-Enterprise"]
+
+    def test_no_repos_raises(self):
+        """Multi-org data without any repos is rejected."""
+        with pytest.raises(ValueError):
+            summarize({"DSACMS": {"period": {}}})
+
+    def test_generate_all_writes_every_output(self, mock_changelog_data, temp_dir):
+        """One call writes the full, condensed and rendered outputs."""
+        data_file = write_weekly(temp_dir, mock_changelog_data, name="weekly_changelog_a.json")
+
+        paths = generate_all(data_file, os.path.join(temp_dir, "summaries"))
+
+        assert set(paths) == {
+            "summary", "mailto", "slack", "pr_title", "pr_body",
+            "summary_condensed", "pr_title_condensed", "pr_body_condensed",
+            "pr_appendix", "pr_appendix_condensed",
+        }
+        assert all(os.path.exists(path) for path in paths.values())
+        with open(paths["mailto"]) as f:
+            assert f.read().startswith("mailto:?subject=")
@@ -0,0 +1,135 @@
+import pytest
+import copy
+import os
+import numpy as np
+from scripts.columnar import ColumnarArchive, update_archive
+from scripts.generate_summary import create_pr_content, generate_summary
+from scripts.trends import (
+    METRIC_IDS,
+    activity_cube,
+    load_trends,
+    moving_average,
+    week_over_week,
+    weekly_trends,
+    went_quiet,
+    zscores,
+)
+
+from tests.fixtures import mock_changelog_data, mock_repo_data, temp_dir, write_weekly
+
+
+def _commit(repo, day, n):
+    return {"message": f"Commit {n}", "url": f"https://github.com/DSACMS/{repo}/commit/{day}-{n}",
+            "author": "Test Author", "created_at": f"{day}T12:00:00+00:00"}
+
+
+@pytest.fixture
+def history_archive(temp_dir):
+    """
+    14 weeks ending 2025-06-27: `steady` has 2 commits every week but the
+    last two, `busy` has 1 a week and 20 in the last week.
+    """
+    days = [str(np.datetime64("2025-06-27") - np.timedelta64(7 * w, "D")) for w in range(14)]
+    steady = {"name": "steady", "url": "https://github.com/DSACMS/steady",
+              "commits": [_commit("steady", day, n) for day in days[2:] for n in range(2)]}
+    busy = {"name": "busy", "url": "https://github.com/DSACMS/busy",
+            "commits": [_commit("busy", day, 0) for day in days[1:]] + [_commit("busy", days[0], n) for n in range(20)],
+            "pulls": [{"title": "PR", "url": "https://github.com/DSACMS/busy/pull/1", "state": "closed",
+                       "merged": True, "created_at": "2025-05-01T00:00:00+00:00",
+                       "merged_at": "2025-06-26T00:00:00+00:00"}]}
+    data_file = write_weekly(temp_dir, {"DSACMS": {"repos": [steady, busy]}}, "2025-06-20", "2025-06-27")
+    archive_dir = os.path.join(temp_dir, "columnar")
+    update_archive(archive_dir, [data_file])
+    return archive_dir
+
+
+class TestWindowFunctions:
+    """Test the vectorized per-week computations."""
+
+    def test_moving_average_and_week_over_week(self):
+        """Averages cover up to `window` weeks; deltas compare to the week before."""
+        cube = np.array([[[2], [4], [6], [8], [10]]])
+
+        assert moving_average(cube, window=2)[0, :, 0].tolist() == [2, 3, 5, 7, 9]
+        assert week_over_week(cube)[0, :, 0].tolist() == [2, 2, 2, 2, 2]
+
+    def test_zscores_flag_spikes_against_baseline(self):
+        """A spike scores high against the previous weeks; weeks without a full baseline are NaN."""
+        cube = np.array([[[1], [3], [1], [3], [12]]])
+
+        scores = zscores(cube, baseline=4, min_std=0.5)[0, :, 0]
+
+        assert np.isnan(scores[:4]).all()
+        assert scores[4] == pytest.approx(10.0)
+
+    def test_went_quiet(self):
+        """Only repos active before and idle for the last weeks went quiet."""
+        cube = np.array([
+            [[1], [1], [1], [0], [0]],  # went quiet
+            [[1], [1], [1], [1], [0]],  # idle for one week only
+            [[0], [1], [0], [0], [0]],  # rarely active
+        ])
+
+        assert went_quiet(cube, quiet_weeks=2, baseline=3, min_active=2).tolist() == [True, False, False]
+
+
+class TestActivityCube:
+    """Test counting archive rows into the repos x weeks x metrics cube."""
+
+    def test_counts_metrics_per_week(self, history_archive):
+        """Weeks end on the given date; merged PRs count at their merge time."""
+        repos, weeks, cube = activity_cube(ColumnarArchive(history_archive), "2025-06-27", weeks=3)
+
+        busy = repos.index("DSACMS/busy")
+        assert weeks == ["2025-06-07", "2025-06-14", "2025-06-21"]
+        assert cube.shape == (2, 3, len(METRIC_IDS))
+        assert cube[busy, :, METRIC_IDS["commits"]].tolist() == [1, 1, 20]
+        assert cube[busy, :, METRIC_IDS["merged"]].tolist() == [0, 0, 1]
+        assert cube[busy, :, METRIC_IDS["pulls"]].sum() == 0
+
+    def test_legacy_repos_share_the_org_row(self, mock_changelog_data, temp_dir):
+        """`unknown/<name>` rows from single-org files count toward the matching org repo."""
+        legacy = write_weekly(temp_dir, mock_changelog_data, name="weekly_changelog_a.json")
+
+        current_data = copy.deepcopy(mock_changelog_data)
+        current_data["repos"][0]["commits"][0]["url"] += "-later"
+        current = write_weekly(temp_dir, {"DSACMS": current_data}, name="weekly_changelog_b.json")
+
+        archive_dir = os.path.join(temp_dir, "columnar")
+        update_archive(archive_dir, [legacy, current])
+        repos, _, cube = activity_cube(ColumnarArchive(archive_dir), "2025-06-27")
+
+        assert repos == ["DSACMS/test-repo"]
+        assert cube[0, :, METRIC_IDS["commits"]].sum() == 2
+
+
+class TestWeeklyTrends:
+    """Test the trends report for one week."""
+
+    def test_totals_anomalies_and_quiet_repos(self, history_archive):
+        """The report compares the last week with the weeks before it."""
+        trends = weekly_trends(ColumnarArchive(history_archive), "2025-06-27")
+
+        assert trends["period"] == {"start": "2025-06-21", "end": "2025-06-27"}
+        assert trends["totals"]["commits"] == {"this_week": 20, "last_week": 1, "delta": 19, "moving_average": 6.8}
+        assert [(a["repo"], a["metric"]) for a in trends["anomalies"]] == [("DSACMS/busy", "commits")]
+        assert [q["repo"] for q in trends["went_quiet"]] == ["DSACMS/steady"]
+
+    def test_no_archive(self, temp_dir):
+        """Without a columnar archive there are no trends."""
+        assert load_trends("2025-06-27", os.path.join(temp_dir, "missing")) is None
+
+    def test_pr_body_includes_trends(self, history_archive, mock_changelog_data, temp_dir):
+        """The full PR body shows the totals table, anomalies and quiet repos."""
+        data_file = write_weekly(temp_dir, mock_changelog_data, name="test_data.json")
+        summary = generate_summary(data_file)
+        summary["trends"] = load_trends("2025-06-27", history_archive)
+
+        _, body = create_pr_content(summary)
+
+        assert "## Trends" in body
+        assert "this week is 2025-06-21 to 2025-06-27" in body
+        assert "| Commits | 20 | 1 | +19 | 6.8 |" in body
+        assert "- **DSACMS/busy**: 20 commits" in body
+        assert "- **DSACMS/steady**: last active the week of 2025-06-07" in body
+        assert body.index("## Trends") < body.index("## Key Changes")
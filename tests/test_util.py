@@ -4,6 +4,8 @@ import os
 import subprocess
 from datetime import datetime, timezone
 from unittest.mock import Mock, patch
+from scripts.actors import BOT_ACTORS, ActorFilter
+from scripts.repo_select import RepoSelector
 from scripts.util import ChangelogGenerator, parse_changelog
 
 from tests.fixtures import (
@@ -292,6 +294,49 @@ class TestGetIssuesAndPrs:
         assert data["pulls"][0]["merged"] is True
         assert data["pulls"][0]["author"] == "developer"
 
+    def test_skips_filtered_actors_before_get_pull(self, mock_github_token):
+        """Items by a filtered actor should be counted without a get_pull lookup
+        or a record."""
+        generator = ChangelogGenerator(
+            mock_github_token, log_history_start="2024-01-01",
+            actor_filter=ActorFilter(["dependabot[bot]", "*-bot"])
+        )
+
+        bot_pr = Mock()
+        bot_pr.number = 7
+        bot_pr.pull_request = Mock()
+        bot_pr.user.login = "Dependabot[bot]"
+
+        bot_issue = Mock()
+        bot_issue.pull_request = None
+        bot_issue.user.login = "release-bot"
+
+        mock_repo = Mock()
+        mock_repo.get_issues.return_value = [bot_pr, bot_issue]
+
+        data = {"issues": [], "pulls": []}
+
+        generator.get_issues_and_prs(mock_repo, data)
+
+        mock_repo.get_pull.assert_not_called()
+        assert data["issues"] == [] and data["pulls"] == []
+        assert data["filtered_actors"] == {"issues": 1, "pulls": 1, "commits": 0}
+
+    @pytest.mark.parametrize("env,login,filtered", [
+        (None, "dependabot[bot]", False),
+        ("default", "dependabot[bot]", True),
+        ("*-bot", "release-bot", True),
+    ])
+    def test_actor_filter_is_opt_in(self, mock_github_token, monkeypatch, env, login, filtered):
+        """Without ACTOR_FILTER nothing is filtered; "default" selects the common bots."""
+        if env is None:
+            monkeypatch.delenv("ACTOR_FILTER", raising=False)
+        else:
+            monkeypatch.setenv("ACTOR_FILTER", env)
+        generator = ChangelogGenerator(mock_github_token, log_history_start="2024-01-01")
+
+        assert generator.actor_filter.matches(login) is filtered
+
     def test_does_nothing_when_no_start_date_set(self, mock_github_token):
         """If log_history_start was never provided, get_issues_and_prs should return
         immediately without calling the GitHub API."""
@@ -922,6 +967,66 @@ class TestGetData:
         mock_repo.get_topics.assert_not_called()
         mock_repo.get_contents.assert_not_called()
 
+    def test_filtered_commits_are_counted_per_repo_and_org(self, mock_github_token):
+        """Commits by a filtered actor should be left out of the records, with
+        counts kept on the repo and in the org totals."""
+        human = Mock()
+        human.html_url = "https://github.com/test/repo/commit/abc123"
+        human.commit.message = "Fix typo"
+        human.commit.author.name = "Jane Doe"
+        human.commit.author.date = datetime(2025, 1, 2, tzinfo=timezone.utc)
+        human.author.login = "jdoe"
+        bot = Mock()
+        bot.commit.author.name = "github-actions"
+        bot.author.login = "github-actions[bot]"
+
+        mock_repo = Mock()
+        mock_repo.name = "test-repo"
+        mock_repo.archived = False
+        mock_repo.get_issues.return_value = []
+        mock_repo.get_commits.return_value = [bot, human]
+        mock_repo.get_releases.return_value = []
+
+        mock_github = Mock()
+        mock_github.get_organization.return_value = _make_mock_org(mock_repo)
+
+        generator = ChangelogGenerator(
+            mock_github_token, log_history_start="2025-01-01",
+            actor_filter=ActorFilter(BOT_ACTORS)
+        )
+        generator.g = mock_github
+
+        data = generator.get_data("test-org", archival=True)
+
+        repo_data = data["repos"][0]
+        assert [c["author"] for c in repo_data["commits"]] == ["Jane Doe"]
+        assert repo_data["filtered_actors"] == {"issues": 0, "pulls": 0, "commits": 1}
+        assert data["filtered_actors"] == {"issues": 0, "pulls": 0, "commits": 1}
+
+    def test_unselected_repos_make_no_requests(self, mock_github_token):
+        """A repo rejected by the repo selection should be skipped straight from
+        the listing, without a rate limit check or any repo call."""
+        mock_repo = Mock()
+        mock_repo.name = "iv-sandbox"
+
+        mock_github = Mock()
+        mock_github.get_organization.return_value = _make_mock_org(mock_repo)
+
+        generator = ChangelogGenerator(
+            mock_github_token, log_history_start="2025-01-01",
+            repo_selector=RepoSelector({"exclude": ["*-sandbox"]})
+        )
+        generator.g = mock_github
+
+        data = generator.get_data("test-org")
+
+        assert data["repos"] == []
+        assert data["total_repo_count"] == 0
+        assert data["excluded_repo_count"] == 1
+        mock_github.get_rate_limit.assert_not_called()
+        mock_repo.get_issues.assert_not_called()
+        mock_repo.get_commits.assert_not_called()
+
     def test_archived_repos_are_included_but_not_deeply_processed(self, mock_github_token):
         """A repo marked archived=True should still appear in the results, but
         get_data should skip fetching its commits (and other deep API calls)."""